@@ -1,16 +1,28 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from packages.config.settings import Settings
 from apps.api.utils import APIResponse, APIException
 from apps.api.routes import api_router
+from packages.database.graph.graph import async_neo4j_client
 
 settings = Settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the async Neo4j driver when the app shuts down"""
+    yield
+    await async_neo4j_client.close()
+
+
 app = FastAPI(
     title="Secrin API",
     description="Secrin Backend API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
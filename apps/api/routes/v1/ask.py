@@ -9,7 +9,7 @@ from apps.api.routes.v1.schemas.qa import QARequest, ContextItem
 from apps.api.utils import APIResponse
 from packages.memory.qa_service import QAService
 from packages.memory.services.graph_service import GraphService
-from packages.database.graph.graph import neo4j_client
+from packages.database.graph.graph import neo4j_client, async_neo4j_client
 from packages.config import Settings
 
 
@@ -18,7 +18,7 @@ settings = Settings()
 logger = logging.getLogger(__name__)
 
 # Initialize services once per module import
-graph_service = GraphService(neo4j_client)
+graph_service = GraphService(neo4j_client, async_neo4j_client=async_neo4j_client)
 qa_service = QAService(graph_service)
 
 
@@ -46,8 +46,9 @@ async def ask(request: QARequest):
                 media_type="text/event-stream"
             )
 
-        # Non-streaming response
-        result: dict[str, Any] = qa_service.ask(
+        # Non-streaming response; awaits the database and LLM calls so
+        # concurrent requests overlap their waits
+        result: dict[str, Any] = await qa_service.ask_async(
             question=request.question,
             agent_type=request.agent_type.value,
             search_type=request.search_type,
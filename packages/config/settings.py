@@ -10,14 +10,14 @@ class Settings(BaseSettings):
     Production-grade settings with validation and type safety.
     All settings are configurable via environment variables or .env file.
     """
-
+    
     model_config = SettingsConfigDict(
         env_file=Path(__file__).resolve().parent.parent.parent / ".env",
         env_file_encoding="utf-8",
         extra="ignore",  # Ignore unknown env vars
         case_sensitive=False,  # Allow lowercase env vars
     )
-
+    
     # ============================================================================
     # Environment & Deployment
     # ============================================================================
@@ -76,6 +76,24 @@ class Settings(BaseSettings):
         description="Connection timeout in seconds"
     )
     
+    NEO4J_MAX_TRANSACTION_RETRY_TIME: float = Field(
+        default=30.0,
+        ge=0,
+        description="Seconds execute_read/execute_write keep retrying transient failures"
+    )
+    
+    NEO4J_FETCH_SIZE: int = Field(
+        default=1000,
+        ge=1,
+        description="Records fetched per round trip when streaming large reads"
+    )
+    
+    NEO4J_WRITE_BATCH_SIZE: int = Field(
+        default=1000,
+        ge=1,
+        description="Rows per UNWIND statement and per write transaction during graph ingestion"
+    )
+    
     # ============================================================================
     # Embedding Configuration
     # ============================================================================
@@ -105,7 +123,7 @@ class Settings(BaseSettings):
         default="",
         description="Gemini API key"
     )
-
+    
     # OpenAI Configuration
     OPENAI_API_KEY: str = Field(
         default="",
@@ -276,7 +294,47 @@ class Settings(BaseSettings):
     MAX_WORKERS: int = Field(
         default=4,
         ge=1,
-        description="Maximum worker threads for parallel operations"
+        description="Maximum worker threads/processes for parallel operations (e.g. parser pool size)"
+    )
+    
+    PARSE_CACHE_DIR: Optional[str] = Field(
+        default="~/.cache/secrin/parse",
+        description="Directory of the persistent per-file parse cache (empty disables the cache)"
+    )
+    
+    PARSE_CACHE_MAX_BYTES: int = Field(
+        default=512 * 1024 * 1024,
+        ge=0,
+        description="Size limit of the parse cache; least recently used entries are evicted beyond it"
+    )
+    
+    PARSE_MAX_FILE_BYTES: int = Field(
+        default=2 * 1024 * 1024,
+        ge=0,
+        description="Files larger than this are recorded as File nodes without parsing (0 disables)"
+    )
+    
+    PARSE_MAX_LINE_LENGTH: int = Field(
+        default=10_000,
+        ge=0,
+        description="Files with a longer line are recorded as File nodes without parsing (0 disables)"
+    )
+    
+    PARSE_MINIFIED_LINE_LENGTH: int = Field(
+        default=500,
+        ge=0,
+        description="Files whose average line is longer are treated as minified and not parsed (0 disables)"
+    )
+    
+    PARSE_SKIP_GENERATED: bool = Field(
+        default=True,
+        description="Record generated files (by name or header marker) as File nodes without parsing"
+    )
+    
+    PARSE_TIME_BUDGET_SECONDS: float = Field(
+        default=10.0,
+        ge=0,
+        description="Wall-clock budget for parsing a single file (0 disables)"
     )
     
     # ============================================================================
@@ -313,7 +371,7 @@ class Settings(BaseSettings):
         default=None,
         description="API authentication key"
     )
-
+    
     GITHUB_WEBHOOK_SECRET: Optional[str] = Field(
         default=None,
         description="GitHub Webhook Secret for verifying payloads"
@@ -383,4 +441,5 @@ class Settings(BaseSettings):
             "max_connection_lifetime": self.NEO4J_MAX_CONNECTION_LIFETIME,
             "max_connection_pool_size": self.NEO4J_MAX_CONNECTION_POOL_SIZE,
             "connection_timeout": self.NEO4J_CONNECTION_TIMEOUT,
+            "max_transaction_retry_time": self.NEO4J_MAX_TRANSACTION_RETRY_TIME,
         }
@@ -1,5 +1,13 @@
-from neo4j import GraphDatabase
-from typing import LiteralString, cast
+from contextlib import contextmanager
+from neo4j import (
+    AsyncGraphDatabase,
+    AsyncManagedTransaction,
+    GraphDatabase,
+    ManagedTransaction,
+    Record,
+    Transaction,
+)
+from typing import Iterable, Iterator, LiteralString, cast
 import logging
 
 from packages.config.settings import Settings
@@ -12,6 +20,13 @@ class Neo4jClient:
     """
     Neo4j database client with configurable connection pooling and timeouts.
     All settings are configurable via environment variables.
+    
+    execute_read / execute_write run a statement in a managed transaction
+    that the driver retries on transient failures (leader changes, deadlocks,
+    dropped connections) for up to NEO4J_MAX_TRANSACTION_RETRY_TIME seconds,
+    so the statement must be safe to run twice (MERGE rather than CREATE).
+    unit_of_work groups many statements in one explicit transaction, and
+    stream iterates over a large result without holding all of it.
     """
     
     def __init__(self):
@@ -34,6 +49,9 @@ class Neo4jClient:
         """
         Execute a Cypher query with optional parameters.
         
+        The query runs in an auto-commit transaction and is not retried;
+        prefer execute_read / execute_write.
+        
         Args:
             query: Cypher query string
             params: Optional query parameters
@@ -45,11 +63,171 @@ class Neo4jClient:
             result = session.run(cast(LiteralString, query), params or {})
             return list(result)
 
+    def execute_read(self, query: str, params: dict | None = None) -> list[Record]:
+        """
+        Execute a read query in a managed transaction, retrying transient failures.
+        
+        Args:
+            query: Cypher query string
+            params: Optional query parameters
+        
+        Returns:
+            List of result records
+        """
+        with self.driver.session(database=self.database) as session:
+            return session.execute_read(_run_all, query, params or {})
+
+    def execute_write(self, query: str, params: dict | None = None) -> list[Record]:
+        """
+        Execute a write query in a managed transaction, retrying transient failures.
+        
+        Args:
+            query: Cypher query string; it may run more than once
+            params: Optional query parameters
+        
+        Returns:
+            List of result records
+        """
+        with self.driver.session(database=self.database) as session:
+            return session.execute_write(_run_all, query, params or {})
+
+    def run_transaction(self, queries: Iterable[tuple[str, dict]]) -> list[list[Record]]:
+        """
+        Execute write queries in one managed transaction.
+        
+        The transaction is committed only if every query succeeds. Transient
+        failures retry the whole transaction; other errors roll it back and
+        are raised.
+        
+        Args:
+            queries: (query, params) pairs, run in order
+        
+        Returns:
+            The result records of each query, in order
+        """
+        queries = list(queries)
+        
+        def work(tx: ManagedTransaction) -> list[list[Record]]:
+            return [list(tx.run(cast(LiteralString, query), params)) for query, params in queries]
+        
+        with self.driver.session(database=self.database) as session:
+            return session.execute_write(work)
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[Transaction]:
+        """
+        Run many statements in one explicit transaction.
+        
+        The transaction commits when the block exits normally and rolls back
+        if it raises. Results of tx.run are available inside the block, but
+        the block is not retried; use run_transaction for writes that only
+        need to be atomic.
+        
+        Example:
+            with neo4j_client.unit_of_work() as tx:
+                deleted = tx.run(query, params).single()["deleted"]
+                tx.run(other_query, other_params)
+        
+        Yields:
+            The open transaction
+        """
+        with self.driver.session(database=self.database) as session:
+            with session.begin_transaction() as tx:
+                yield tx
+                tx.commit()
+
+    def stream(self, query: str, params: dict | None = None, fetch_size: int | None = None) -> Iterator[Record]:
+        """
+        Iterate over the records of a large read without materializing them.
+        
+        Records are pulled from the server fetch_size at a time as the
+        iterator advances. The session stays open until the iterator is
+        exhausted or closed, and the read is not retried.
+        
+        Args:
+            query: Cypher query string
+            params: Optional query parameters
+            fetch_size: Records per round trip (default: NEO4J_FETCH_SIZE)
+        
+        Yields:
+            Result records
+        """
+        with self.driver.session(
+            database=self.database,
+            fetch_size=fetch_size or settings.NEO4J_FETCH_SIZE,
+        ) as session:
+            yield from session.run(cast(LiteralString, query), params or {})
+
     def close(self):
         """Close the database connection."""
         logger.info("Closing Neo4j connection")
         self.driver.close()
 
 
-# Singleton instance - configuration loaded at import time
-neo4j_client = Neo4jClient()
\ No newline at end of file
+class AsyncNeo4jClient:
+    """
+    Neo4j client on the driver's asyncio API, for async request handlers.
+    
+    While a query waits on the database the event loop keeps serving other
+    requests. The driver is bound to the event loop it is first used on.
+    Reads and writes run in managed transactions retried like those of
+    Neo4jClient.
+    """
+    
+    def __init__(self):
+        """Initialize the async Neo4j driver with settings from configuration."""
+        self.driver = AsyncGraphDatabase.driver(
+            settings.NEO4J_URI,
+            auth=(settings.NEO4J_USER, settings.NEO4J_PASS),
+            **settings.get_neo4j_config()
+        )
+        self.database = settings.NEO4J_DB
+
+    async def execute_read(self, query: str, params: dict | None = None) -> list[Record]:
+        """
+        Execute a read query in a managed transaction, retrying transient failures.
+        
+        Args:
+            query: Cypher query string
+            params: Optional query parameters
+        
+        Returns:
+            List of result records
+        """
+        async with self.driver.session(database=self.database) as session:
+            return await session.execute_read(_run_all_async, query, params or {})
+
+    async def execute_write(self, query: str, params: dict | None = None) -> list[Record]:
+        """
+        Execute a write query in a managed transaction, retrying transient failures.
+        
+        Args:
+            query: Cypher query string; it may run more than once
+            params: Optional query parameters
+        
+        Returns:
+            List of result records
+        """
+        async with self.driver.session(database=self.database) as session:
+            return await session.execute_write(_run_all_async, query, params or {})
+
+    async def close(self):
+        """Close the database connections."""
+        logger.info("Closing async Neo4j connection")
+        await self.driver.close()
+
+
+def _run_all(tx: ManagedTransaction, query: str, params: dict) -> list[Record]:
+    """Transaction function: run a query and collect its records before the transaction ends"""
+    return list(tx.run(cast(LiteralString, query), params))
+
+
+async def _run_all_async(tx: AsyncManagedTransaction, query: str, params: dict) -> list[Record]:
+    """Async transaction function: run a query and collect its records"""
+    result = await tx.run(cast(LiteralString, query), params)
+    return [record async for record in result]
+
+
+# Singleton instances - configuration loaded at import time; drivers connect on first use
+neo4j_client = Neo4jClient()
+async_neo4j_client = AsyncNeo4jClient()
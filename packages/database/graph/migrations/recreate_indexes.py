@@ -1,8 +1,19 @@
 """
 Drop and recreate vector indexes with correct dimensions.
+
+Run after changing EMBEDDING_DIMENSION; the schema manager's IF NOT EXISTS
+statements leave existing vector indexes unchanged.
 """
 
+from packages.config.settings import Settings
 from packages.database.graph.graph import neo4j_client
+from packages.database.graph.migrations.schema import (
+    VECTOR_INDEX_LABELS,
+    vector_index_name,
+    vector_index_statement,
+)
+
+settings = Settings()
 
 
 def drop_vector_indexes():
@@ -10,16 +21,7 @@ def drop_vector_indexes():
     
     print("\n🗑️  Dropping existing vector indexes...")
     
-    indexes = [
-        "function_embedding_index",
-        "class_embedding_index",
-        "file_embedding_index",
-        "doc_embedding_index",
-        "module_embedding_index",
-        "commit_embedding_index"
-    ]
-    
-    for idx_name in indexes:
+    for idx_name in map(vector_index_name, VECTOR_INDEX_LABELS):
         try:
             neo4j_client.run_query(f"DROP INDEX {idx_name} IF EXISTS")
             print(f"✅ Dropped {idx_name}")
@@ -30,75 +32,18 @@ def drop_vector_indexes():
 
 
 def create_vector_indexes():
-    """Create vector indexes with 1024 dimensions for mxbai-embed-large."""
-    
-    print("🚀 Creating vector indexes with 1024 dimensions...")
+    """Create the vector indexes of the graph schema with EMBEDDING_DIMENSION dimensions."""
     
-    statements = [
-        """
-        CREATE VECTOR INDEX function_embedding_index IF NOT EXISTS
-        FOR (f:Function)
-        ON f.embedding
-        OPTIONS {indexConfig: {
-          `vector.dimensions`: 1024,
-          `vector.similarity_function`: 'cosine'
-        }}
-        """,
-        """
-        CREATE VECTOR INDEX class_embedding_index IF NOT EXISTS
-        FOR (c:Class)
-        ON c.embedding
-        OPTIONS {indexConfig: {
-          `vector.dimensions`: 1024,
-          `vector.similarity_function`: 'cosine'
-        }}
-        """,
-        """
-        CREATE VECTOR INDEX file_embedding_index IF NOT EXISTS
-        FOR (f:File)
-        ON f.embedding
-        OPTIONS {indexConfig: {
-          `vector.dimensions`: 1024,
-          `vector.similarity_function`: 'cosine'
-        }}
-        """,
-        """
-        CREATE VECTOR INDEX doc_embedding_index IF NOT EXISTS
-        FOR (d:Doc)
-        ON d.embedding
-        OPTIONS {indexConfig: {
-          `vector.dimensions`: 1024,
-          `vector.similarity_function`: 'cosine'
-        }}
-        """,
-        """
-        CREATE VECTOR INDEX module_embedding_index IF NOT EXISTS
-        FOR (m:Module)
-        ON m.embedding
-        OPTIONS {indexConfig: {
-          `vector.dimensions`: 1024,
-          `vector.similarity_function`: 'cosine'
-        }}
-        """,
-        """
-        CREATE VECTOR INDEX commit_embedding_index IF NOT EXISTS
-        FOR (c:Commit)
-        ON c.embedding
-        OPTIONS {indexConfig: {
-          `vector.dimensions`: 1024,
-          `vector.similarity_function`: 'cosine'
-        }}
-        """
-    ]
+    print(f"🚀 Creating vector indexes with {settings.EMBEDDING_DIMENSION} dimensions...")
     
-    for idx, statement in enumerate(statements, 1):
+    for idx, label in enumerate(VECTOR_INDEX_LABELS, 1):
         try:
-            neo4j_client.run_query(statement.strip())
-            print(f"✅ Created index {idx}/6")
+            neo4j_client.run_query(vector_index_statement(label, settings.EMBEDDING_DIMENSION).strip())
+            print(f"✅ Created index {idx}/{len(VECTOR_INDEX_LABELS)}")
         except Exception as e:
-            print(f"❌ Error creating index {idx}/6: {e}")
+            print(f"❌ Error creating index {idx}/{len(VECTOR_INDEX_LABELS)}: {e}")
     
-    print("\n✅ Vector indexes created with 1024 dimensions!\n")
+    print(f"\n✅ Vector indexes created with {settings.EMBEDDING_DIMENSION} dimensions!\n")
 
 
 if __name__ == "__main__":
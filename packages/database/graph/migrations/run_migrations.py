@@ -3,6 +3,7 @@ from neo4j import GraphDatabase
 from typing import LiteralString, cast
 
 from packages.config.settings import Settings
+from packages.database.graph.migrations.schema import ensure_schema
 
 def get_applied_migrations(session):
     """Return a set of filenames that have already been applied."""
@@ -63,6 +64,9 @@ def run_migrations():
 
     driver.close()
 
+    # Constraints and indexes declared by the versioned schema
+    ensure_schema()
+
 if __name__ == "__main__":
     run_migrations()
     print("🎉 All pending Neo4j migrations applied successfully!")
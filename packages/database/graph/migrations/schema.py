@@ -0,0 +1,235 @@
+"""
+Versioned schema of the knowledge graph.
+
+Declares every constraint and index the ingestion and query paths rely on:
+unique id constraints of the parsed node labels, range and composite
+indexes on the keys commit and PR ingestion MERGE on, and the vector
+indexes used by semantic search. The applied version is recorded on a
+SchemaVersion node, so ingestion only issues DDL when the declarations
+changed. Bump SCHEMA_VERSION whenever they do.
+
+Usage:
+    python -m packages.database.graph.migrations.schema          # apply if outdated
+    python -m packages.database.graph.migrations.schema --force  # re-apply all
+"""
+
+import argparse
+import threading
+
+from packages.config.settings import Settings
+from packages.database.graph.graph import Neo4jClient, neo4j_client
+
+settings = Settings()
+
+SCHEMA_VERSION = 3
+
+# Unique id constraints (which also index the ids) of the parsed node labels
+CONSTRAINTS = [
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (r:Repo) REQUIRE r.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (f:File) REQUIRE f.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (c:Class) REQUIRE c.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (fn:Function) REQUIRE fn.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (v:Variable) REQUIRE v.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (d:Doc) REQUIRE d.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (p:Package) REQUIRE p.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (cm:Commit) REQUIRE cm.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (m:Module) REQUIRE m.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (t:Test) REQUIRE t.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (i:Issue) REQUIRE i.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (pr:PullRequest) REQUIRE pr.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (s:RepoStats) REQUIRE s.repo_name IS UNIQUE",
+]
+
+# Range indexes of the keys Memory.upsert_node and Memory.link look nodes up by.
+# Repository and Person ids are not unique-constrained: those nodes are merged
+# on url/email, and the commit and PR paths may assign them different ids.
+RANGE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS FOR (rp:Repository) ON (rp.id)",
+    "CREATE INDEX IF NOT EXISTS FOR (rp:Repository) ON (rp.url)",
+    "CREATE INDEX IF NOT EXISTS FOR (ps:Person) ON (ps.id)",
+    "CREATE INDEX IF NOT EXISTS FOR (ps:Person) ON (ps.email)",
+    "CREATE INDEX IF NOT EXISTS FOR (ps:Person) ON (ps.name)",
+    "CREATE INDEX IF NOT EXISTS FOR (cm:Commit) ON (cm.sha)",
+    "CREATE INDEX IF NOT EXISTS FOR (r:Repo) ON (r.name)",
+]
+
+# Labels of nodes that belong to a single repository. Ingestion stamps them
+# with repo_name, which repository deletion selects them by; Package and
+# Person nodes are shared between repositories and carry none.
+REPO_SCOPED_LABELS = [
+    "Repo", "Repository", "File", "Module", "Class", "Function", "Variable",
+    "Test", "Doc", "Commit", "Issue", "PullRequest",
+]
+
+REPO_NAME_INDEXES = [
+    f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.repo_name)"
+    for label in REPO_SCOPED_LABELS
+]
+
+# Counters of the RepoStats node of a repository, by the label they count.
+# Writes add the nodes they create and deletes subtract the nodes they remove,
+# so reading the statistics of a repository is a single lookup. Each counter
+# is the number of the label's nodes with the repository's repo_name; files
+# include those only known from the commit history.
+REPO_STATS_COUNTERS = {
+    "File": "files",
+    "Class": "classes",
+    "Function": "functions",
+    "Test": "tests",
+    "Doc": "docs",
+    "Commit": "commits",
+    "PullRequest": "pull_requests",
+}
+
+# Composite indexes of multi-property lookup keys
+COMPOSITE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS FOR (pr:PullRequest) ON (pr.pr_number, pr.repo_url)",
+    "CREATE INDEX IF NOT EXISTS FOR (f:File) ON (f.repo_name, f.path)",
+]
+
+# Labels with embeddings; GraphService queries "<label>_embedding_index"
+VECTOR_INDEX_LABELS = ["Function", "Class", "File", "Doc", "Module", "Commit", "PullRequest"]
+
+
+def vector_index_name(label: str) -> str:
+    return f"{label.lower()}_embedding_index"
+
+
+def vector_index_statement(label: str, dimensions: int) -> str:
+    """
+    DDL of the vector index of a label.
+
+    Args:
+        label: Node label with an embedding property
+        dimensions: Embedding vector dimension
+
+    Returns:
+        CREATE VECTOR INDEX statement
+    """
+    return f"""
+        CREATE VECTOR INDEX {vector_index_name(label)} IF NOT EXISTS
+        FOR (n:{label})
+        ON n.embedding
+        OPTIONS {{indexConfig: {{
+          `vector.dimensions`: {dimensions},
+          `vector.similarity_function`: 'cosine'
+        }}}}
+        """
+
+
+def schema_statements(dimensions: int | None = None) -> list[str]:
+    """
+    All DDL statements of the current schema, in the order they are applied.
+
+    Args:
+        dimensions: Embedding dimension of the vector indexes
+            (default: EMBEDDING_DIMENSION)
+
+    Returns:
+        List of idempotent Cypher statements
+    """
+    dimensions = dimensions or settings.EMBEDDING_DIMENSION
+    return [
+        *CONSTRAINTS,
+        *RANGE_INDEXES,
+        *REPO_NAME_INDEXES,
+        *COMPOSITE_INDEXES,
+        *(vector_index_statement(label, dimensions).strip() for label in VECTOR_INDEX_LABELS),
+    ]
+
+
+def record_version_statement() -> str:
+    """Statement recording SCHEMA_VERSION, for schemas applied outside SchemaManager"""
+    return (
+        f"MERGE (s:SchemaVersion {{id: 'graph'}}) "
+        f"SET s.version = {SCHEMA_VERSION}, s.applied_at = datetime()"
+    )
+
+
+class SchemaManager:
+    """
+    Applies the schema once per database version.
+
+    ensure() reads the version recorded in the graph and applies the schema
+    only if it is older than SCHEMA_VERSION. Once the schema is known to be
+    current, or was applied once, later calls in the same process return
+    without a query.
+    """
+
+    def __init__(self, client: Neo4jClient = neo4j_client):
+        self.client = client
+        self._current = False
+        self._lock = threading.Lock()
+
+    def applied_version(self) -> int:
+        """
+        Schema version recorded in the graph.
+
+        Returns:
+            The version, or 0 if no schema was recorded
+        """
+        result = self.client.execute_read(
+            "MATCH (s:SchemaVersion {id: 'graph'}) RETURN s.version AS version"
+        )
+        return result[0]["version"] if result and result[0]["version"] else 0
+
+    def ensure(self, force: bool = False) -> bool:
+        """
+        Apply the schema if the graph's version is outdated.
+
+        Every statement is attempted; the version is only recorded if all of
+        them succeeded. Failures are reported once and not retried for the
+        rest of the process (an edition without vector indexes, a constraint
+        blocked by duplicates), so ingestion does not reissue the DDL on every
+        call; the next process, or force, tries again.
+
+        Args:
+            force: Apply the schema even if it is recorded as current
+
+        Returns:
+            True if DDL was issued, False if the schema was already current
+        """
+        with self._lock:
+            if self._current and not force:
+                return False
+
+            if not force and self.applied_version() >= SCHEMA_VERSION:
+                self._current = True
+                return False
+
+            print(f"Applying graph schema version {SCHEMA_VERSION}...")
+            failed = 0
+            for statement in schema_statements():
+                try:
+                    self.client.execute_write(statement)
+                except Exception as e:
+                    failed += 1
+                    print(f"Warning: Could not apply schema statement: {e}")
+
+            self._current = True
+            if failed:
+                print(f"Warning: {failed} schema statements failed; schema version not recorded")
+                return True
+
+            self.client.execute_write(record_version_statement())
+            return True
+
+
+# Singleton instance
+schema_manager = SchemaManager()
+
+
+def ensure_schema(force: bool = False) -> bool:
+    """Apply the graph schema if it is outdated (see SchemaManager.ensure)"""
+    return schema_manager.ensure(force=force)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply the graph schema")
+    parser.add_argument("--force", action="store_true", help="Re-apply even if the schema is current")
+    args = parser.parse_args()
+
+    if ensure_schema(force=args.force):
+        print(f"✅ Graph schema version {SCHEMA_VERSION} applied")
+    else:
+        print(f"⚪ Graph schema version {SCHEMA_VERSION} is current")
@@ -24,22 +24,37 @@ def get_nodes_without_embeddings(node_label: str, batch_size: int = 100) -> List
     RETURN n
     LIMIT $batch_size
     """
-    results = neo4j_client.run_query(query, {"batch_size": batch_size})
+    results = neo4j_client.execute_read(query, {"batch_size": batch_size})
     return [record["n"] for record in results]
 
 
-def update_node_embedding(node_id: str, embedding: List[float]):
+def update_node_embedding(node_label: str, node_id: str, embedding: List[float]):
     """Update a node with its embedding."""
-    query = """
-    MATCH (n {id: $node_id})
+    query = f"""
+    MATCH (n:{node_label} {{id: $node_id}})
     SET n.embedding = $embedding
     """
-    neo4j_client.run_query(query, {
+    neo4j_client.execute_write(query, {
         "node_id": node_id,
         "embedding": embedding
     })
 
 
+def update_node_embeddings(node_label: str, node_ids: List[str], embeddings: List[List[float]]):
+    """Update a batch of nodes with their embeddings in one transaction."""
+    query = f"""
+    UNWIND $rows AS row
+    MATCH (n:{node_label} {{id: row.id}})
+    SET n.embedding = row.embedding
+    """
+    neo4j_client.execute_write(query, {
+        "rows": [
+            {"id": node_id, "embedding": embedding}
+            for node_id, embedding in zip(node_ids, embeddings)
+        ]
+    })
+
+
 def process_nodes_batch(
     node_label: str,
     batch_size: int = 50,
@@ -77,8 +92,7 @@ def process_nodes_batch(
         embeddings = embedding_service.embed_texts(texts)
         
         # Update nodes with embeddings
-        for node_id, embedding in zip(node_ids, embeddings):
-            update_node_embedding(node_id, embedding)
+        update_node_embeddings(node_label, node_ids, embeddings)
         
         print(f"✓ Successfully added embeddings to {len(node_ids)} {node_label} nodes")
         return len(node_ids)
@@ -138,8 +152,8 @@ def count_nodes_with_embeddings():
         total_query = f"MATCH (n:{node_type}) RETURN count(n) as total"
         with_embedding_query = f"MATCH (n:{node_type}) WHERE n.embedding IS NOT NULL RETURN count(n) as count"
         
-        total_result = neo4j_client.run_query(total_query)
-        with_embedding_result = neo4j_client.run_query(with_embedding_query)
+        total_result = neo4j_client.execute_read(total_query)
+        with_embedding_result = neo4j_client.execute_read(with_embedding_query)
         
         total = total_result[0]["total"] if total_result else 0
         with_embedding = with_embedding_result[0]["count"] if with_embedding_result else 0
@@ -1,43 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
+import json
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Set, Tuple
 
 from git import Repo
 
 from packages.memory.memory import Memory
+from packages.database.graph.graph import neo4j_client
+from packages.database.graph.migrations.schema import REPO_STATS_COUNTERS, ensure_schema
 from packages.ingest.edges import Edge
+from packages.ingest.git_history import CommitInfo, count_new_commits, iter_commits_parallel, resolve_head
 from packages.parser.utils import extract_repo_info
+from packages.config.settings import Settings
 
-
-@dataclass
-class CommitInfo:
-    sha: str
-    message: str
-    author_name: str
-    author_email: str
-    committed_datetime: datetime
-    files_changed: List[str]
-    insertions: int
-    deletions: int
-
-
-def _summarize_commit(commit) -> CommitInfo:
-    stats = commit.stats.total or {}
-    files = list((commit.stats.files or {}).keys())
-    return CommitInfo(
-        sha=commit.hexsha,
-        message=(commit.message or "").strip(),
-        author_name=getattr(commit.author, "name", "") or "",
-        author_email=getattr(commit.author, "email", "") or "",
-        committed_datetime=getattr(commit, "committed_datetime", datetime.utcnow()),
-        files_changed=files,
-        insertions=int(stats.get("insertions", 0)),
-        deletions=int(stats.get("deletions", 0)),
-    )
+settings = Settings()
 
 
 def _decision_doc(repo_url: str, info: CommitInfo) -> str:
@@ -70,6 +48,7 @@ def _upsert_repo(memory: Memory, repo_url: str) -> Tuple[str, str]:
         "url": info["url"],
         "owner": info.get("owner", "unknown"),
         "name": repo_name,
+        "repo_name": repo_name,
         "full_name": info.get("full_name", "unknown"),
         "content": info.get("full_name", "unknown"),
     }
@@ -77,25 +56,23 @@ def _upsert_repo(memory: Memory, repo_url: str) -> Tuple[str, str]:
     return node_id, repo_name
 
 
-def _upsert_person(memory: Memory, name: str, email: str) -> str:
+def _person_row(name: str, email: str) -> Tuple[str, Dict[str, Any]]:
+    """Person properties and the key they are merged on (email, or name without one)"""
     email_norm = (email or "").strip().lower()
     name_norm = (name or "").strip()
     if email_norm:
-        match = {"email": email_norm}
+        match_key = "email"
         pid = f"person:{email_norm}"
     else:
-        match = {"name": name_norm}
+        match_key = "name"
         pid = f"person:{name_norm.lower().replace(' ', '_')}"
-    props = {"id": pid, "name": name_norm, "email": email_norm}
-    return memory.upsert_node("Person", match, props)
+    return match_key, {"id": pid, "name": name_norm, "email": email_norm}
 
 
-def _upsert_commit(memory: Memory, repo_name: str, repo_url: str, info: CommitInfo, content: str) -> str:
+def _commit_row(repo_name: str, repo_url: str, info: CommitInfo, content: str) -> Dict[str, Any]:
     # ID format: {repo_name}:commit:{sha}
-    cid = f"{repo_name}:commit:{info.sha}"
-    match = {"sha": info.sha}
-    props = {
-        "id": cid,
+    return {
+        "id": f"{repo_name}:commit:{info.sha}",
         "sha": info.sha,
         "content": content,
         "author_name": info.author_name,
@@ -105,33 +82,161 @@ def _upsert_commit(memory: Memory, repo_name: str, repo_url: str, info: CommitIn
         "deletions": info.deletions,
         "files_changed": info.files_changed,
         "repo_url": repo_url,
+        "repo_name": repo_name,
     }
-    return memory.upsert_node("Commit", match, props)
 
 
-def _upsert_file(memory: Memory, repo_name: str, file_path: str) -> str:
-    # ID format: {repo_name}:{file_path}:file
-    fid = f"{repo_name}:{file_path}:file"
-    # Match on id directly to avoid constraint conflicts
-    match = {"id": fid}
-    props = {
-        "id": fid,
+def _file_row(repo_name: str, file_path: str) -> Dict[str, Any]:
+    # ID format: {repo_name}:{file_path}:file, the id the parser gives the File node,
+    # so a file that was already parsed is matched and updated
+    return {
+        "id": f"{repo_name}:{file_path}:file",
         "path": file_path,
         "name": Path(file_path).name,
         "repo_name": repo_name,
     }
-    # We use MERGE so if it exists (from Parser) we just update/match it
-    return memory.upsert_node("File", match, props)
 
 
-def process_repository(repo_url: str, branch: Optional[str] = None, max_commits: Optional[int] = None) -> Dict[str, Any]:
-    memory = Memory()
-    commit_nodes: List[str] = []
-    author_nodes: List[str] = []
-    file_nodes: List[str] = []
+class _CommitBatch:
+    """
+    Commit history rows waiting to be written
+
+    Nodes are keyed by id, so a person or file that appears in several
+    commits of a batch is upserted once. flush() writes each node label and
+    edge type as one UNWIND statement.
+    """
+
+    def __init__(self, repo_name: str, repo_url: str, repo_node_id: str):
+        self.repo_name = repo_name
+        self.repo_url = repo_url
+        self.repo_node_id = repo_node_id
+        self._reset()
+
+    def _reset(self):
+        self.persons: Dict[str, Dict[str, Dict[str, Any]]] = {"email": {}, "name": {}}
+        self.commits: List[Dict[str, Any]] = []
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.authored_by: List[Tuple[str, str]] = []
+        self.touched: List[Tuple[str, str]] = []
+        self.rows = 0
+
+    def add(self, info: CommitInfo, content: str) -> Tuple[str, str, List[str]]:
+        """
+        Add a commit with its author and changed files
+
+        Returns:
+            (commit id, author id, file ids)
+        """
+        commit = _commit_row(self.repo_name, self.repo_url, info, content)
+        self.commits.append(commit)
+
+        match_key, person = _person_row(info.author_name, info.author_email)
+        self.persons[match_key][person["id"]] = person
+        self.authored_by.append((commit["id"], person["id"]))
+
+        file_ids = []
+        for file_path in info.files_changed:
+            file = _file_row(self.repo_name, file_path)
+            self.files[file["id"]] = file
+            self.touched.append((commit["id"], file["id"]))
+            file_ids.append(file["id"])
+
+        self.rows += 1 + len(file_ids)
+        return commit["id"], person["id"], file_ids
+
+    def flush(self, memory: Memory):
+        """Write the batch: nodes first, then the edges between them"""
+        if not self.commits:
+            return
+
+        for match_key, persons in self.persons.items():
+            memory.upsert_nodes("Person", [match_key], list(persons.values()))
+        memory.upsert_nodes("Commit", ["sha"], self.commits, stats_counter=REPO_STATS_COUNTERS["Commit"])
+        # Files the parser has not written yet are created here, and counted like parsed ones
+        memory.upsert_nodes("File", ["id"], list(self.files.values()), stats_counter=REPO_STATS_COUNTERS["File"])
+
+        commit_ids = [commit["id"] for commit in self.commits]
+        memory.link_many("Commit", Edge.BELONGS_TO, "Repository", [(cid, self.repo_node_id) for cid in commit_ids])
+        memory.link_many("Commit", Edge.AUTHORED_BY, "Person", self.authored_by)
+        memory.link_many("Commit", Edge.TOUCHED, "File", self.touched)
+        memory.link_many("File", Edge.BELONGS_TO, "Repository", [(fid, self.repo_node_id) for fid in self.files])
+
+        print(
+            f"[commit_ingest] wrote {len(self.commits)} commits, {len(self.files)} files "
+            f"and {len(self.touched)} file changes"
+        )
+        self._reset()
+
+
+def _read_watermarks(repo_url: str) -> Dict[str, str]:
+    """Last ingested commit of each branch, stored as JSON on the Repository node"""
+    result = neo4j_client.execute_read(
+        "MATCH (r:Repository {url: $url}) RETURN r.commit_watermarks AS watermarks",
+        {"url": extract_repo_info(repo_url)["url"]},
+    )
+    if not result or not result[0]["watermarks"]:
+        return {}
+    try:
+        return json.loads(result[0]["watermarks"])
+    except json.JSONDecodeError:
+        print(f"[commit_ingest] WARNING: ignoring malformed commit watermarks of {repo_url}")
+        return {}
+
+
+def _write_watermarks(repo_url: str, watermarks: Dict[str, str]):
+    neo4j_client.execute_write(
+        "MATCH (r:Repository {url: $url}) SET r.commit_watermarks = $watermarks",
+        {"url": extract_repo_info(repo_url)["url"], "watermarks": json.dumps(watermarks, sort_keys=True)},
+    )
+
 
-    # Create/merge repository node once
-    repo_node_id, repo_name = _upsert_repo(memory, repo_url)
+def process_repository(
+    repo_url: str,
+    branch: Optional[str] = None,
+    max_commits: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    jobs: int = 1,
+    since_sha: Optional[str] = None,
+    repo_path: Optional[str | Path] = None
+) -> Dict[str, Any]:
+    """
+    Ingest the commit history of a repository
+
+    Commits, their authors and changed files are accumulated and written in
+    batches of about batch_size rows (commits plus file changes), each as a
+    few UNWIND statements. The history is streamed from `git log --numstat`,
+    so commits are never all held in memory.
+
+    Ingestion resumes from the last commit ingested for the branch, recorded
+    on the Repository node: only `last..HEAD` is walked, including the
+    commits of merged branches, and max_commits is ignored so none are
+    dropped. If nothing changed, no graph writes are made. Without a
+    watermark (or when it is no longer in the history, e.g. after a force
+    push) the newest max_commits commits are ingested.
+
+    Args:
+        repo_url: Local path or clone URL of the repository
+        branch: Branch to check out first
+        max_commits: Only ingest this many of the newest commits when there
+            is no watermark
+        batch_size: Rows per batch (default: NEO4J_WRITE_BATCH_SIZE)
+        jobs: git processes reading the history (see iter_commits_parallel)
+        since_sha: Ingest the commits after this one instead of resuming
+            from the stored watermark
+        repo_path: Existing checkout of repo_url to read instead of cloning it
+
+    Returns:
+        Dictionary with the repository node id and the counts of ingested
+        commits, distinct authors and distinct files
+    """
+    ensure_schema()
+    batch_size = batch_size or settings.NEO4J_WRITE_BATCH_SIZE
+    memory = Memory()
+    # Only counts are returned; ids of distinct authors and files are kept to count them
+    commit_count = 0
+    author_ids: Set[str] = set()
+    file_ids: Set[str] = set()
+    repo_node_id: Optional[str] = None
 
     # Support local path or remote URL
     path: Optional[Path] = None
@@ -139,9 +244,9 @@ def process_repository(repo_url: str, branch: Optional[str] = None, max_commits:
 
     tmp: Optional[TemporaryDirectory] = None
 
-    if Path(repo_url).exists():
+    if repo_path is not None or Path(repo_url).exists():
         # Local repository
-        path = Path(repo_url)
+        path = Path(repo_path if repo_path is not None else repo_url)
         repo = Repo(path)
     else:
         # Remote repository -> clone into temp dir
@@ -155,55 +260,52 @@ def process_repository(repo_url: str, branch: Optional[str] = None, max_commits:
         if branch:
             repo.git.checkout(branch)
 
-        # Iterate commits, newest first
-        commits = list(repo.iter_commits(max_count=max_commits)) if max_commits else list(repo.iter_commits())
-        print(f"[commit_ingest] repo={repo_url} branch={branch or 'HEAD'} total_commits_found={len(commits)} max_commits_limit={max_commits}")
-        if commits:
-            sample = [c.hexsha[:8] for c in commits[:10]]
-            print(f"[commit_ingest] sample_shas={sample}")
-        else:
+        head = resolve_head(path)
+        if head is None:
             print("[commit_ingest] WARNING: No commits found. Possible empty repo, wrong branch, or shallow clone issue.")
+            return _result(repo_node_id, commit_count, author_ids, file_ids)
+        branch_name, head_sha = head
+
+        watermarks = _read_watermarks(repo_url)
+        since = since_sha or watermarks.get(branch_name)
+        if since == head_sha:
+            print(f"[commit_ingest] repo={repo_url} branch={branch_name} is up to date at {head_sha[:8]}")
+            return _result(repo_node_id, commit_count, author_ids, file_ids)
+
+        revs = [head_sha]
+        if since:
+            new_commits = count_new_commits(path, since, head_sha)
+            if new_commits is None:
+                print(f"[commit_ingest] WARNING: {since[:8]} is not in the history of {branch_name}; ingesting the newest commits")
+            else:
+                revs.append(f"^{since}")
+                max_commits = None
+                print(f"[commit_ingest] repo={repo_url} branch={branch_name} new_commits={new_commits} since={since[:8]}")
+        if len(revs) == 1:
+            print(f"[commit_ingest] repo={repo_url} branch={branch_name} max_commits_limit={max_commits}")
+
+        # Create/merge repository node once
+        repo_node_id, repo_name = _upsert_repo(memory, repo_url)
 
-        for c in commits:
-            info = _summarize_commit(c)
+        # Iterate commits, newest first
+        batch = _CommitBatch(repo_name, repo_url, repo_node_id)
+        for info in iter_commits_parallel(path, revs, max_commits=max_commits, jobs=jobs):
             doc = _decision_doc(repo_url, info)
 
-            commit_id = _upsert_commit(memory, repo_name, repo_url, info, doc)
-            print(f"[commit_ingest] created commit node sha={info.sha} node_id={commit_id}")
-            commit_nodes.append(commit_id)
-
-            # Author node
-            author_id = _upsert_person(memory, info.author_name, info.author_email)
-            author_nodes.append(author_id)
-
-            # Link commit to repo & author
-            memory.link(commit_id, Edge.BELONGS_TO, repo_node_id)
-            memory.link(commit_id, Edge.AUTHORED_BY, author_id)
-            
-            # Process files
-            for file_path in info.files_changed:
-                file_id = _upsert_file(memory, repo_name, file_path)
-                file_nodes.append(file_id)
-                
-                # Link Commit -> TOUCHED -> File
-                memory.link(commit_id, Edge.TOUCHED, file_id)
-                
-                # Link File -> BELONGS_TO -> Repo (if not already linked)
-                memory.link(file_id, Edge.BELONGS_TO, repo_node_id)
-
-            print(f"[commit_ingest] linked commit -> repo, author, and {len(info.files_changed)} files")
-
-        return {
-            "repo_node": repo_node_id,
-            "commit_nodes": commit_nodes,
-            "author_nodes": list(set(author_nodes)),
-            "file_nodes": list(set(file_nodes)),
-            "counts": {
-                "commits": len(commit_nodes),
-                "authors": len(set(author_nodes)),
-                "files": len(set(file_nodes)),
-            },
-        }
+            _, author_id, changed_ids = batch.add(info, doc)
+            commit_count += 1
+            author_ids.add(author_id)
+            file_ids.update(changed_ids)
+
+            if batch.rows >= batch_size:
+                batch.flush(memory)
+        batch.flush(memory)
+        print(f"[commit_ingest] total_commits_ingested={commit_count}")
+
+        # Only advance the watermark once every batch is written
+        _write_watermarks(repo_url, {**watermarks, branch_name: head_sha})
+
+        return _result(repo_node_id, commit_count, author_ids, file_ids)
     finally:
         # Best-effort cleanup for clones
         if cleanup:
@@ -219,6 +321,22 @@ def process_repository(repo_url: str, branch: Optional[str] = None, max_commits:
                 pass
 
 
+def _result(
+    repo_node_id: Optional[str],
+    commit_count: int,
+    author_ids: Set[str],
+    file_ids: Set[str]
+) -> Dict[str, Any]:
+    return {
+        "repo_node": repo_node_id,
+        "counts": {
+            "commits": commit_count,
+            "authors": len(author_ids),
+            "files": len(file_ids),
+        },
+    }
+
+
 __all__ = [
     "process_repository",
 ]
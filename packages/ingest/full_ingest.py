@@ -1,6 +1,8 @@
 import argparse
 from typing import Optional
 from packages.parser.core.repository_analyzer import RepositoryAnalyzer
+from packages.parser.core.parse_cache import ParseCache
+from packages.parser.core.file_guard import ParseLimits
 from packages.parser.core.graph_ingestion import graph_ingestion_service
 from packages.ingest.commit_decisions import process_repository
 from packages.ingest.add_embeddings import add_embeddings_to_all_nodes
@@ -22,7 +24,10 @@ def full_ingest(repo_path: str, branch: Optional[str] = None, max_commits: int =
     
     # 1. Parse Code
     print("\n[1/3] Parsing Codebase (AST)...")
-    analyzer = RepositoryAnalyzer()
+    analyzer = RepositoryAnalyzer(
+        parse_cache=ParseCache.from_settings(settings),
+        limits=ParseLimits.from_settings(settings),
+    )
     # cleanup_after=True if it's a URL, but RepositoryAnalyzer handles that.
     # If it's a URL, RepositoryAnalyzer clones it.
     # If we want to reuse the cloned repo for commit ingestion, we might need to coordinate.
@@ -30,13 +35,17 @@ def full_ingest(repo_path: str, branch: Optional[str] = None, max_commits: int =
     # And process_repository also clones if it's a URL.
     # This is inefficient (cloning twice) but simpler for now.
     
-    graph_data = analyzer.analyze_repository(repo_path)
-    print(f"✓ Code parsing complete. {len(graph_data.nodes)} nodes created.")
+    # Parsed files are written to Neo4j as they arrive instead of after the whole repo is parsed
+    fragments = analyzer.iter_file_graphs(repo_path, jobs=settings.MAX_WORKERS)
+    counts = graph_ingestion_service.ingest_graph_stream(fragments)
+    print(f"✓ Code parsing complete. {counts['nodes']} nodes ingested.")
+    if analyzer.last_degraded:
+        print(f"  {len(analyzer.last_degraded)} files recorded without parsing (too large, minified, generated or slow)")
     
     # 2. Ingest Git History
     print("\n[2/3] Ingesting Git History...")
     # process_repository handles cloning internally too.
-    commit_stats = process_repository(repo_path, branch=branch, max_commits=max_commits)
+    commit_stats = process_repository(repo_path, branch=branch, max_commits=max_commits, jobs=settings.MAX_WORKERS)
     print(f"✓ Git ingestion complete. {commit_stats['counts']['commits']} commits processed.")
     
     # 3. Generate Embeddings
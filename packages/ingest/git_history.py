@@ -0,0 +1,281 @@
+"""
+Streaming reader of a repository's commit history.
+
+One `git log --numstat -z` process yields every commit with its changed
+files and line counts, parsed as the output arrives, so memory stays bounded
+however long the history is. GitPython's commit.stats would instead start
+a `git diff` per commit. For very long histories, iter_commits_parallel
+splits the commit list from `git rev-list` into chunks that worker processes
+read with `git log --stdin --no-walk`.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Sequence, Tuple
+
+from packages.parser.utils.git_commit_utils import iter_nul_tokens
+
+
+@dataclass
+class CommitInfo:
+    sha: str
+    message: str
+    author_name: str
+    author_email: str
+    committed_datetime: datetime
+    files_changed: List[str]
+    insertions: int
+    deletions: int
+
+
+# Headers start with \x1e and their fields are split by \x1f; with -z the
+# header and every numstat entry ("added\tdeleted\tpath") are NUL terminated.
+# Renames are reported as a deletion and an addition and merges are diffed
+# against their first parent, as GitPython's commit.stats does.
+_LOG_ARGS = [
+    "--numstat",
+    "-z",
+    "--no-renames",
+    "--diff-merges=first-parent",
+    "--format=%x1e%H%x1f%an%x1f%ae%x1f%cI%x1f%B%x1f",
+]
+
+# Commits per chunk of iter_commits_parallel
+DEFAULT_CHUNK_SIZE = 2000
+
+# Chunks in flight per worker in iter_commits_parallel
+PENDING_PER_WORKER = 2
+
+
+def _parse_log(stream: IO[bytes]) -> Iterator[CommitInfo]:
+    """Parse the output of `git log` run with _LOG_ARGS"""
+    commit: Optional[CommitInfo] = None
+    for token in iter_nul_tokens(stream):
+        if token.startswith("\x1e"):
+            if commit is not None:
+                yield commit
+            parts = token[1:].split("\x1f", 5)
+            if len(parts) < 5:
+                commit = None
+                continue
+            commit = CommitInfo(
+                sha=parts[0],
+                message=parts[4].strip(),
+                author_name=parts[1],
+                author_email=parts[2],
+                committed_datetime=datetime.fromisoformat(parts[3]),
+                files_changed=[],
+                insertions=0,
+                deletions=0,
+            )
+            continue
+
+        if commit is None or not token:
+            continue
+
+        added, deleted, path = token.split("\t", 2)
+        commit.files_changed.append(path)
+        # Binary files are counted as "-"
+        if added != "-":
+            commit.insertions += int(added)
+        if deleted != "-":
+            commit.deletions += int(deleted)
+
+    if commit is not None:
+        yield commit
+
+
+def _run_log(repo_path: Path, args: Sequence[str], stdin: Optional[bytes] = None) -> Iterator[CommitInfo]:
+    """Run git log with _LOG_ARGS and stream the parsed commits"""
+    process = subprocess.Popen(
+        ["git", "log", *_LOG_ARGS, *args],
+        cwd=repo_path,
+        stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if stdin is not None:
+        process.stdin.write(stdin)
+        process.stdin.close()
+
+    completed = False
+    try:
+        yield from _parse_log(process.stdout)
+        completed = True
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        stderr = process.stderr.read().decode("utf-8", errors="replace").strip()
+        process.stderr.close()
+        returncode = process.wait()
+
+    if completed and returncode != 0:
+        raise RuntimeError(f"git log failed in {repo_path}: {stderr}")
+
+
+def iter_commits(
+    repo_path: str | Path,
+    revs: Optional[Sequence[str]] = None,
+    max_commits: Optional[int] = None
+) -> Iterator[CommitInfo]:
+    """
+    Stream the commits of a repository, newest first.
+
+    Args:
+        repo_path: Path to the git repository
+        revs: Revisions to walk, as for git log (e.g. ["main", "^<sha>"];
+            default: HEAD)
+        max_commits: Stop after this many commits
+
+    Yields:
+        CommitInfo records
+
+    Raises:
+        RuntimeError: If git log fails
+    """
+    args = [f"--max-count={max_commits}"] if max_commits else []
+    yield from _run_log(Path(repo_path), [*args, *(revs or ["HEAD"]), "--"])
+
+
+def _git(repo_path: str | Path, *args: str) -> Optional[str]:
+    """Output of a git command, or None if it fails"""
+    result = subprocess.run(["git", *args], cwd=repo_path, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def resolve_head(repo_path: str | Path) -> Optional[Tuple[str, str]]:
+    """
+    The checked out branch and commit of a repository.
+
+    Args:
+        repo_path: Path to the git repository
+
+    Returns:
+        (branch name, or "HEAD" if detached; commit SHA), or None for an empty repository
+    """
+    sha = _git(repo_path, "rev-parse", "--verify", "-q", "HEAD")
+    if not sha:
+        return None
+    return _git(repo_path, "symbolic-ref", "--short", "-q", "HEAD") or "HEAD", sha
+
+
+def count_new_commits(repo_path: str | Path, since_sha: str, rev: str = "HEAD") -> Optional[int]:
+    """
+    Number of commits reachable from rev but not from since_sha.
+
+    Merged branches are included: `since_sha..rev` walks every parent.
+
+    Args:
+        repo_path: Path to the git repository
+        since_sha: Last commit already processed
+        rev: Revision to walk from
+
+    Returns:
+        The count, or None if since_sha is not in the repository (e.g. after a
+        force push or in a shallow clone)
+    """
+    count = _git(repo_path, "rev-list", "--count", f"{since_sha}..{rev}", "--")
+    return int(count) if count is not None else None
+
+
+def _read_chunk(repo_path: str, shas: List[str]) -> List[CommitInfo]:
+    """Worker: read the given commits, in the given order"""
+    stdin = "".join(f"{sha}\n" for sha in shas).encode()
+    return list(_run_log(Path(repo_path), ["--no-walk=unsorted", "--stdin"], stdin=stdin))
+
+
+def _rev_list_chunks(
+    repo_path: Path,
+    revs: Sequence[str],
+    max_commits: Optional[int],
+    chunk_size: int
+) -> Iterator[List[str]]:
+    """Stream `git rev-list` in chunks of commit SHAs"""
+    args = [f"--max-count={max_commits}"] if max_commits else []
+    process = subprocess.Popen(
+        ["git", "rev-list", *args, *revs, "--"],
+        cwd=repo_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        chunk: List[str] = []
+        for line in process.stdout:
+            chunk.append(line.decode().strip())
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        stderr = process.stderr.read().decode("utf-8", errors="replace").strip()
+        process.stderr.close()
+        if process.wait() not in (0, -9) and stderr:
+            raise RuntimeError(f"git rev-list failed in {repo_path}: {stderr}")
+
+
+def iter_commits_parallel(
+    repo_path: str | Path,
+    revs: Optional[Sequence[str]] = None,
+    max_commits: Optional[int] = None,
+    jobs: int = 4,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[CommitInfo]:
+    """
+    Stream the commits of a repository using several git processes.
+
+    Yields the same commits in the same order as iter_commits. The commit
+    list is read with `git rev-list` and split into chunks of chunk_size
+    commits, which worker processes read and parse. At most
+    jobs * PENDING_PER_WORKER chunks are in flight at a time. A range that
+    fits in one chunk is read in this process, without starting workers.
+
+    Args:
+        repo_path: Path to the git repository
+        revs: Revisions to walk (default: HEAD)
+        max_commits: Stop after this many commits
+        jobs: Number of worker processes (1 falls back to iter_commits)
+        chunk_size: Commits per chunk
+
+    Yields:
+        CommitInfo records
+
+    Raises:
+        RuntimeError: If git fails
+    """
+    if jobs <= 1:
+        yield from iter_commits(repo_path, revs, max_commits)
+        return
+
+    repo_path = Path(repo_path)
+    chunks = _rev_list_chunks(repo_path, revs or ["HEAD"], max_commits, chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if second is None:
+        yield from _read_chunk(str(repo_path), first)
+        return
+
+    max_pending = jobs * PENDING_PER_WORKER
+    pending: deque[Future] = deque()
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for shas in chain([first, second], chunks):
+            pending.append(executor.submit(_read_chunk, str(repo_path), shas))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
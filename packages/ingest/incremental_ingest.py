@@ -1,10 +1,12 @@
 import logging
 import subprocess
+import threading
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Optional, List
 
 from packages.parser.core.repository_analyzer import RepositoryAnalyzer
+from packages.parser.core.file_guard import ParseLimits
 from packages.parser.core.graph_ingestion import graph_ingestion_service
 from packages.ingest.commit_decisions import process_repository
 from packages.ingest.add_embeddings import add_embeddings_to_all_nodes
@@ -17,6 +19,19 @@ from packages.ingest.full_ingest import full_ingest
 settings = Settings()
 logger = logging.getLogger(__name__)
 
+# Shared across webhook deliveries so each push can reuse the syntax trees
+# retained from the previous one; the lock serializes use of its parsers
+_analyzer: Optional[RepositoryAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def _get_analyzer() -> RepositoryAnalyzer:
+    """Return the process-wide analyzer, creating it on first use"""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = RepositoryAnalyzer(limits=ParseLimits.from_settings(settings))
+    return _analyzer
+
 def get_changed_files(repo_path: Path, base_sha: str, head_sha: str) -> Optional[List[str]]:
     """Get list of changed files between two commits. Returns None on error."""
     try:
@@ -67,7 +82,7 @@ def incremental_ingest(repo_url: str, branch: Optional[str] = None):
         
         # Get last ingested SHA from Neo4j
         query = "MATCH (r:Repo {name: $name}) RETURN r.repo_sha as sha"
-        result = neo4j_client.run_query(query, {"name": repo_name})
+        result = neo4j_client.execute_read(query, {"name": repo_name})
         
         last_sha = result[0]["sha"] if result and result[0]["sha"] else None
         
@@ -90,22 +105,24 @@ def incremental_ingest(repo_url: str, branch: Optional[str] = None):
         if not changed_files:
             logger.info("No files changed (maybe only merge commits or non-code files).")
         else:
-            # 3. Parse Changed Files
-            analyzer = RepositoryAnalyzer()
-            
-            # First, delete old data for these files
-            for file_path in changed_files:
-                graph_ingestion_service.delete_file_data(repo_name, file_path)
+            # 3. Reparse Changed Files incrementally from the last ingested revision
+            with _analyzer_lock:
+                graph_data = _get_analyzer().analyze_changed_files(
+                    repo_path, last_sha, changed_files, repo_name=repo_name
+                )
             
-            # Then parse and ingest new data
-            graph_data = analyzer.analyze_files(repo_path, changed_files)
-            graph_ingestion_service.ingest_graph_data(graph_data)
+            # Update in place: unchanged symbols keep their embeddings, stale ones are removed
+            counts = graph_ingestion_service.ingest_file_updates(repo_name, changed_files, graph_data)
+            print(
+                f"Updated {counts['upserted']} nodes, {counts['invalidated']} need new embeddings, "
+                f"{counts['deleted']} removed"
+            )
             
         # 4. Ingest Git History (New Commits)
         print("Ingesting new commits...")
-        # We limit to 50 commits to avoid re-ingesting too much history if the gap is large.
-        # Ideally we'd stop at last_sha, but process_repository doesn't support that yet.
-        process_repository(str(repo_path), branch=branch, max_commits=50)
+        # Only last_sha..HEAD is walked, also for graphs ingested before commit watermarks existed.
+        # A push adds a few commits, which one git process reads faster than a worker pool.
+        process_repository(repo_url, branch=branch, repo_path=repo_path, since_sha=last_sha)
         
         # 5. Update Embeddings
         print("Updating embeddings...")
@@ -117,7 +134,7 @@ def incremental_ingest(repo_url: str, branch: Optional[str] = None):
         # 6. Update Repo SHA
         print(f"Updating Repo SHA to {head_sha}...")
         update_query = "MATCH (r:Repo {name: $name}) SET r.repo_sha = $sha"
-        neo4j_client.run_query(update_query, {"name": repo_name, "sha": head_sha})
+        neo4j_client.execute_write(update_query, {"name": repo_name, "sha": head_sha})
         
         print("\n" + "="*50)
         print("✅ Incremental Ingestion Complete!")
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Dict, Any, Optional
 from packages.memory.memory import Memory
+from packages.database.graph.migrations.schema import REPO_STATS_COUNTERS, ensure_schema
 from packages.ingest.edges import Edge
 from packages.parser.utils import extract_repo_info
 
@@ -22,6 +23,7 @@ def ingest_pull_request_metadata(
     """
     if memory is None:
         memory = Memory()
+    ensure_schema()
     
     # Extract repository info
     repo_url = repo_payload.get("clone_url") or repo_payload.get("html_url") or ""
@@ -75,12 +77,14 @@ def ingest_pull_request_metadata(
             "content": pr_content,
             "author": pr_author,
             "repo_url": repo_url,
+            "repo_name": repo_name,
             "state": pr_state,
             "merged": pr_merged,
             "merged_at": pr_merged_at,
             "base_branch": base_branch,
             "head_branch": head_branch,
-        }
+        },
+        stats_counter=REPO_STATS_COUNTERS["PullRequest"],
     )
     
     # Upsert repository node
@@ -92,6 +96,7 @@ def ingest_pull_request_metadata(
             "id": repo_node_id,
             "url": repo_url,
             "name": repo_name,
+            "repo_name": repo_name,
             "owner": repo_info.get("owner", "unknown"),
             "full_name": repo_info.get("full_name", "unknown"),
             "content": repo_info.get("full_name", "unknown"),
@@ -112,8 +117,8 @@ def ingest_pull_request_metadata(
     )
     
     # Create relationships
-    memory.link(pr_node_id, Edge.BELONGS_TO, repo_node_id)
-    memory.link(pr_node_id, Edge.CREATED_BY, author_id)
+    memory.link("PullRequest", pr_node_id, Edge.BELONGS_TO, "Repository", repo_node_id)
+    memory.link("PullRequest", pr_node_id, Edge.CREATED_BY, "Person", author_id)
     
     # If PR is merged and includes commits, link to commits
     # This would require additional commit SHAs from the payload
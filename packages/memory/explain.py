@@ -4,27 +4,27 @@ from packages.ingest.edges import Edge
 class Explain:
     """Provide explanations for a file without relying on legacy GraphQuery."""
 
-    def _get_node(self, node_id: str):
-        result = neo4j_client.run_query("MATCH (n {id: $id}) RETURN n", {"id": node_id})
+    def _get_node(self, label: str, node_id: str):
+        result = neo4j_client.run_query(f"MATCH (n:{label} {{id: $id}}) RETURN n", {"id": node_id})
         return result[0]["n"] if result else None
 
-    def _related(self, node_id: str, edge: Edge):
+    def _related(self, label: str, node_id: str, edge: Edge):
         rel = edge.value
         query = f"""
-        MATCH (n {{id: $id}})-[:{rel}]->(m)
+        MATCH (n:{label} {{id: $id}})-[:{rel}]->(m)
         RETURN m
         """
         return [r["m"] for r in neo4j_client.run_query(query, {"id": node_id})]
 
     def explain_file(self, file_id: str) -> dict:
-        node = self._get_node(file_id)
+        node = self._get_node("File", file_id)
         if node is None:
             return {"error": "File not found", "file_id": file_id}
 
-        classes = self._related(file_id, Edge.HAS_CLASS)
-        functions = self._related(file_id, Edge.HAS_FUNCTION)
-        commits = self._related(file_id, Edge.TOUCHED)
-        packages = self._related(file_id, Edge.IMPORTS)
+        classes = self._related("File", file_id, Edge.HAS_CLASS)
+        functions = self._related("File", file_id, Edge.HAS_FUNCTION)
+        commits = self._related("File", file_id, Edge.TOUCHED)
+        packages = self._related("File", file_id, Edge.IMPORTS)
 
         path = node.get("path") or node.get("name")
 
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from uuid import uuid4
 import json
 from packages.database.graph.graph import neo4j_client
@@ -14,17 +14,17 @@ class Memory:
         # Convert metadata dict to JSON string for Neo4j storage
         metadata_json = json.dumps(metadata) if metadata else "{}"
 
+        # MERGE on the fresh id so a retried transaction cannot create a duplicate
         query = f"""
-          CREATE (n:{type} {{
-              id: $id,
-              content: $content,
-              metadata: $metadata_json,
-              created_at: datetime()
-          }})
+          MERGE (n:{type} {{id: $id}})
+          ON CREATE SET
+              n.content = $content,
+              n.metadata = $metadata_json,
+              n.created_at = datetime()
           RETURN n.id AS id
           """
 
-        result = neo4j_client.run_query(query, {
+        result = neo4j_client.execute_write(query, {
             "id": node_id,
             "content": content,
             "metadata_json": metadata_json
@@ -41,40 +41,124 @@ class Memory:
           RETURN n
           """
 
-        result = neo4j_client.run_query(query, {"q": query_str})
+        result = neo4j_client.execute_read(query, {"q": query_str})
 
         return [r["n"] for r in result]
     
-    def link(self, src_id: str, relation: Edge, dst_id: str):
+    def link(self, src_label: str, src_id: str, relation: Edge, dst_label: str, dst_id: str):
         # Extract the value from the enum
         relation_type = relation.value if hasattr(relation, 'value') else relation
         
+        # Labelled endpoints are found through their label's id index
         query = f"""
-          MATCH (a {{id: $src}}), (b {{id: $dst}})
+          MATCH (a:{src_label} {{id: $src}})
+          MATCH (b:{dst_label} {{id: $dst}})
           MERGE (a)-[r:{relation_type}]->(b)
           RETURN type(r) AS relation
           """
 
-        result = neo4j_client.run_query(query, {
+        result = neo4j_client.execute_write(query, {
             "src": src_id,
             "dst": dst_id
         })
 
         return True
 
-    def upsert_node(self, label: str, match_props: Dict[str, Any], set_props: Dict[str, Any]) -> str:
+    def upsert_node(
+        self,
+        label: str,
+        match_props: Dict[str, Any],
+        set_props: Dict[str, Any],
+        stats_counter: str | None = None
+    ) -> str:
         if "id" not in set_props:
             raise ValueError("set_props must include a stable 'id'")
 
         # Build MERGE pattern map parameters
         merge_keys = ", ".join([f"{k}: $m_{k}" for k in match_props.keys()])
-        query = f"""
-          MERGE (n:{label} {{{merge_keys}}})
-          ON CREATE SET n.created_at = datetime()
-          SET n += $props
-          RETURN n.id AS id
-        """
+        if stats_counter:
+            # Count a created node on its repository's RepoStats node; only the
+            # MERGE that creates the node marks it, so concurrent upserts count it once
+            query = f"""
+              MERGE (n:{label} {{{merge_keys}}})
+              ON CREATE SET n.created_at = datetime(), n._new = true
+              SET n += $props
+              FOREACH (_ IN CASE WHEN n._new IS NOT NULL AND n.repo_name IS NOT NULL THEN [1] ELSE [] END |
+                MERGE (s:RepoStats {{repo_name: n.repo_name}})
+                SET s.{stats_counter} = coalesce(s.{stats_counter}, 0) + 1
+              )
+              REMOVE n._new
+              RETURN n.id AS id
+            """
+        else:
+            query = f"""
+              MERGE (n:{label} {{{merge_keys}}})
+              ON CREATE SET n.created_at = datetime()
+              SET n += $props
+              RETURN n.id AS id
+            """
 
         params = {**{f"m_{k}": v for k, v in match_props.items()}, "props": set_props}
-        result = neo4j_client.run_query(query, params)
+        result = neo4j_client.execute_write(query, params)
         return result[0]["id"] if result else set_props["id"]
+
+    def upsert_nodes(
+        self,
+        label: str,
+        match_keys: List[str],
+        rows: List[Dict[str, Any]],
+        stats_counter: str | None = None
+    ) -> int:
+        """
+        Batched upsert_node: one UNWIND statement; every row holds its match_keys and an 'id'
+
+        With stats_counter, created nodes are added to that counter of the
+        RepoStats node of their row's repo_name. The MERGE that creates a node
+        marks it, so concurrent upserts of one node count it once.
+        """
+        if not rows:
+            return 0
+
+        merge_keys = ", ".join([f"{k}: row.{k}" for k in match_keys])
+        if stats_counter:
+            query = f"""
+              UNWIND $rows AS row
+              MERGE (n:{label} {{{merge_keys}}})
+              ON CREATE SET n.created_at = datetime(), n._new = true
+              SET n += row
+              WITH n, row.repo_name AS repo_name, n._new IS NOT NULL AS created
+              REMOVE n._new
+              WITH repo_name, sum(CASE WHEN created THEN 1 ELSE 0 END) AS created
+              WHERE repo_name IS NOT NULL AND created > 0
+              MERGE (s:RepoStats {{repo_name: repo_name}})
+              SET s.{stats_counter} = coalesce(s.{stats_counter}, 0) + created
+            """
+        else:
+            query = f"""
+              UNWIND $rows AS row
+              MERGE (n:{label} {{{merge_keys}}})
+              ON CREATE SET n.created_at = datetime()
+              SET n += row
+            """
+
+        neo4j_client.execute_write(query, {"rows": rows})
+        return len(rows)
+
+    def link_many(self, src_label: str, relation: Edge, dst_label: str, pairs: List[Tuple[str, str]]) -> int:
+        """Batched link: one UNWIND statement for (src_id, dst_id) pairs"""
+        if not pairs:
+            return 0
+
+        relation_type = relation.value if hasattr(relation, 'value') else relation
+
+        query = f"""
+          UNWIND $rows AS row
+          MATCH (a:{src_label} {{id: row.src}})
+          MATCH (b:{dst_label} {{id: row.dst}})
+          MERGE (a)-[r:{relation_type}]->(b)
+        """
+
+        neo4j_client.execute_write(query, {
+            "rows": [{"src": src, "dst": dst} for src, dst in pairs]
+        })
+        return len(pairs)
@@ -4,6 +4,7 @@ Provides natural language answers to code-related questions.
 """
 
 from typing import Optional, Dict, Any, List, Iterator
+import asyncio
 import logging
 from packages.memory.services.graph_service import GraphService
 from packages.memory.llm import BaseLLMProvider
@@ -60,30 +61,16 @@ class QAService:
         logger.info(f"Processing question with {agent_type} agent: '{question[:50]}...'")
         
         # Step 1: Retrieve relevant context
-        if search_type == "hybrid":
-            if not is_feature_enabled(FeatureFlag.ENABLE_HYBRID_SEARCH):
-                logger.warning("Hybrid search disabled, falling back to vector search")
-                search_type = "vector"
-        
+        search_type = self._resolve_search_type(search_type)
         node_types = AgentType.get_node_types(agent_type)
         context_per_type = max(1, context_limit // len(node_types))
         
         context_items = []
         for node_type in node_types:
             try:
-                if search_type == "vector":
-                    items = self.graph_service.vector_search(
-                        query_text=question,
-                        node_type=node_type,
-                        limit=context_per_type
-                    )
-                else:
-                    items = self.graph_service.hybrid_search(
-                        query_text=question,
-                        node_type=node_type,
-                        limit=context_per_type
-                    )
-                context_items.extend(items)
+                context_items.extend(
+                    self._search(question, node_type, search_type, context_per_type)
+                )
             except Exception as e:
                 logger.warning(f"Error searching {node_type}: {e}")
         
@@ -91,18 +78,113 @@ class QAService:
         
         # Check if we have context
         if not context_items:
-            return {
-                "answer": "I couldn't find any relevant context in the codebase to answer your question. Please try rephrasing or ensure the code has been indexed.",
-                "question": question,
-                "context": [],
-                "context_count": 0,
-                "search_type": search_type,
-                "node_types": node_types,
-                "agent_type": agent_type,
-                "model": self.llm_provider.model,
-                "provider": self.llm_provider.get_provider_name()
-            }
+            return self._build_answer(question, agent_type, search_type, node_types, context_items, None)
+        
+        # Step 2: Generate the answer
+        prompt, system_prompt = self._build_prompt(question, agent_type, context_items)
+        answer = self.llm_provider.generate_text(
+            prompt=prompt,
+            system_prompt=system_prompt
+        )
+        
+        # Step 3: Format and return response
+        return self._build_answer(question, agent_type, search_type, node_types, context_items, answer)
+    
+    async def ask_async(
+        self,
+        question: str,
+        agent_type: str = AgentType.PATHFINDER.value,
+        search_type: str = "hybrid",
+        context_limit: int = 5,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ask for use from async request handlers.
+        
+        The searches for the agent's node types run concurrently on the
+        graph service's async client, and the blocking LLM call runs in a
+        worker thread, so the event loop keeps serving other requests while
+        this one waits.
+        
+        Args:
+            question: The question to answer
+            agent_type: Type of agent to use (determines node types and prompt)
+            search_type: Type of search ('vector' or 'hybrid')
+            context_limit: Maximum number of context items to retrieve
+            
+        Returns:
+            Dictionary containing answer, context, and metadata
+        """
+        logger.info(f"Processing question with {agent_type} agent: '{question[:50]}...'")
+        
+        search_type = self._resolve_search_type(search_type)
+        node_types = AgentType.get_node_types(agent_type)
+        context_per_type = max(1, context_limit // len(node_types))
+        
+        results = await asyncio.gather(
+            *(
+                self._search_async(question, node_type, search_type, context_per_type)
+                for node_type in node_types
+            ),
+            return_exceptions=True
+        )
+        
+        context_items = []
+        for node_type, items in zip(node_types, results):
+            if isinstance(items, Exception):
+                logger.warning(f"Error searching {node_type}: {items}")
+            else:
+                context_items.extend(items)
+        
+        logger.info(f"Retrieved {len(context_items)} context items across {node_types}")
+        
+        if not context_items:
+            return self._build_answer(question, agent_type, search_type, node_types, context_items, None)
+        
+        prompt, system_prompt = self._build_prompt(question, agent_type, context_items)
+        answer = await asyncio.to_thread(
+            self.llm_provider.generate_text,
+            prompt=prompt,
+            system_prompt=system_prompt
+        )
         
+        return self._build_answer(question, agent_type, search_type, node_types, context_items, answer)
+    
+    def _resolve_search_type(self, search_type: str) -> str:
+        """Fall back to vector search when hybrid search is disabled"""
+        if search_type == "hybrid":
+            if not is_feature_enabled(FeatureFlag.ENABLE_HYBRID_SEARCH):
+                logger.warning("Hybrid search disabled, falling back to vector search")
+                return "vector"
+        return search_type
+    
+    def _search(self, question: str, node_type: str, search_type: str, limit: int) -> List[Any]:
+        if search_type == "vector":
+            return self.graph_service.vector_search(
+                query_text=question,
+                node_type=node_type,
+                limit=limit
+            )
+        return self.graph_service.hybrid_search(
+            query_text=question,
+            node_type=node_type,
+            limit=limit
+        )
+    
+    async def _search_async(self, question: str, node_type: str, search_type: str, limit: int) -> List[Any]:
+        if search_type == "vector":
+            return await self.graph_service.vector_search_async(
+                query_text=question,
+                node_type=node_type,
+                limit=limit
+            )
+        return await self.graph_service.hybrid_search_async(
+            query_text=question,
+            node_type=node_type,
+            limit=limit
+        )
+    
+    def _build_prompt(self, question: str, agent_type: str, context_items: List[Any]) -> tuple[str, str]:
+        """Build the user and system prompts for a question and its context"""
         system_prompt = PromptFactory.get_prompt(agent_type)
         context_str = self._format_context_for_llm(context_items)
         prompt = f"""
@@ -112,19 +194,25 @@ class QAService:
             {context_str}
 
             Please provide your answer based on the context above."""
-                    
-        answer = self.llm_provider.generate_text(
-            prompt=prompt,
-            system_prompt=system_prompt
-        )
-        
-        # Step 3: Format and return response
-        context_summary = self._format_context_summary(context_items)
+        return prompt, system_prompt
+    
+    def _build_answer(
+        self,
+        question: str,
+        agent_type: str,
+        search_type: str,
+        node_types: List[str],
+        context_items: List[Any],
+        answer: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the response of ask; answer is None when no context was found"""
+        if answer is None:
+            answer = "I couldn't find any relevant context in the codebase to answer your question. Please try rephrasing or ensure the code has been indexed."
         
         return {
             "answer": answer,
             "question": question,
-            "context": context_summary,
+            "context": self._format_context_summary(context_items),
             "context_count": len(context_items),
             "search_type": search_type,
             "node_types": node_types,
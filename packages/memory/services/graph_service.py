@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict, Any
+import asyncio
 import logging
-from packages.database.graph.graph import Neo4jClient
+from packages.database.graph.graph import Neo4jClient, AsyncNeo4jClient
 from packages.memory.services.embedding_service import EmbeddingService, get_embedding_service
 from packages.memory.models.embedding_provider import EmbeddingProvider
 from packages.memory.models.search_result import SearchResult, VectorSearchResult
@@ -14,12 +15,18 @@ logger = logging.getLogger(__name__)
 class GraphService:
     """
     Service for graph database operations with vector search capabilities.
+    
+    The *_async variants of get_node, vector_search, hybrid_search and
+    find_similar_nodes run their queries on an AsyncNeo4jClient and compute
+    query embeddings in a worker thread, so async request handlers do not
+    block the event loop while they wait.
     """
     
     def __init__(
         self,
         neo4j_client: Neo4jClient,
-        embedding_service: Optional[EmbeddingService] = None
+        embedding_service: Optional[EmbeddingService] = None,
+        async_neo4j_client: Optional[AsyncNeo4jClient] = None
     ):
         """
         Initialize the graph service.
@@ -27,10 +34,17 @@ class GraphService:
         Args:
             neo4j_client: Neo4j database client
             embedding_service: Optional embedding service (creates default if not provided)
+            async_neo4j_client: Async Neo4j client, required by the *_async methods
         """
         self.neo4j_client = neo4j_client
+        self.async_neo4j_client = async_neo4j_client
         self.embedding_service = embedding_service or get_embedding_service()
     
+    def _require_async_client(self) -> AsyncNeo4jClient:
+        if self.async_neo4j_client is None:
+            raise RuntimeError("GraphService was created without an async Neo4j client")
+        return self.async_neo4j_client
+    
     def get_node(
         self,
         node_id: str,
@@ -46,13 +60,28 @@ class GraphService:
         Returns:
             Dictionary containing node properties or None if not found
         """
+        query, params = self._get_node_query(node_id, node_type)
+        result = self.neo4j_client.run_query(query, params)
+        return self._to_node_dict(result)
+    
+    async def get_node_async(
+        self,
+        node_id: str,
+        node_type: str = "Function"
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_node."""
+        query, params = self._get_node_query(node_id, node_type)
+        result = await self._require_async_client().execute_read(query, params)
+        return self._to_node_dict(result)
+    
+    def _get_node_query(self, node_id: str, node_type: str) -> tuple[str, Dict[str, Any]]:
         query = f"""
         MATCH (n:{node_type} {{id: $node_id}})
         RETURN n
         """
-        
-        result = self.neo4j_client.run_query(query, {"node_id": node_id})
-        
+        return query, {"node_id": node_id}
+    
+    def _to_node_dict(self, result: List[Any]) -> Optional[Dict[str, Any]]:
         if result and len(result) > 0:
             node = result[0].get("n")
             if node:
@@ -83,6 +112,31 @@ class GraphService:
         Raises:
             RuntimeError: If vector search feature is disabled
         """
+        limit = self._vector_search_limit(query_text, node_type, limit)
+        
+        # Generate embedding for query
+        query_vector = self.embedding_service.embed_text(query_text)
+        
+        cypher_query, params = self._vector_search_query(node_type, limit, query_vector)
+        results = self.neo4j_client.run_query(cypher_query, params)
+        return self._to_vector_results(results)
+    
+    async def vector_search_async(
+        self,
+        query_text: str,
+        node_type: str = "Function",
+        limit: int = 5
+    ) -> List[VectorSearchResult]:
+        """Async variant of vector_search."""
+        limit = self._vector_search_limit(query_text, node_type, limit)
+        query_vector = await asyncio.to_thread(self.embedding_service.embed_text, query_text)
+        
+        cypher_query, params = self._vector_search_query(node_type, limit, query_vector)
+        results = await self._require_async_client().execute_read(cypher_query, params)
+        return self._to_vector_results(results)
+    
+    def _vector_search_limit(self, query_text: str, node_type: str, limit: int) -> int:
+        """Check the feature flag and apply the configured limit"""
         if not is_feature_enabled(FeatureFlag.ENABLE_VECTOR_SEARCH):
             raise RuntimeError("Vector search is disabled via feature flag")
         
@@ -90,10 +144,9 @@ class GraphService:
         limit = min(limit, settings.VECTOR_SEARCH_MAX_LIMIT)
         
         logger.info(f"Vector search: query='{query_text[:50]}...', node_type={node_type}, limit={limit}")
-        
-        # Generate embedding for query
-        query_vector = self.embedding_service.embed_text(query_text)
-        
+        return limit
+    
+    def _vector_search_query(self, node_type: str, limit: int, query_vector: List[float]) -> tuple[str, Dict[str, Any]]:
         # Get vector index name (align with migration naming *_embedding_index)
         index_name = f"{node_type.lower()}_embedding_index"
         
@@ -105,15 +158,13 @@ class GraphService:
         ORDER BY score DESC
         """
         
-        results = self.neo4j_client.run_query(
-            cypher_query,
-            {
-                "index_name": index_name,
-                "limit": limit,
-                "query_vector": query_vector
-            }
-        )
-        
+        return cypher_query, {
+            "index_name": index_name,
+            "limit": limit,
+            "query_vector": query_vector
+        }
+    
+    def _to_vector_results(self, results: List[Any]) -> List[VectorSearchResult]:
         # Convert results to VectorSearchResult objects
         search_results = []
         for record in results:
@@ -154,6 +205,38 @@ class GraphService:
         Raises:
             RuntimeError: If hybrid search feature is disabled
         """
+        limit, vector_weight = self._hybrid_search_options(query_text, node_type, limit, vector_weight)
+        
+        # Generate embedding for query
+        query_vector = self.embedding_service.embed_text(query_text)
+        
+        cypher_query, params = self._hybrid_search_query(query_text, node_type, limit, vector_weight, query_vector)
+        results = self.neo4j_client.run_query(cypher_query, params)
+        return self._to_hybrid_results(results)
+    
+    async def hybrid_search_async(
+        self,
+        query_text: str,
+        node_type: str = "Function",
+        limit: int = 5,
+        vector_weight: float = 0.7
+    ) -> List[SearchResult]:
+        """Async variant of hybrid_search."""
+        limit, vector_weight = self._hybrid_search_options(query_text, node_type, limit, vector_weight)
+        query_vector = await asyncio.to_thread(self.embedding_service.embed_text, query_text)
+        
+        cypher_query, params = self._hybrid_search_query(query_text, node_type, limit, vector_weight, query_vector)
+        results = await self._require_async_client().execute_read(cypher_query, params)
+        return self._to_hybrid_results(results)
+    
+    def _hybrid_search_options(
+        self,
+        query_text: str,
+        node_type: str,
+        limit: int,
+        vector_weight: Optional[float]
+    ) -> tuple[int, float]:
+        """Check the feature flag and apply the configured limit and weight"""
         if not is_feature_enabled(FeatureFlag.ENABLE_HYBRID_SEARCH):
             raise RuntimeError("Hybrid search is disabled via feature flag")
         
@@ -162,9 +245,16 @@ class GraphService:
         vector_weight = vector_weight if vector_weight is not None else settings.HYBRID_SEARCH_VECTOR_WEIGHT
         
         logger.info(f"Hybrid search: query='{query_text[:50]}...', node_type={node_type}, limit={limit}, weight={vector_weight}")
-        
-        # Generate embedding for query
-        query_vector = self.embedding_service.embed_text(query_text)
+        return limit, vector_weight
+    
+    def _hybrid_search_query(
+        self,
+        query_text: str,
+        node_type: str,
+        limit: int,
+        vector_weight: float,
+        query_vector: List[float]
+    ) -> tuple[str, Dict[str, Any]]:
         index_name = f"{node_type.lower()}_embedding_index"
         
         # Build text search scoring based on node type
@@ -203,17 +293,15 @@ class GraphService:
         LIMIT $limit
         """
         
-        results = self.neo4j_client.run_query(
-            cypher_query,
-            {
-                "index_name": index_name,
-                "limit": limit,
-                "query_vector": query_vector,
-                "query_text": query_text,
-                "vector_weight": vector_weight
-            }
-        )
-        
+        return cypher_query, {
+            "index_name": index_name,
+            "limit": limit,
+            "query_vector": query_vector,
+            "query_text": query_text,
+            "vector_weight": vector_weight
+        }
+    
+    def _to_hybrid_results(self, results: List[Any]) -> List[SearchResult]:
         # Convert results to SearchResult objects
         search_results = []
         for record in results:
@@ -254,7 +342,33 @@ class GraphService:
         if not node or "embedding" not in node:
             return []
         
-        query_vector = node["embedding"]
+        cypher_query, params = self._similar_nodes_query(node_id, node_type, limit, node["embedding"])
+        results = self.neo4j_client.run_query(cypher_query, params)
+        return self._to_similar_results(results)
+    
+    async def find_similar_nodes_async(
+        self,
+        node_id: str,
+        node_type: str = "Function",
+        limit: int = 5
+    ) -> List[VectorSearchResult]:
+        """Async variant of find_similar_nodes."""
+        node = await self.get_node_async(node_id, node_type)
+        
+        if not node or "embedding" not in node:
+            return []
+        
+        cypher_query, params = self._similar_nodes_query(node_id, node_type, limit, node["embedding"])
+        results = await self._require_async_client().execute_read(cypher_query, params)
+        return self._to_similar_results(results)
+    
+    def _similar_nodes_query(
+        self,
+        node_id: str,
+        node_type: str,
+        limit: int,
+        query_vector: List[float]
+    ) -> tuple[str, Dict[str, Any]]:
         index_name = f"{node_type.lower()}_embedding_index"
         
         # Find similar nodes (excluding the query node itself)
@@ -267,16 +381,14 @@ class GraphService:
         LIMIT $limit
         """
         
-        results = self.neo4j_client.run_query(
-            cypher_query,
-            {
-                "index_name": index_name,
-                "limit": limit,
-                "query_vector": query_vector,
-                "node_id": node_id
-            }
-        )
-        
+        return cypher_query, {
+            "index_name": index_name,
+            "limit": limit,
+            "query_vector": query_vector,
+            "node_id": node_id
+        }
+    
+    def _to_similar_results(self, results: List[Any]) -> List[VectorSearchResult]:
         # Convert results
         search_results = []
         for record in results:
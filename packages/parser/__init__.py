@@ -9,6 +9,8 @@ Main components:
 - RepositoryAnalyzer: Orchestrates the parsing of an entire repository
 - BaseLanguageParser: Abstract base class for language-specific parsers
 - GraphIngestionService: Ingests parsed data into Neo4j
+- ParseCache: Persistent cache of per-file parse results keyed by content
+- ParseLimits: Per-file size, minified/generated and time limits
 - Language-specific parsers (Python, JavaScript, etc.)
 
 Usage:
@@ -24,6 +26,8 @@ Usage:
 
 from .core import (
     RepositoryAnalyzer,
+    ParseCache,
+    ParseLimits,
     GraphIngestionService,
     graph_ingestion_service,
 )
@@ -31,6 +35,8 @@ from .models import GraphData
 
 __all__ = [
     "RepositoryAnalyzer",
+    "ParseCache",
+    "ParseLimits",
     "GraphIngestionService",
     "graph_ingestion_service",
     "GraphData",
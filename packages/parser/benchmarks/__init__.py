@@ -0,0 +1,6 @@
+"""
+Microbenchmarks for the parser package
+
+Each module is runnable on its own, e.g.:
+    python -m packages.parser.benchmarks.graph_data
+"""
@@ -0,0 +1,87 @@
+"""
+Benchmark repository file discovery.
+
+Compares the legacy rglob-and-filter walk with the pruning scandir walker
+(walk_repository_files) and, for a git work tree, git ls-files. The default
+synthetic tree puts a small source tree next to a large node_modules and a
+.git-like directory, which the legacy walk lists completely before
+discarding.
+
+Usage:
+    python -m packages.parser.benchmarks.file_discovery
+    python -m packages.parser.benchmarks.file_discovery --path /path/to/repo
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from packages.parser.utils import (
+    is_code_file,
+    should_ignore_path,
+    walk_repository_files,
+    list_git_files,
+)
+
+
+def _legacy_walk(root: Path) -> list[Path]:
+    """File discovery as done before the pruning walker"""
+    return [
+        path for path in root.rglob("*")
+        if not path.is_dir() and not should_ignore_path(path) and is_code_file(path)
+    ]
+
+
+def _build_tree(root: Path, source_dirs: int, ignored_dirs: int, files_per_dir: int):
+    for d in range(source_dirs):
+        directory = root / "src" / f"pkg{d}"
+        directory.mkdir(parents=True)
+        for f in range(files_per_dir):
+            (directory / f"mod{f}.py").write_text("x = 1\n")
+    
+    for parent in ("node_modules", ".git/objects"):
+        for d in range(ignored_dirs):
+            directory = root / parent / f"dep{d}" / "lib"
+            directory.mkdir(parents=True)
+            for f in range(files_per_dir):
+                (directory / f"index{f}.js").write_text("module.exports = 1;\n")
+    
+    (root / ".gitignore").write_text("generated/\n")
+
+
+def _time(label: str, discover) -> None:
+    start = time.perf_counter()
+    files = discover()
+    elapsed = time.perf_counter() - start
+    if files is None:
+        print(f"{label:<10} {'n/a':>8}")
+        return
+    print(f"{label:<10} {len(files):>8} {1000 * elapsed:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark repository file discovery")
+    parser.add_argument("--path", help="Benchmark this directory instead of a synthetic tree")
+    parser.add_argument("--source-dirs", type=int, default=50, help="Synthetic source directories (default: 50)")
+    parser.add_argument("--ignored-dirs", type=int, default=2000, help="Synthetic dependency directories (default: 2000)")
+    parser.add_argument("--files-per-dir", type=int, default=20, help="Files per synthetic directory (default: 20)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.path:
+            root = Path(args.path).resolve()
+        else:
+            root = Path(tmp)
+            _build_tree(root, args.source_dirs, args.ignored_dirs, args.files_per_dir)
+        
+        print(f"{'mode':<10} {'files':>8} {'ms':>10}")
+        print("-" * 30)
+        _time("legacy", lambda: _legacy_walk(root))
+        _time("walk", lambda: list(walk_repository_files(root)))
+        if args.path:
+            _time("git", lambda: list_git_files(root))
+
+
+if __name__ == "__main__":
+    main()
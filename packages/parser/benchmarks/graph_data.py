@@ -0,0 +1,158 @@
+"""
+Benchmark GraphData node and relationship de-duplication on a synthetic graph.
+
+Builds a repository-shaped graph (files with classes, methods and shared
+package imports) where every relationship is offered twice, the way merging
+per-file results and re-extracting shared packages does in practice.
+
+Usage:
+    python -m packages.parser.benchmarks.graph_data
+    python -m packages.parser.benchmarks.graph_data --relationships 1000000
+"""
+
+import argparse
+import time
+
+from packages.parser.models import (
+    ClassRecord,
+    FileRecord,
+    FunctionRecord,
+    GraphData,
+    PackageRecord,
+    Relationship,
+    RelationshipType,
+)
+
+# Relationships produced per synthetic file: 1 import, 2 classes, 4 methods (x2 edges)
+RELATIONSHIPS_PER_FILE = 1 + 2 + 4 * 2
+PACKAGE_COUNT = 500
+
+
+def build_synthetic_graph(file_count: int) -> tuple[list, list[Relationship]]:
+    """Build the nodes and relationships of a synthetic repository"""
+    nodes = [PackageRecord(id=f"package:pkg{i}", name=f"pkg{i}", version="unknown") for i in range(PACKAGE_COUNT)]
+    relationships = []
+    
+    for f in range(file_count):
+        path = f"src/module_{f}.py"
+        file_id = f"bench:{path}:file"
+        nodes.append(FileRecord(id=file_id, path=path, language="python", sha="0" * 64, lines=100))
+        relationships.append(Relationship(
+            source_id=file_id,
+            target_id=f"package:pkg{f % PACKAGE_COUNT}",
+            source_label=FileRecord.label,
+            target_label=PackageRecord.label,
+            type=RelationshipType.IMPORTS,
+        ))
+        
+        for c in range(2):
+            class_id = f"bench:{path}:class:C{c}"
+            nodes.append(ClassRecord(id=class_id, name=f"C{c}", start_line=1, end_line=10))
+            relationships.append(Relationship(
+                source_id=file_id,
+                target_id=class_id,
+                source_label=FileRecord.label,
+                target_label=ClassRecord.label,
+                type=RelationshipType.CONTAINS_CLASS,
+            ))
+            
+            for m in range(2):
+                method_id = f"bench:{path}:method:C{c}:m{m}"
+                nodes.append(FunctionRecord(
+                    id=method_id, name=f"m{m}", signature=f"m{m}(self)", start_line=2, end_line=3, is_method=True
+                ))
+                relationships.append(Relationship(
+                    source_id=class_id,
+                    target_id=method_id,
+                    source_label=ClassRecord.label,
+                    target_label=FunctionRecord.label,
+                    type=RelationshipType.HAS_METHOD,
+                ))
+                relationships.append(Relationship(
+                    source_id=method_id,
+                    target_id=file_id,
+                    source_label=FunctionRecord.label,
+                    target_label=FileRecord.label,
+                    type=RelationshipType.DEFINED_IN,
+                ))
+    
+    return nodes, relationships
+
+
+def run_indexed(nodes: list, relationships: list[Relationship]) -> tuple[float, GraphData]:
+    start = time.perf_counter()
+    graph_data = GraphData()
+    for _ in range(2):
+        for node in nodes:
+            graph_data.add_node(node)
+        for rel in relationships:
+            graph_data.add_relationship(rel)
+    return time.perf_counter() - start, graph_data
+
+
+def run_list_scan(nodes: list, relationships: list[Relationship]) -> float:
+    """The previous list-backed behaviour: linear membership checks on every add"""
+    start = time.perf_counter()
+    node_list: list = []
+    rel_list: list[Relationship] = []
+    for _ in range(2):
+        for node in nodes:
+            if not [n for n in node_list if n.id == node.id]:
+                node_list.append(node)
+        for rel in relationships:
+            if rel not in rel_list:
+                rel_list.append(rel)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GraphData de-duplication")
+    parser.add_argument(
+        "--relationships",
+        type=int,
+        default=500_000,
+        help="Approximate number of unique relationships in the synthetic graph (default: 500000)",
+    )
+    parser.add_argument(
+        "--list-scan-relationships",
+        type=int,
+        default=5_000,
+        help="Graph size for the list-scan comparison, which is quadratic (default: 5000, 0 to skip)",
+    )
+    args = parser.parse_args()
+    
+    file_count = max(1, args.relationships // RELATIONSHIPS_PER_FILE)
+    nodes, relationships = build_synthetic_graph(file_count)
+    print(f"Synthetic graph: {file_count} files, {len(nodes)} nodes, {len(relationships)} relationships")
+    print("Each node and relationship is added twice")
+    print("-" * 60)
+    
+    elapsed, graph_data = run_indexed(nodes, relationships)
+    assert len(graph_data.nodes) == len(nodes)
+    assert len(graph_data.relationships) == len(relationships)
+    adds = 2 * (len(nodes) + len(relationships))
+    print(f"Indexed GraphData:  {elapsed:8.2f}s  ({adds / elapsed:,.0f} adds/s)")
+    
+    start = time.perf_counter()
+    for node in nodes:
+        graph_data.get_node(node.id)
+    lookups = time.perf_counter() - start
+    print(f"get_node lookups:   {lookups:8.2f}s  ({len(nodes) / lookups:,.0f} lookups/s)")
+    
+    start = time.perf_counter()
+    functions = graph_data.get_nodes_by_type(FunctionRecord)
+    print(f"get_nodes_by_type:  {time.perf_counter() - start:8.4f}s  ({len(functions)} functions)")
+    
+    if args.list_scan_relationships:
+        small_files = max(1, args.list_scan_relationships // RELATIONSHIPS_PER_FILE)
+        small_nodes, small_rels = build_synthetic_graph(small_files)
+        indexed, _ = run_indexed(small_nodes, small_rels)
+        scanned = run_list_scan(small_nodes, small_rels)
+        print("-" * 60)
+        print(f"Comparison at {len(small_rels)} relationships:")
+        print(f"  Indexed GraphData: {indexed:8.3f}s")
+        print(f"  List scan:         {scanned:8.3f}s  ({scanned / indexed:,.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
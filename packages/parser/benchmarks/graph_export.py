@@ -0,0 +1,105 @@
+"""
+Benchmark the graph export format.
+
+Parses synthetic sources (or the files of a real directory) into per-file
+fragments, writes them to an export file and streams them back, and
+reports the file size and throughput next to newline-delimited JSON of the
+same fragments (the layout the parse cache uses).
+
+Usage:
+    python -m packages.parser.benchmarks.graph_export
+    python -m packages.parser.benchmarks.graph_export --path /path/to/repo
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from packages.parser.benchmarks.parse_throughput import BENCH_CONTEXT, SYNTHETIC_SOURCES, _load_directory
+from packages.parser.core import RepositoryAnalyzer, export_graph_stream, read_graph_export
+
+
+def _write_json_lines(fragments, path: Path):
+    with open(path, "w", encoding="utf-8") as f:
+        for fragment in fragments:
+            json.dump({
+                "nodes": [[node.label, node.to_dict()] for node in fragment.nodes],
+                "relationships": [
+                    [rel.source_id, rel.target_id, rel.source_label, rel.target_label, rel.type.value, rel.properties]
+                    for rel in fragment.relationships
+                ],
+            }, f, separators=(",", ":"), default=str)
+            f.write("\n")
+
+
+def _read_json_lines(path: Path) -> int:
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            count += len(json.loads(line)["nodes"])
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the graph export format")
+    parser.add_argument("--path", help="Parse the code files of this directory instead of synthetic sources")
+    parser.add_argument("--units", type=int, default=20, help="Classes/functions per synthetic file (default: 20)")
+    parser.add_argument("--files", type=int, default=200, help="Synthetic files per language (default: 200)")
+    args = parser.parse_args()
+    
+    analyzer = RepositoryAnalyzer()
+    if args.path:
+        corpus = _load_directory(Path(args.path).resolve())
+    else:
+        corpus = {
+            language: [
+                (Path(path).with_stem(f"module_{i}"), make_source(args.units))
+                for i in range(args.files)
+            ]
+            for language, (path, make_source) in SYNTHETIC_SOURCES.items()
+        }
+    
+    fragments = []
+    for language, files in corpus.items():
+        lang_parser = analyzer.get_parser(language)
+        if lang_parser is None:
+            continue
+        for rel_path, content in files:
+            fragments.append(lang_parser.parse_file(rel_path, content, BENCH_CONTEXT))
+    nodes = sum(len(fragment.nodes) for fragment in fragments)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        export_path = Path(tmp) / "bench.graph"
+        json_path = Path(tmp) / "bench.jsonl"
+        
+        start = time.perf_counter()
+        export_graph_stream(fragments, export_path)
+        export_write = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        read_back = sum(len(fragment.nodes) for fragment in read_graph_export(export_path))
+        export_read = time.perf_counter() - start
+        assert read_back == nodes
+        
+        start = time.perf_counter()
+        _write_json_lines(fragments, json_path)
+        json_write = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        _read_json_lines(json_path)
+        json_read = time.perf_counter() - start
+        
+        print(f"{len(fragments)} fragments, {nodes} nodes")
+        print("-" * 60)
+        print(f"{'format':<16} {'MiB':>8} {'write ms':>10} {'read ms':>10}")
+        print(f"{'graph export':<16} {os.path.getsize(export_path) / 2**20:>8.2f} {1000 * export_write:>10.1f} {1000 * export_read:>10.1f}")
+        print(f"{'JSON lines':<16} {os.path.getsize(json_path) / 2**20:>8.2f} {1000 * json_write:>10.1f} {1000 * json_read:>10.1f}")
+        print("-" * 60)
+        print("Graph export read time includes rebuilding GraphData records; JSON read only decodes")
+
+
+if __name__ == "__main__":
+    main()
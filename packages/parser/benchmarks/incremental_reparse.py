@@ -0,0 +1,65 @@
+"""
+Benchmark incremental reparsing of an edited file.
+
+Parses a large synthetic Python module, changes a single line and compares
+a from-scratch parse of the new content with BaseLanguageParser.parse_tree
+reusing the retained tree of the old content (as RepositoryAnalyzer does
+between pushes) and with a tree rebuilt from the old source.
+
+Usage:
+    python -m packages.parser.benchmarks.incremental_reparse
+    python -m packages.parser.benchmarks.incremental_reparse --units 2000 --repeat 50
+"""
+
+import argparse
+import time
+
+from packages.parser.benchmarks.parse_throughput import _python_source
+from packages.parser.core import RepositoryAnalyzer
+from packages.parser.utils.git_commit_utils import DiffHunk
+
+
+def _time(repeat: int, func) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return 1000 * (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental reparsing")
+    parser.add_argument("--units", type=int, default=1000, help="Classes/functions in the module (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Measured iterations (default: 20)")
+    args = parser.parse_args()
+    
+    python_parser = RepositoryAnalyzer().get_parser("python")
+    
+    old_content = _python_source(args.units)
+    lines = old_content.split("\n")
+    edited_line = len(lines) // 2
+    lines[edited_line] = lines[edited_line] + "  # edited"
+    new_content = "\n".join(lines)
+    
+    old_source = old_content.encode()
+    hunks = [DiffHunk(edited_line + 1, 1, edited_line + 1, 1)]
+    
+    def retained():
+        old_tree = python_parser.parser.parse(old_source)
+        start = time.perf_counter()
+        python_parser.parse_tree(new_content, old_source, hunks, old_tree)
+        return time.perf_counter() - start
+    
+    full_ms = _time(args.repeat, lambda: python_parser.parse_tree(new_content))
+    rebuilt_ms = _time(args.repeat, lambda: python_parser.parse_tree(new_content, old_source, hunks))
+    retained_ms = 1000 * sum(retained() for _ in range(args.repeat)) / args.repeat
+    
+    print(f"{len(lines)} lines, 1 line edited")
+    print(f"{'mode':<22} {'ms':>8}")
+    print("-" * 31)
+    print(f"{'full parse':<22} {full_ms:>8.2f}")
+    print(f"{'rebuilt old tree':<22} {rebuilt_ms:>8.2f}")
+    print(f"{'retained old tree':<22} {retained_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
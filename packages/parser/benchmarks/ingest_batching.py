@@ -0,0 +1,75 @@
+"""
+Benchmark batched graph ingestion.
+
+Parses a directory and runs GraphIngestionService._write_graph on the
+result. By default the Neo4j client is replaced with one that only records
+what would be sent, which reports the round trips and statements the batched
+writer needs next to the per-row count of one session per node and per
+relationship. With --neo4j the graph is written to the configured database
+and the wall time is reported for each batch size.
+
+Usage:
+    python -m packages.parser.benchmarks.ingest_batching --path /path/to/repo
+    python -m packages.parser.benchmarks.ingest_batching --path /path/to/repo --neo4j
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from packages.parser.core import RepositoryAnalyzer
+from packages.database.graph.migrations.schema import ensure_schema
+from packages.parser.core.graph_ingestion import GraphIngestionService
+
+
+class _RecordingClient:
+    """Stands in for Neo4jClient and counts what the writer sends"""
+    
+    def __init__(self):
+        self.transactions = 0
+        self.statements = 0
+    
+    def run_transaction(self, queries):
+        self.transactions += 1
+        self.statements += len(list(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched graph ingestion")
+    parser.add_argument("--path", required=True, help="Repository to parse and ingest")
+    parser.add_argument(
+        "--batch-sizes", default="100,1000,5000", help="Comma-separated batch sizes (default: 100,1000,5000)"
+    )
+    parser.add_argument("--neo4j", action="store_true", help="Write to the configured Neo4j database")
+    args = parser.parse_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        graph_data = RepositoryAnalyzer().analyze_repository(args.path)
+    rows = len(graph_data.nodes) + len(graph_data.relationships)
+    
+    print(f"{len(graph_data.nodes)} nodes, {len(graph_data.relationships)} relationships")
+    print(f"Per-row writes: {rows} round trips")
+    print("-" * 60)
+    print(f"{'batch size':>10} {'transactions':>14} {'statements':>12} {'seconds':>10}")
+    
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        service = GraphIngestionService(batch_size=batch_size)
+        recorder = _RecordingClient()
+        real_client = service.client
+        service.client = recorder
+        service._write_graph(graph_data)
+        
+        elapsed = "n/a"
+        if args.neo4j:
+            service.client = real_client
+            ensure_schema()
+            start = time.perf_counter()
+            service._write_graph(graph_data)
+            elapsed = f"{time.perf_counter() - start:.2f}"
+        
+        print(f"{batch_size:>10} {recorder.transactions:>14} {recorder.statements:>12} {elapsed:>10}")
+
+
+if __name__ == "__main__":
+    main()
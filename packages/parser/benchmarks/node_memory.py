@@ -0,0 +1,82 @@
+"""
+Benchmark the memory held per parsed node.
+
+Parses synthetic sources (or the files of a real directory) into one
+GraphData of node records, then converts the same nodes to the pydantic
+node models and back. Field values are shared between the two forms, so
+the difference is the per-object overhead: instance dict, fields-set,
+timestamps and validation state of the models versus the slots of the
+records.
+
+Usage:
+    python -m packages.parser.benchmarks.node_memory
+    python -m packages.parser.benchmarks.node_memory --path /path/to/repo
+"""
+
+import argparse
+import gc
+import tracemalloc
+from pathlib import Path
+
+from packages.parser.benchmarks.parse_throughput import BENCH_CONTEXT, SYNTHETIC_SOURCES, _load_directory
+from packages.parser.core import RepositoryAnalyzer
+from packages.parser.models import GraphData
+from packages.parser.models.records import to_record
+
+
+def _traced(build):
+    """Run build and return its result with the bytes it left allocated"""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory per parsed node")
+    parser.add_argument("--path", help="Parse the code files of this directory instead of synthetic sources")
+    parser.add_argument("--units", type=int, default=20, help="Classes/functions per synthetic file (default: 20)")
+    parser.add_argument("--files", type=int, default=200, help="Synthetic files per language (default: 200)")
+    args = parser.parse_args()
+    
+    analyzer = RepositoryAnalyzer()
+    if args.path:
+        corpus = _load_directory(Path(args.path).resolve())
+    else:
+        corpus = {
+            language: [
+                (Path(path).with_stem(f"module_{i}"), make_source(args.units))
+                for i in range(args.files)
+            ]
+            for language, (path, make_source) in SYNTHETIC_SOURCES.items()
+        }
+    
+    def parse_all() -> GraphData:
+        graph_data = GraphData()
+        for language, files in corpus.items():
+            lang_parser = analyzer.get_parser(language)
+            if lang_parser is None:
+                continue
+            for rel_path, content in files:
+                graph_data.merge(lang_parser.parse_file(rel_path, content, BENCH_CONTEXT))
+        return graph_data
+    
+    tracemalloc.start()
+    graph_data, parsed_bytes = _traced(parse_all)
+    models, model_bytes = _traced(graph_data.to_models)
+    records, record_bytes = _traced(lambda: [to_record(model) for model in models])
+    tracemalloc.stop()
+    
+    count = len(graph_data.nodes)
+    print(f"Parse result: {count} nodes, {len(graph_data.relationships)} relationships, {parsed_bytes / 2**20:.1f} MiB")
+    print("-" * 50)
+    print(f"{'form':<16} {'bytes/node':>12} {'MiB':>10}")
+    print(f"{'pydantic model':<16} {model_bytes / count:>12.0f} {model_bytes / 2**20:>10.1f}")
+    print(f"{'record':<16} {record_bytes / count:>12.0f} {record_bytes / 2**20:>10.1f}")
+    print("-" * 50)
+    print(f"Records use {model_bytes / record_bytes:.1f}x less memory per node")
+
+
+if __name__ == "__main__":
+    main()
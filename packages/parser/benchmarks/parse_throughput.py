@@ -0,0 +1,164 @@
+"""
+Benchmark per-file parse throughput of the language parsers.
+
+Parses synthetic Python, JavaScript and TypeScript sources (or the files of a
+real directory) repeatedly through BaseLanguageParser.parse_file and reports
+milliseconds per file and files per second. Git commit lookup is skipped so
+only tree-sitter parsing and symbol extraction are measured.
+
+Usage:
+    python -m packages.parser.benchmarks.parse_throughput
+    python -m packages.parser.benchmarks.parse_throughput --path /path/to/repo --repeat 3
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from packages.parser.core import RepositoryAnalyzer
+from packages.parser.utils import detect_language
+
+# No "path" key, so parsers skip the git commit lookup
+BENCH_CONTEXT = {"name": "bench", "sha": None, "commit_hash": None}
+
+
+def _python_source(units: int) -> str:
+    parts = ['"""Synthetic module"""', "import os", "import json.decoder", "from typing import Optional", ""]
+    for i in range(units):
+        parts.append(f'''
+CONSTANT_{i} = {i}
+
+
+class Service{i}:
+    """Service number {i}"""
+
+    def __init__(self, name: str, size: int = {i}):
+        self.name = name
+        self.size = size
+
+    def process(self, items: list) -> Optional[int]:
+        # Sum the items
+        total = 0
+        for item in items:
+            total += item * self.size
+        return total
+
+
+def helper_{i}(value, *args, **kwargs):
+    """Helper {i}"""
+    return value + {i}
+''')
+    return "\n".join(parts)
+
+
+def _javascript_source(units: int) -> str:
+    parts = ["import React from 'react';", "const lodash = require('lodash');", ""]
+    for i in range(units):
+        parts.append(f'''
+var counter{i} = {i};
+
+class Widget{i} {{
+  constructor(name) {{
+    this.name = name;
+  }}
+
+  render(props) {{
+    // Render the widget
+    return props.items.map((item) => item * {i});
+  }}
+}}
+
+function build{i}(options, callback) {{
+  const result = options.value + {i};
+  return callback(result);
+}}
+''')
+    return "\n".join(parts)
+
+
+def _typescript_source(units: int) -> str:
+    parts = ["import { Injectable } from '@angular/core';", "import axios from 'axios';", ""]
+    for i in range(units):
+        parts.append(f'''
+var limit{i}: number = {i};
+
+class Store{i} {{
+  private items: string[] = [];
+
+  constructor(private readonly name: string) {{}}
+
+  add(item: string): void {{
+    // Store the item
+    this.items.push(item);
+  }}
+}}
+
+function create{i}(name: string, size: number): Store{i} {{
+  return new Store{i}(name + size);
+}}
+''')
+    return "\n".join(parts)
+
+
+SYNTHETIC_SOURCES = {
+    "python": ("bench/module.py", _python_source),
+    "javascript": ("bench/module.js", _javascript_source),
+    "typescript": ("bench/module.ts", _typescript_source),
+}
+
+
+def _load_directory(root: Path) -> dict[str, list[tuple[Path, str]]]:
+    analyzer = RepositoryAnalyzer()
+    files: dict[str, list[tuple[Path, str]]] = {}
+    for path in analyzer._walk_repository(root):
+        language = detect_language(path)
+        if language is None:
+            continue
+        content = path.read_text(encoding="utf-8", errors="ignore")
+        files.setdefault(language, []).append((path.relative_to(root), content))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-file parse throughput")
+    parser.add_argument("--path", help="Benchmark the code files of this directory instead of synthetic sources")
+    parser.add_argument("--units", type=int, default=20, help="Classes/functions per synthetic file (default: 20)")
+    parser.add_argument("--files", type=int, default=200, help="Synthetic files per language (default: 200)")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over a --path corpus (default: 1)")
+    args = parser.parse_args()
+    
+    analyzer = RepositoryAnalyzer()
+    
+    if args.path:
+        corpus = _load_directory(Path(args.path).resolve())
+        repeat = args.repeat
+    else:
+        corpus = {
+            language: [(Path(path), make_source(args.units))]
+            for language, (path, make_source) in SYNTHETIC_SOURCES.items()
+        }
+        repeat = args.files
+    
+    print(f"{'language':<12} {'files':>7} {'ms/file':>9} {'files/s':>9}")
+    print("-" * 40)
+    
+    for language, files in sorted(corpus.items()):
+        lang_parser = analyzer.get_parser(language)
+        if lang_parser is None:
+            continue
+        
+        # Warm up grammar and caches
+        lang_parser.parse_file(files[0][0], files[0][1], BENCH_CONTEXT)
+        
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for rel_path, content in files:
+                lang_parser.parse_file(rel_path, content, BENCH_CONTEXT)
+        elapsed = time.perf_counter() - start
+        
+        count = repeat * len(files)
+        print(f"{language:<12} {count:>7} {1000 * elapsed / count:>9.3f} {count / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark repository analysis with and without the per-file parse limits.
+
+Writes a temporary repository of ordinary synthetic files plus a few
+pathological ones (a minified bundle, a generated protobuf module, a file
+with one huge line and a very large module) and analyzes it twice: once
+with every limit disabled and once with ParseLimits defaults (or the
+--budget given). Reports the wall time of each run, the slowest file, and
+which files were recorded without parsing.
+
+Usage:
+    python -m packages.parser.benchmarks.pathological_files
+    python -m packages.parser.benchmarks.pathological_files --budget 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from packages.parser.benchmarks.parse_throughput import SYNTHETIC_SOURCES
+from packages.parser.core import ParseLimits, RepositoryAnalyzer
+
+
+def _write_repository(root: Path, files: int, units: int):
+    """Write ordinary synthetic files and the pathological ones under root"""
+    for language, (path, make_source) in SYNTHETIC_SOURCES.items():
+        for i in range(files):
+            target = root / Path(path).with_stem(f"module_{i}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(make_source(units))
+    
+    lib = root / "lib"
+    lib.mkdir()
+    # Minified bundle: every function's snippet is the whole line, so parsing
+    # it costs memory quadratic in its size (kept small enough to survive)
+    (lib / "bundle.js").write_text(
+        ";".join(f"function f{i}(a,b){{return a*b+{i}}}" for i in range(1_500))
+    )
+    (lib / "messages_pb2.py").write_text(
+        "\n".join(f"MESSAGE_{i} = _descriptor.Descriptor(name='M{i}')" for i in range(20_000))
+    )
+    (lib / "table.py").write_text("TABLE = [" + ", ".join(str(i) for i in range(200_000)) + "]\n")
+    (lib / "huge.py").write_text(
+        "\n".join(f"def handler_{i}(event):\n    return event + {i}\n" for i in range(36_000))
+    )
+
+
+def _timed_analysis(repo: Path, limits: ParseLimits) -> tuple[float, tuple[float, str], RepositoryAnalyzer]:
+    """Analyze repo, returning the wall time, the slowest file and the analyzer"""
+    analyzer = RepositoryAnalyzer(limits=limits)
+    slowest = (0.0, "")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fragments = analyzer.iter_file_graphs(repo)
+        next(fragments)  # Repo node
+        previous = time.perf_counter()
+        for fragment in fragments:
+            now = time.perf_counter()
+            slowest = max(slowest, (now - previous, fragment.nodes[0].path))
+            previous = now
+    return time.perf_counter() - start, slowest, analyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analysis of pathological files")
+    parser.add_argument("--files", type=int, default=50, help="Ordinary synthetic files per language (default: 50)")
+    parser.add_argument("--units", type=int, default=20, help="Classes/functions per synthetic file (default: 20)")
+    parser.add_argument("--budget", type=float, default=None, help="Per-file time budget in seconds (default: ParseLimits default)")
+    args = parser.parse_args()
+    
+    limited = ParseLimits()
+    if args.budget is not None:
+        limited.time_budget = args.budget
+    unlimited = ParseLimits(
+        max_file_bytes=0, max_line_length=0, minified_line_length=0, skip_generated=False, time_budget=0
+    )
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp)
+        _write_repository(repo, args.files, args.units)
+        
+        print(f"{'limits':<10} {'total s':>10} {'slowest s':>10}  slowest file")
+        print("-" * 60)
+        for name, limits in (("none", unlimited), ("default", limited)):
+            elapsed, (slowest, path), analyzer = _timed_analysis(repo, limits)
+            print(f"{name:<10} {elapsed:>10.2f} {slowest:>10.2f}  {path}")
+        
+        print("-" * 60)
+        print(f"Recorded without parsing ({analyzer.last_summary['files_degraded']} files):")
+        for path, reason in analyzer.last_degraded.items():
+            print(f"  {path}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark parser startup cost.
+
+Each run starts a fresh interpreter and times importing the parser package,
+constructing a RepositoryAnalyzer and parsing a first Python file, then
+lists which grammars were loaded. Since grammars and parsers are created
+on first use, a Python-only run loads only the Python grammar. The cost of
+loading each grammar and building its parser is reported separately.
+
+Usage:
+    python -m packages.parser.benchmarks.startup
+    python -m packages.parser.benchmarks.startup --runs 20
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from packages.parser.utils.language_config import LanguageRegistry
+
+# Runs in a fresh interpreter and prints its timings as JSON
+STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from packages.parser import RepositoryAnalyzer
+imported = time.perf_counter()
+analyzer = RepositoryAnalyzer()
+constructed = time.perf_counter()
+analyzer.get_parser("python").parse_file("bench/module.py", "def f():\\n    return 1\\n", {"name": "bench"})
+parsed = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "analyzer": constructed - imported,
+    "first_parse": parsed - constructed,
+    "grammars": sorted(m for m in sys.modules if m.startswith("tree_sitter_") and "." not in m),
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser startup cost")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to start (default: 10)")
+    args = parser.parse_args()
+    
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE], capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.splitlines()[-1]))
+    
+    print(f"Fresh interpreter, median of {args.runs} runs")
+    print("-" * 40)
+    for key, label in (("import", "import packages.parser"), ("analyzer", "RepositoryAnalyzer()"), ("first_parse", "first Python parse")):
+        print(f"{label:<26} {1000 * statistics.median(s[key] for s in samples):>8.2f} ms")
+    print(f"Grammars loaded: {', '.join(samples[-1]['grammars']) or 'none'}")
+    
+    # Per-language cost paid on first use, in a registry of its own
+    registry = LanguageRegistry()
+    print("-" * 40)
+    print(f"{'language':<12} {'grammar ms':>12} {'parser ms':>12}")
+    for name in registry.supported_languages():
+        start = time.perf_counter()
+        language = registry.get_language(name)
+        loaded = time.perf_counter()
+        if language is None:
+            print(f"{name:<12} {'n/a':>12}")
+            continue
+        registry.create_parser(name)
+        print(f"{name:<12} {1000 * (loaded - start):>12.2f} {1000 * (time.perf_counter() - loaded):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,14 @@ Command-line interface for the repository parser
 Usage:
     python cli.py analyze /path/to/repo
     python cli.py analyze /path/to/repo --skip-ingest
+    python cli.py analyze /path/to/repo --jobs 8
+    python cli.py analyze /path/to/repo --stream
+    python cli.py analyze /path/to/repo --no-cache
+    python cli.py analyze /path/to/repo --file-source git
+    python cli.py analyze /path/to/repo --parse-budget 30 --max-file-bytes 0
+    python cli.py analyze /path/to/repo --export repo.graph
+    python cli.py analyze /path/to/repo --bulk-import import/
+    python cli.py load repo.graph
     python cli.py stats my-repo
     python cli.py clear my-repo
     python cli.py languages
@@ -22,7 +30,12 @@ from packages.parser.models import (
 # Add parent directory to path so imports work
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from packages.parser import RepositoryAnalyzer, graph_ingestion_service
+from packages.parser import RepositoryAnalyzer, ParseCache, ParseLimits, graph_ingestion_service
+from packages.parser.core.graph_export import export_graph_stream, read_graph_export
+from packages.parser.core.bulk_import import write_bulk_import
+from packages.config.settings import Settings
+
+settings = Settings()
 
 
 def analyze_command(args):
@@ -44,11 +57,34 @@ def analyze_command(args):
     print("=" * 60)
     
     # Initialize analyzer
-    analyzer = RepositoryAnalyzer()
+    parse_cache = None if args.no_cache else ParseCache.from_settings(settings, args.cache_dir)
+    limits = ParseLimits.from_settings(settings)
+    if args.max_file_bytes is not None:
+        limits.max_file_bytes = args.max_file_bytes
+    if args.parse_budget is not None:
+        limits.time_budget = args.parse_budget
+    analyzer = RepositoryAnalyzer(parse_cache=parse_cache, limits=limits)
+    
+    if args.export:
+        _analyze_to_export(analyzer, repo_input, args)
+        return
+    
+    if args.bulk_import:
+        _analyze_to_bulk_import(analyzer, repo_input, args)
+        return
+    
+    if args.stream and not args.skip_ingest:
+        _analyze_streaming(analyzer, repo_input, args)
+        return
     
     # Analyze (works with both URLs and local paths)
     try:
-        graph_data = analyzer.analyze_repository(repo_input, cleanup_after=not args.keep_clone)
+        graph_data = analyzer.analyze_repository(
+            repo_input,
+            cleanup_after=not args.keep_clone,
+            jobs=args.jobs,
+            file_source=args.file_source,
+        )
     except Exception as e:
         print(f"Error during analysis: {e}")
         sys.exit(1)
@@ -93,16 +129,8 @@ def analyze_command(args):
             else:
                 repo_name = Path(repo_input).name
             
-            stats = graph_ingestion_service.get_repository_stats(repo_name)
-            print(f"\nNeo4j statistics for '{repo_name}':")
-            print(f"  Files:     {stats['files']}")
-            print(f"  Classes:   {stats['classes']}")
-            print(f"  Functions: {stats['functions']}")
-            print(f"  Tests:     {stats['tests']}")
-            print(f"  Commits:   {stats['commits']}")
-            print(f"  Packages:  {stats['packages']}")
-            print(f"  Docs:      {stats['docs']}")
-            
+            _print_neo4j_stats(repo_name)
+        
         except Exception as e:
             print(f"Error during ingestion: {e}")
             sys.exit(1)
@@ -110,12 +138,145 @@ def analyze_command(args):
         print("\n⊘ Skipping Neo4j ingestion (--skip-ingest)")
 
 
+def _analyze_streaming(analyzer: RepositoryAnalyzer, repo_input: str, args):
+    """Parse and ingest concurrently without holding the whole graph in memory"""
+    from packages.parser.utils import is_git_url, extract_repo_info
+    
+    try:
+        fragments = analyzer.iter_file_graphs(
+            repo_input,
+            cleanup_after=not args.keep_clone,
+            jobs=args.jobs,
+            file_source=args.file_source,
+        )
+        counts = graph_ingestion_service.ingest_graph_stream(fragments)
+    except Exception as e:
+        print(f"Error during streaming analysis: {e}")
+        sys.exit(1)
+    
+    print("\n" + "=" * 60)
+    print("Streaming Analysis Summary")
+    print("=" * 60)
+    print(f"Files parsed:          {analyzer.last_summary['files_parsed']}")
+    print(f"Files skipped:         {analyzer.last_summary['files_skipped']}")
+    print(f"Files not parsed:      {analyzer.last_summary['files_degraded']}")
+    for path, reason in analyzer.last_degraded.items():
+        print(f"  {path}: {reason}")
+    if analyzer.parse_cache is not None:
+        print(f"Parse cache hits:      {analyzer.last_summary['cache_hits']}")
+        print(f"Parse cache misses:    {analyzer.last_summary['cache_misses']}")
+    print(f"Nodes written:         {counts['nodes']}")
+    print(f"Relationships written: {counts['relationships']}")
+    print("\n✓ Successfully ingested into Neo4j!")
+    
+    if is_git_url(repo_input):
+        repo_name = extract_repo_info(repo_input)['name']
+    else:
+        repo_name = Path(repo_input).name
+    _print_neo4j_stats(repo_name)
+
+
+def _analyze_to_export(analyzer: RepositoryAnalyzer, repo_input: str, args):
+    """Parse into an export file instead of Neo4j, for loading later with `load`"""
+    try:
+        fragments = analyzer.iter_file_graphs(
+            repo_input,
+            cleanup_after=not args.keep_clone,
+            jobs=args.jobs,
+            file_source=args.file_source,
+        )
+        counts = export_graph_stream(fragments, args.export)
+    except Exception as e:
+        print(f"Error during export: {e}")
+        sys.exit(1)
+    
+    print("\n" + "=" * 60)
+    print("Export Summary")
+    print("=" * 60)
+    print(f"Files parsed:          {analyzer.last_summary['files_parsed']}")
+    print(f"Files skipped:         {analyzer.last_summary['files_skipped']}")
+    print(f"Files not parsed:      {analyzer.last_summary['files_degraded']}")
+    print(f"Nodes exported:        {counts['nodes']}")
+    print(f"Relationships exported: {counts['relationships']}")
+    print(f"\n✓ Graph written to {args.export}")
+
+
+def _analyze_to_bulk_import(analyzer: RepositoryAnalyzer, repo_input: str, args):
+    """Parse into neo4j-admin import CSVs for the first ingestion of a large repository"""
+    try:
+        fragments = analyzer.iter_file_graphs(
+            repo_input,
+            cleanup_after=not args.keep_clone,
+            jobs=args.jobs,
+            file_source=args.file_source,
+        )
+        counts = write_bulk_import(fragments, args.bulk_import, database=settings.NEO4J_DB)
+    except Exception as e:
+        print(f"Error during bulk import export: {e}")
+        sys.exit(1)
+    
+    import_dir = Path(args.bulk_import)
+    print("\n" + "=" * 60)
+    print("Bulk Import Summary")
+    print("=" * 60)
+    print(f"Files parsed:          {analyzer.last_summary['files_parsed']}")
+    print(f"Files skipped:         {analyzer.last_summary['files_skipped']}")
+    print(f"Files not parsed:      {analyzer.last_summary['files_degraded']}")
+    print(f"Nodes written:         {counts['nodes']}")
+    print(f"Relationships written: {counts['relationships']}")
+    print(f"\n✓ Import files written to {import_dir}")
+    print("\nTo load them into an empty database:")
+    print(f"  1. Stop Neo4j and run {import_dir / 'import.sh'}")
+    print(f"  2. Start Neo4j and run cypher-shell -d {settings.NEO4J_DB} -f {import_dir / 'schema.cypher'}")
+    print("Later changes can then be ingested incrementally.")
+
+
+def load_command(args):
+    """Load a graph export file into Neo4j"""
+    export_path = Path(args.export_path)
+    if not export_path.is_file():
+        print(f"Error: Export file does not exist: {export_path}")
+        sys.exit(1)
+    
+    print(f"Loading graph export: {export_path}")
+    print("=" * 60)
+    
+    try:
+        batches = read_graph_export(export_path, batch_nodes=args.batch_nodes)
+        counts = graph_ingestion_service.ingest_graph_stream(batches)
+    except Exception as e:
+        print(f"Error loading export: {e}")
+        sys.exit(1)
+    
+    print(f"Batches written:       {counts['fragments']}")
+    print(f"Nodes written:         {counts['nodes']}")
+    print(f"Relationships written: {counts['relationships']}")
+    print("\n✓ Successfully loaded into Neo4j!")
+
+
+def _print_neo4j_stats(repo_name: str):
+    """Print the Neo4j statistics of an ingested repository"""
+    stats = graph_ingestion_service.get_repository_stats(repo_name)
+    print(f"\nNeo4j statistics for '{repo_name}':")
+    print(f"  Files:     {stats['files']}")
+    print(f"  Classes:   {stats['classes']}")
+    print(f"  Functions: {stats['functions']}")
+    print(f"  Tests:     {stats['tests']}")
+    print(f"  Commits:   {stats['commits']}")
+    print(f"  Packages:  {stats['packages']}")
+    print(f"  Docs:      {stats['docs']}")
+
+
 def stats_command(args):
     """Get statistics for a repository in Neo4j"""
     repo_name = args.repo_name
     
     try:
-        stats = graph_ingestion_service.get_repository_stats(repo_name)
+        if args.recompute:
+            print(f"Recomputing statistics of '{repo_name}'...")
+            stats = graph_ingestion_service.recompute_repository_stats(repo_name)
+        else:
+            stats = graph_ingestion_service.get_repository_stats(repo_name)
         
         print(f"Neo4j Statistics for '{repo_name}':")
         print("=" * 60)
@@ -126,10 +287,13 @@ def stats_command(args):
         print(f"Commits:   {stats['commits']}")
         print(f"Packages:  {stats['packages']}")
         print(f"Docs:      {stats['docs']}")
+        print(f"PRs:       {stats['pull_requests']}")
         
         if all(v == 0 for v in stats.values()):
             print("\n⚠ No data found. Has this repository been analyzed?")
-        
+            if not args.recompute:
+                print("  Graphs ingested before statistics were recorded need --recompute")
+    
     except Exception as e:
         print(f"Error querying Neo4j: {e}")
         sys.exit(1)
@@ -146,8 +310,9 @@ def clear_command(args):
             return
     
     try:
-        graph_ingestion_service.clear_repository_data(repo_name)
-        print(f"✓ Cleared all data for '{repo_name}'")
+        print(f"Clearing '{repo_name}'...")
+        counts = graph_ingestion_service.clear_repository_data(repo_name)
+        print(f"✓ Cleared all data for '{repo_name}' ({sum(counts.values())} nodes)")
     except Exception as e:
         print(f"Error clearing data: {e}")
         sys.exit(1)
@@ -189,6 +354,22 @@ Examples:
   # Keep cloned repository after analysis
   python cli.py analyze https://github.com/user/repo --keep-clone
   
+  # Parse with 8 worker processes
+  python cli.py analyze /path/to/repo --jobs 8
+  
+  # Write to Neo4j while parsing, with bounded memory
+  python cli.py analyze /path/to/repo --stream
+  
+  # Reparse every file instead of reusing cached results
+  python cli.py analyze /path/to/repo --no-cache
+  
+  # Discover files with git ls-files instead of walking the file system
+  python cli.py analyze /path/to/repo --file-source git
+  
+  # Parse into an export file now, load it into Neo4j later
+  python cli.py analyze /path/to/repo --export repo.graph
+  python cli.py load repo.graph
+  
   # Get statistics for a repository
   python cli.py stats my-repo
   
@@ -218,11 +399,81 @@ Examples:
         action="store_true",
         help="Keep cloned repository after analysis (for Git URLs)"
     )
+    analyze_parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=settings.MAX_WORKERS,
+        help=f"Number of parser processes, 1 disables the pool (default: MAX_WORKERS={settings.MAX_WORKERS})"
+    )
+    analyze_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Ingest into Neo4j while parsing instead of after, keeping memory bounded"
+    )
+    analyze_parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=f"Parse cache directory (default: PARSE_CACHE_DIR={settings.PARSE_CACHE_DIR})"
+    )
+    analyze_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the parse cache and parse every file"
+    )
+    analyze_parser.add_argument(
+        "--file-source",
+        choices=["walk", "git"],
+        default="walk",
+        help="Discover files by walking the file system (honours .gitignore/.secrinignore) "
+             "or from git ls-files (default: walk)"
+    )
+    analyze_parser.add_argument(
+        "--max-file-bytes",
+        type=int,
+        default=None,
+        help=f"Record larger files without parsing them, 0 disables "
+             f"(default: PARSE_MAX_FILE_BYTES={settings.PARSE_MAX_FILE_BYTES})"
+    )
+    analyze_parser.add_argument(
+        "--parse-budget",
+        type=float,
+        default=None,
+        help=f"Seconds a single file may take to parse, 0 disables "
+             f"(default: PARSE_TIME_BUDGET_SECONDS={settings.PARSE_TIME_BUDGET_SECONDS})"
+    )
+    analyze_parser.add_argument(
+        "--export",
+        default=None,
+        metavar="PATH",
+        help="Write the graph to this export file (appending if it exists) instead of Neo4j"
+    )
+    analyze_parser.add_argument(
+        "--bulk-import",
+        default=None,
+        metavar="DIR",
+        help="Write neo4j-admin import CSVs and a loader script to this empty directory instead of Neo4j"
+    )
     analyze_parser.set_defaults(func=analyze_command)
     
+    # Load command
+    load_parser = subparsers.add_parser("load", help="Load a graph export file into Neo4j")
+    load_parser.add_argument("export_path", help="Export file written by analyze --export")
+    load_parser.add_argument(
+        "--batch-nodes",
+        type=int,
+        default=5000,
+        help="Merge exported fragments into batches of at least this many nodes (default: 5000)"
+    )
+    load_parser.set_defaults(func=load_command)
+    
     # Stats command
     stats_parser = subparsers.add_parser("stats", help="Get repository statistics from Neo4j")
     stats_parser.add_argument("repo_name", help="Name of the repository")
+    stats_parser.add_argument(
+        "--recompute",
+        action="store_true",
+        help="Rebuild the statistics counters from the graph"
+    )
     stats_parser.set_defaults(func=stats_command)
     
     # Clear command
@@ -1,11 +1,25 @@
 """Core parsing components"""
 from .base_parser import BaseLanguageParser
+from .parse_cache import ParseCache
+from .file_guard import ParseLimits, ParseBudgetExceeded
+from .source_buffer import SourceBuffer
+from .graph_export import GraphExportWriter, export_graph_stream, read_graph_export
 from .repository_analyzer import RepositoryAnalyzer
 from .graph_ingestion import GraphIngestionService, graph_ingestion_service
+from .bulk_import import BulkImportWriter, write_bulk_import
 
 __all__ = [
     "BaseLanguageParser",
+    "ParseCache",
+    "ParseLimits",
+    "ParseBudgetExceeded",
+    "SourceBuffer",
+    "GraphExportWriter",
+    "export_graph_stream",
+    "read_graph_export",
     "RepositoryAnalyzer",
     "GraphIngestionService",
     "graph_ingestion_service",
+    "BulkImportWriter",
+    "write_bulk_import",
 ]
@@ -1,20 +1,42 @@
 from abc import ABC, abstractmethod
 from typing import Optional, TYPE_CHECKING
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Parser, Node, Query, QueryCursor, Tree
 from pathlib import Path
+from datetime import datetime
+import time
+import warnings
 
-from packages.parser.models import GraphData
+from packages.parser.models import GraphData, CommitRecord, Relationship, RelationshipType
+from packages.parser.core.incremental import compute_tree_edits
+from packages.parser.core.source_buffer import SourceBuffer
+from packages.parser.core.file_guard import ParseBudgetExceeded
 
 if TYPE_CHECKING:
-    from packages.parser.models import FileNode
+    from packages.parser.models import FileRecord
+    from packages.parser.core.parse_cache import ParseCache
+    from packages.parser.utils.git_commit_utils import DiffHunk
+
+
+Captures = dict[str, list[Node]]
 
 
 class BaseLanguageParser(ABC):
-    """Abstract base class for language-specific parsers"""
+    """
+    Abstract base class for language-specific parsers
+    
+    Each parser compiles a single tree-sitter query (query_source) when it is
+    constructed. parse_file runs that query once per file and hands the
+    resulting captures to every extractor, so a file's tree is traversed once
+    instead of once per extractor.
+    """
+    
+    # Bump when extraction logic changes so cached parse results are not reused
+    parser_version = 2
     
     def __init__(self, language: Language):
         self.parser = Parser(language)  # Updated for tree-sitter 0.21+
         self.language = language
+        self.query = Query(language, self.query_source)
     
     @property
     @abstractmethod
@@ -28,82 +50,322 @@ class BaseLanguageParser(ABC):
         """Return list of file extensions this parser handles (e.g., ['.py'])"""
         pass
     
-    def parse_file(self, file_path: Path, content: str, repo_context: dict) -> GraphData:
+    @property
+    @abstractmethod
+    def query_source(self) -> str:
+        """Return the tree-sitter query whose captures drive all extractors"""
+        pass
+    
+    def parse_file(
+        self,
+        file_path: Path,
+        content: str | bytes,
+        repo_context: dict,
+        cache: Optional["ParseCache"] = None,
+        tree: Optional[Tree] = None,
+        budget: Optional[float] = None,
+    ) -> GraphData:
         """
         Parse a file and extract all nodes and relationships
         
         Args:
             file_path: Path to the file being parsed
-            content: Content of the file
+            content: Content of the file, as text or as raw (UTF-8) bytes
             repo_context: Dictionary with repo metadata (name, sha, url, etc.)
+            cache: Optional parse cache; on a hit the file is not parsed at all
+            tree: Optional syntax tree of content already produced by parse_tree
+                (the cache is bypassed when given)
+            budget: Optional wall-clock limit in seconds for parsing and
+                extraction; cache hits are not limited
         
         Returns:
             GraphData object containing all extracted nodes and relationships
+        
+        Raises:
+            ParseBudgetExceeded: If the file took longer than budget
+        """
+        source = SourceBuffer(content)
+        deadline = time.perf_counter() + budget if budget else None
+        
+        if tree is not None:
+            graph_data = self._parse_symbols(file_path, source, repo_context, tree, deadline)
+        elif cache is None:
+            graph_data = self._parse_symbols(file_path, source, repo_context, deadline=deadline)
+        else:
+            key = cache.key(self, file_path, source, repo_context)
+            graph_data = cache.get(key, file_path, repo_context)
+            if graph_data is None:
+                graph_data = self._parse_symbols(file_path, source, repo_context, deadline=deadline)
+                cache.put(key, file_path, repo_context, graph_data)
+        
+        # Commit history is not a function of the content, so it is never cached
+        file_node = graph_data.nodes[0]
+        self._extract_commits(file_path, file_node, graph_data, repo_context)
+        
+        return graph_data
+    
+    def parse_file_only(self, file_path: Path, content: str | bytes, repo_context: dict, reason: str) -> GraphData:
+        """
+        Record a file without parsing it: just its File node and commit history
+        
+        Used for files that are too large, minified, generated or over their
+        parse budget. The file is listed with the reason in degraded_files.
+        
+        Args:
+            file_path: Path to the file
+            content: Content of the file, as text or as raw (UTF-8) bytes
+            repo_context: Dictionary with repo metadata
+            reason: Why the file's symbols were not extracted
+        
+        Returns:
+            GraphData holding the File node and its commits
+        """
+        graph_data = GraphData()
+        file_node = self._create_file_node(file_path, SourceBuffer(content), repo_context)
+        graph_data.add_node(file_node)
+        self._extract_commits(file_path, file_node, graph_data, repo_context)
+        graph_data.degraded_files[Path(file_path).as_posix()] = reason
+        return graph_data
+    
+    def parse_tree(
+        self,
+        content: str | bytes,
+        old_source: Optional[bytes] = None,
+        hunks: Optional[list["DiffHunk"]] = None,
+        old_tree: Optional[Tree] = None,
+    ) -> Tree:
+        """
+        Parse content into a syntax tree, incrementally when the previous version is known
+        
+        Given the previous source and the diff hunks leading to content, the
+        old tree (passed in, or rebuilt from old_source) is edited with
+        Tree.edit and tree-sitter only re-parses the damaged regions. If the
+        hunks do not match the two sources the file is parsed from scratch.
+        
+        Args:
+            content: New content of the file, as text or as raw (UTF-8) bytes
+            old_source: Previous content, as the bytes old_tree was parsed from
+            hunks: `git diff -U0` hunks from old_source to content
+            old_tree: Tree of old_source to reuse; it is edited in place
+        
+        Returns:
+            Syntax tree of content
+        """
+        source = content.encode("utf-8", errors="surrogatepass") if isinstance(content, str) else content
+        
+        if old_source is not None and hunks is not None:
+            edits = compute_tree_edits(old_source, source, hunks)
+            if edits is not None:
+                if old_tree is None:
+                    old_tree = self.parser.parse(old_source)
+                for edit in edits:
+                    old_tree.edit(**edit)
+                return self.parser.parse(source, old_tree)
+        
+        return self.parser.parse(source)
+    
+    def _parse_symbols(
+        self,
+        file_path: Path,
+        source: SourceBuffer,
+        repo_context: dict,
+        tree: Optional[Tree] = None,
+        deadline: Optional[float] = None,
+    ) -> GraphData:
+        """
+        Parse a file and extract everything that depends only on its content
+        
+        The File node is always the first node of the returned GraphData.
+        With a deadline (a time.perf_counter() value) tree-sitter stops
+        parsing and querying when it passes, and the remaining extractors are
+        not run; ParseBudgetExceeded is raised in either case.
         """
-        tree = self.parser.parse(bytes(content, "utf8"))
+        if tree is None:
+            tree = self._parse_within(source.data, deadline)
+        root_node = tree.root_node
         graph_data = GraphData()
         
         # Create File node
-        file_node = self._create_file_node(file_path, content, repo_context)
+        file_node = self._create_file_node(file_path, source, repo_context)
         graph_data.add_node(file_node)
         
-        # Extract code elements
-        self._extract_classes(tree.root_node, content, file_node, graph_data, repo_context)
-        self._extract_functions(tree.root_node, content, file_node, graph_data, repo_context)
-        self._extract_imports(tree.root_node, content, file_node, graph_data, repo_context)
-        self._extract_variables(tree.root_node, content, file_node, graph_data, repo_context)
-        self._extract_docs(tree.root_node, content, file_node, graph_data, repo_context)
+        # Single traversal: all extractors share the captures of one query run
+        captures = self._capture(root_node, deadline)
         
-        # Extract additional metadata
-        self._extract_tests(tree.root_node, content, file_node, graph_data, repo_context)
-        self._extract_commits(file_path, file_node, graph_data, repo_context)
+        extractors = (
+            # Code elements
+            self._extract_classes,
+            self._extract_functions,
+            self._extract_imports,
+            self._extract_variables,
+            self._extract_docs,
+            # Additional metadata
+            self._extract_tests,
+        )
+        for extract in extractors:
+            self._check_deadline(deadline)
+            extract(root_node, captures, source, file_node, graph_data, repo_context)
+        self._check_deadline(deadline)
         
         return graph_data
     
+    def _parse_within(self, data: bytes, deadline: Optional[float]) -> Tree:
+        """Parse data from scratch, giving up at deadline"""
+        if deadline is None:
+            return self.parser.parse(data)
+        
+        remaining = self._check_deadline(deadline)
+        # timeout_micros is deprecated in favour of a progress callback, but
+        # tree-sitter only calls that callback for sources read in chunks
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            self.parser.timeout_micros = max(1, int(remaining * 1_000_000))
+            try:
+                return self.parser.parse(data)
+            except ValueError:
+                # The parser keeps the unfinished parse state until reset
+                self.parser.reset()
+                raise ParseBudgetExceeded("parse budget exceeded while building the syntax tree")
+            finally:
+                self.parser.timeout_micros = 0
+    
+    def _check_deadline(self, deadline: Optional[float]) -> float:
+        """
+        Raise ParseBudgetExceeded if deadline has passed
+        
+        Returns:
+            Seconds left until the deadline (infinite without one)
+        """
+        if deadline is None:
+            return float("inf")
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise ParseBudgetExceeded("parse budget exceeded while extracting symbols")
+        return remaining
+    
     @abstractmethod
-    def _create_file_node(self, file_path: Path, content: str, repo_context: dict) -> 'FileNode':
-        """Create a FileNode for the given file"""
+    def _create_file_node(self, file_path: Path, source: SourceBuffer, repo_context: dict) -> 'FileRecord':
+        """Create the File node record for the given file"""
         pass
     
     @abstractmethod
-    def _extract_classes(self, root_node: Node, content: str, file_node, graph_data: GraphData, repo_context: dict):
+    def _extract_classes(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node, graph_data: GraphData, repo_context: dict):
         """Extract class definitions from the AST"""
         pass
     
     @abstractmethod
-    def _extract_functions(self, root_node: Node, content: str, file_node, graph_data: GraphData, repo_context: dict):
+    def _extract_functions(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node, graph_data: GraphData, repo_context: dict):
         """Extract function/method definitions from the AST"""
         pass
     
     @abstractmethod
-    def _extract_imports(self, root_node: Node, content: str, file_node, graph_data: GraphData, repo_context: dict):
+    def _extract_imports(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node, graph_data: GraphData, repo_context: dict):
         """Extract import statements"""
         pass
     
     @abstractmethod
-    def _extract_variables(self, root_node: Node, content: str, file_node, graph_data: GraphData, repo_context: dict):
+    def _extract_variables(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node, graph_data: GraphData, repo_context: dict):
         """Extract variable declarations"""
         pass
     
-    def _extract_docs(self, root_node: Node, content: str, file_node, graph_data: GraphData, repo_context: dict):
+    def _extract_docs(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node, graph_data: GraphData, repo_context: dict):
         """Extract documentation (can be overridden by subclasses)"""
         pass
     
-    def _extract_tests(self, root_node: Node, content: str, file_node, graph_data: GraphData, repo_context: dict):
+    def _extract_tests(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node, graph_data: GraphData, repo_context: dict):
         """Extract test cases (can be overridden by subclasses)"""
         pass
     
     def _extract_commits(self, file_path: Path, file_node, graph_data: GraphData, repo_context: dict):
-        """Extract commit information for the file (can be overridden by subclasses)"""
-        pass
+        """
+        Link the file to the last commit that touched it
+        
+        Uses the path -> commit map the analyzer precomputes into
+        repo_context["last_commits"] with a single git log pass; without it
+        (e.g. when a parser is used on its own) git is asked per file.
+        """
+        last_commits = repo_context.get("last_commits")
+        
+        if last_commits is not None:
+            commit_info = last_commits.get(Path(file_path).as_posix())
+        else:
+            from packages.parser.utils.git_commit_utils import get_last_commit_for_file
+            
+            # Get repo path from context
+            repo_path_str = repo_context.get("path")
+            if not repo_path_str:
+                return
+            
+            commit_info = get_last_commit_for_file(Path(repo_path_str), file_path)
+        
+        if not commit_info:
+            return
+        
+        # Create Commit node
+        commit_id = self._generate_id(
+            repo_context["name"],
+            "commit",
+            commit_info['hash']
+        )
+        
+        if not graph_data.has_node(commit_id):
+            # Parse date
+            try:
+                commit_date = datetime.fromisoformat(commit_info['date'].replace('Z', '+00:00'))
+            except:
+                commit_date = datetime.utcnow()
+            
+            graph_data.add_node(CommitRecord(
+                id=commit_id,
+                hash=commit_info['hash'],
+                author=commit_info['author'],
+                email=commit_info['email'],
+                date=commit_date,
+                message=commit_info['message'],
+                repo_sha=repo_context.get("sha"),
+            ))
+        
+        # Create relationship: Commit TOUCHED File
+        graph_data.add_relationship(Relationship(
+            source_id=commit_id,
+            target_id=file_node.id,
+            source_label=CommitRecord.label,
+            target_label=file_node.label,
+            type=RelationshipType.TOUCHED
+        ))
     
-    def _extract_function_calls(self, node: Node, content: str, function_node, graph_data: GraphData):
+    def _extract_function_calls(self, node: Node, source: SourceBuffer, function_node, graph_data: GraphData):
         """Extract function calls within a function (helper method)"""
         pass
     
-    def _get_node_text(self, node: Node, content: str) -> str:
+    def _capture(self, node: Node, deadline: Optional[float] = None) -> Captures:
+        """
+        Run the parser's precompiled query over a subtree
+        
+        Args:
+            node: Root of the subtree
+            deadline: Optional time.perf_counter() value to stop querying at
+        
+        Returns:
+            Capture name -> nodes, each list sorted in document order
+        """
+        cursor = QueryCursor(self.query)
+        if deadline is not None:
+            # A timed out cursor returns the captures found so far, so an
+            # expired deadline is checked again afterwards
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                cursor.timeout_micros = max(1, int(self._check_deadline(deadline) * 1_000_000))
+        captures = cursor.captures(node)
+        if deadline is not None and time.perf_counter() >= deadline:
+            raise ParseBudgetExceeded("parse budget exceeded while querying the syntax tree")
+        for nodes in captures.values():
+            nodes.sort(key=lambda n: n.start_byte)
+        return captures
+    
+    def _get_node_text(self, node: Node, source: SourceBuffer) -> str:
         """Extract text from a tree-sitter node"""
-        return content[node.start_byte:node.end_byte]
+        return source.node_text(node)
     
     def _get_line_number(self, node: Node) -> int:
         """Get line number (1-indexed) from node"""
@@ -113,9 +375,6 @@ class BaseLanguageParser(ABC):
         """Generate a canonical ID for a node"""
         return ":".join(str(p) for p in parts)
     
-    def _get_snippet(self, content: str, start_line: int, end_line: int, max_lines: int = 5) -> str:
+    def _get_snippet(self, source: SourceBuffer, start_line: int, end_line: int, max_lines: int = 5) -> str:
         """Extract a code snippet (limited to max_lines)"""
-        lines = content.split('\n')
-        start_idx = start_line - 1
-        end_idx = min(start_line - 1 + max_lines, end_line)
-        return '\n'.join(lines[start_idx:end_idx])
+        return source.lines(start_line, min(start_line - 1 + max_lines, end_line))
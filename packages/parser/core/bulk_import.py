@@ -0,0 +1,306 @@
+"""
+neo4j-admin bulk-import CSVs of parsed graphs
+
+Transactional MERGEs make the first ingestion of a very large repository
+take hours. `neo4j-admin database import full` builds a new database from
+CSV files offline, orders of magnitude faster. BulkImportWriter streams
+GraphData fragments into such files:
+    
+    nodes/<Label>.csv                          one file per label
+    nodes/RepoStats.csv                        statistics counters of each repository
+    relationships/<Source>-<TYPE>-<Target>.csv  one file per endpoint labels and type
+    schema.cypher                              the graph schema, to apply after the import
+    import.sh                                  loader for an empty database
+
+Every label is its own ID space (`id:ID(File)`, `:START_ID(File)`), and
+headers carry the property types of the node records. Values are written
+the way GraphIngestionService writes them, so later incremental updates
+MERGE onto the imported nodes: datetimes as ISO 8601 strings, missing
+values as absent properties, repository nodes stamped with repo_name.
+Once imported, the database is updated through the normal incremental
+path.
+"""
+from dataclasses import fields
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Optional, Union, get_args, get_origin
+
+from packages.database.graph.migrations.schema import (
+    REPO_STATS_COUNTERS,
+    record_version_statement,
+    schema_statements,
+)
+from packages.parser.core.graph_ingestion import FILE_SCOPED_LABELS, STATS_KEYS, graph_ingestion_service, node_repo_name
+from packages.parser.models import GraphData, NodeRecord, RelationshipType
+
+# Separates the elements of array properties (neo4j-admin's default)
+ARRAY_DELIMITER = ";"
+
+# neo4j-admin header types of record field annotations; anything else is a string
+_HEADER_TYPES = {int: "int", float: "double", bool: "boolean"}
+
+_LOADER_SCRIPT = """#!/bin/sh
+# Bulk-import this directory into an EMPTY Neo4j database.
+#
+# Stop Neo4j first; neo4j-admin refuses to import into an existing database
+# unless --overwrite-destination is added below. Start Neo4j afterwards and
+# create the schema:
+#     cypher-shell -d <database> -f schema.cypher
+#
+# Usage: ./import.sh [database]   (default: {database})
+# Set NEO4J_ADMIN to the neo4j-admin executable if it is not on PATH.
+set -e
+cd "$(dirname "$0")"
+
+"${{NEO4J_ADMIN:-neo4j-admin}}" database import full \\
+    --id-type=string \\
+    --multiline-fields=true \\
+    --array-delimiter="{array_delimiter}" \\
+{files}    "${{1:-{database}}}"
+"""
+
+
+def _header_type(annotation: Any) -> Optional[str]:
+    """neo4j-admin type of a record field annotation, None for strings"""
+    if get_origin(annotation) is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    if get_origin(annotation) is list:
+        return "string[]"
+    return _HEADER_TYPES.get(annotation)
+
+
+def _value_type(value: Any) -> Optional[str]:
+    """neo4j-admin type of a relationship property value, None for strings"""
+    if isinstance(value, list):
+        return "string[]"
+    return _HEADER_TYPES.get(type(value))
+
+
+def _csv_field(value: Any) -> str:
+    """
+    Format one CSV field
+    
+    Strings are always quoted and None is left empty, because neo4j-admin
+    stores "" as an empty string but skips an empty unquoted field.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, list):
+        value = ARRAY_DELIMITER.join(str(item) for item in value)
+    else:
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _csv_row(values: Iterable[Any]) -> str:
+    return ",".join(map(_csv_field, values)) + "\n"
+
+
+class BulkImportWriter:
+    """
+    Writes GraphData fragments as neo4j-admin import CSVs
+    
+    Usable as a context manager; the loader script is written on close.
+    Nodes whose ids repeat across fragments (packages, commits) are written
+    once.
+    
+    Example:
+        with BulkImportWriter("import/") as writer:
+            for fragment in analyzer.iter_file_graphs("/path/to/repo"):
+                writer.write(fragment)
+    """
+    
+    def __init__(self, directory: str | Path, database: str = "neo4j"):
+        """
+        Args:
+            directory: Directory to write the CSVs to; must be empty or not exist
+            database: Default database name of the loader script
+        """
+        self.directory = Path(directory)
+        self.database = database
+        self.counts = {"fragments": 0, "nodes": 0, "relationships": 0}
+        
+        if self.directory.exists() and any(self.directory.iterdir()):
+            raise ValueError(f"Bulk import directory is not empty: {self.directory}")
+        (self.directory / "nodes").mkdir(parents=True, exist_ok=True)
+        (self.directory / "relationships").mkdir(exist_ok=True)
+        
+        # Open CSVs by label, and by relationship key and property columns
+        self._node_files: Dict[str, tuple[IO[str], tuple[str, ...]]] = {}
+        self._relationship_files: Dict[tuple, tuple[IO[str], tuple[str, ...]]] = {}
+        # Ids of the written nodes that are not scoped to one file, which
+        # later fragments repeat
+        self._shared_ids: set[str] = set()
+        # Statistics counters and imported packages by repository
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._packages: Dict[str, set[str]] = {}
+        self._closed = False
+        # The MERGE path stamps nodes when they are written; imported nodes get the import time
+        self._now = datetime.utcnow().isoformat()
+    
+    def write(self, graph_data: GraphData):
+        """
+        Append one fragment
+        
+        Args:
+            graph_data: Fragment to write; its relationships may point to
+                nodes of this or an earlier fragment
+        """
+        if self._closed:
+            raise ValueError("Bulk import writer is closed")
+        
+        for node in graph_data.nodes:
+            if node.label not in FILE_SCOPED_LABELS:
+                if node.id in self._shared_ids:
+                    continue
+                self._shared_ids.add(node.id)
+            self._write_node(node)
+            self.counts["nodes"] += 1
+            
+            counter = REPO_STATS_COUNTERS.get(node.label)
+            if counter is not None:
+                stats = self._stats.setdefault(node_repo_name(node), dict.fromkeys(STATS_KEYS, 0))
+                stats[counter] += 1
+        
+        for rel in graph_data.relationships:
+            properties = graph_ingestion_service._sanitize_properties(rel.properties)
+            columns = tuple(sorted(properties))
+            key = (rel.source_label, rel.type.value, rel.target_label, columns)
+            
+            entry = self._relationship_files.get(key)
+            if entry is None:
+                entry = self._open_relationship_file(key, properties)
+            f, _ = entry
+            f.write(_csv_row([rel.source_id, rel.target_id, rel.type.value, *(properties[name] for name in columns)]))
+            self.counts["relationships"] += 1
+            
+            if rel.type == RelationshipType.IMPORTS and rel.source_label == "File":
+                self._packages.setdefault(rel.source_id.split(":", 1)[0], set()).add(rel.target_id)
+        
+        self.counts["fragments"] += 1
+    
+    def close(self):
+        """Close the CSVs and write schema.cypher and import.sh"""
+        if self._closed:
+            return
+        self._closed = True
+        
+        for f, _ in self._node_files.values():
+            f.close()
+        for f, _ in self._relationship_files.values():
+            f.close()
+        
+        node_files = [f"nodes/{label}.csv" for label in self._node_files]
+        if self._stats or self._packages:
+            self._write_stats()
+            node_files.append("nodes/RepoStats.csv")
+        
+        # Recording the version lets the next ingestion skip its schema DDL
+        statements = [*schema_statements(), record_version_statement()]
+        (self.directory / "schema.cypher").write_text(
+            "".join(f"{statement};\n" for statement in statements)
+        )
+        
+        files = [f"    --nodes={path} \\\n" for path in node_files]
+        files += [
+            f"    --relationships={Path(f.name).relative_to(self.directory).as_posix()} \\\n"
+            for f, _ in self._relationship_files.values()
+        ]
+        script = self.directory / "import.sh"
+        script.write_text(_LOADER_SCRIPT.format(
+            database=self.database,
+            array_delimiter=ARRAY_DELIMITER,
+            files="".join(files),
+        ))
+        script.chmod(0o755)
+    
+    def __enter__(self) -> "BulkImportWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _write_stats(self):
+        """Write the RepoStats node of each repository, as ingestion maintains them"""
+        for repo_name, packages in self._packages.items():
+            self._stats.setdefault(repo_name, dict.fromkeys(STATS_KEYS, 0))["packages"] = len(packages)
+        
+        header = ["repo_name:ID(RepoStats)", *(f"{key}:int" for key in STATS_KEYS), ":LABEL"]
+        with open(self.directory / "nodes" / "RepoStats.csv", "w", encoding="utf-8", newline="") as f:
+            f.write(",".join(header) + "\n")
+            for repo_name, stats in self._stats.items():
+                f.write(_csv_row([repo_name, *(stats[key] for key in STATS_KEYS), "RepoStats"]))
+    
+    def _write_node(self, node: NodeRecord):
+        entry = self._node_files.get(node.label)
+        if entry is None:
+            entry = self._open_node_file(node)
+        f, names = entry
+        values = node.to_dict()
+        f.write(_csv_row([
+            node.id, *(values[name] for name in names), node_repo_name(node), self._now, self._now, node.label
+        ]))
+    
+    def _open_node_file(self, node: NodeRecord) -> tuple[IO[str], tuple[str, ...]]:
+        """Create the CSV of a label, with a header typed from its record fields"""
+        names = tuple(field.name for field in fields(node) if field.name != "id")
+        types = {field.name: _header_type(field.type) for field in fields(node)}
+        header = [f"id:ID({node.label})"]
+        header += [f"{name}:{types[name]}" if types[name] else name for name in names]
+        header += ["repo_name", "created_at", "updated_at", ":LABEL"]
+        
+        f = open(self.directory / "nodes" / f"{node.label}.csv", "w", encoding="utf-8", newline="")
+        f.write(",".join(header) + "\n")
+        entry = self._node_files[node.label] = (f, names)
+        return entry
+    
+    def _open_relationship_file(self, key: tuple, properties: Dict[str, Any]) -> tuple[IO[str], tuple[str, ...]]:
+        """
+        Create the CSV of a relationship key
+        
+        Relationships with the same endpoint labels and type but different
+        property names get separate files, since a header fixes the columns.
+        """
+        source_label, rel_type, target_label, columns = key
+        header = [f":START_ID({source_label})", f":END_ID({target_label})", ":TYPE"]
+        for name in columns:
+            value_type = _value_type(properties[name])
+            header.append(f"{name}:{value_type}" if value_type else name)
+        
+        stem = f"{source_label}-{rel_type}-{target_label}"
+        same_stem = sum(1 for other in self._relationship_files if other[:3] == key[:3])
+        if same_stem:
+            stem = f"{stem}-{same_stem + 1}"
+        
+        path = self.directory / "relationships" / f"{stem}.csv"
+        f = open(path, "w", encoding="utf-8", newline="")
+        f.write(",".join(header) + "\n")
+        entry = self._relationship_files[key] = (f, columns)
+        return entry
+    
+
+def write_bulk_import(fragments: Iterable[GraphData], directory: str | Path, database: str = "neo4j") -> Dict[str, int]:
+    """
+    Write graph fragments as neo4j-admin import CSVs as they are produced
+    
+    Args:
+        fragments: Iterable of GraphData fragments (e.g. from iter_file_graphs)
+        directory: Directory to write to; must be empty or not exist
+        database: Default database name of the generated import.sh
+    
+    Returns:
+        Dictionary with counts of fragments, nodes and relationships written
+    """
+    with BulkImportWriter(directory, database=database) as writer:
+        for fragment in fragments:
+            writer.write(fragment)
+    return writer.counts
@@ -0,0 +1,125 @@
+"""Limits that keep pathological files from stalling a repository analysis"""
+from pathlib import Path
+from typing import Optional
+
+
+class ParseBudgetExceeded(RuntimeError):
+    """Raised when parsing a file takes longer than its wall-clock budget"""
+
+
+# File names of minified bundles and of code generators' output; their
+# symbols are not worth indexing
+MINIFIED_SUFFIXES = (".min.js", ".min.mjs", ".bundle.js")
+GENERATED_SUFFIXES = (
+    "_pb2.py",
+    "_pb2_grpc.py",
+    ".pb.js",
+    ".pb.ts",
+    "_pb.js",
+    "_pb.d.ts",
+    ".generated.ts",
+    ".generated.js",
+)
+
+# Markers generators write into a file's header comment
+GENERATED_MARKERS = (
+    b"@generated",
+    b"do not edit",
+    b"code generated by",
+    b"auto-generated",
+    b"autogenerated",
+)
+
+# Only this many leading lines are searched for GENERATED_MARKERS, so source
+# that merely mentions a marker further down is still parsed
+GENERATED_HEADER_LINES = 5
+
+
+class ParseLimits:
+    """
+    Per-file thresholds checked before a file is parsed
+    
+    Files that break a threshold are not parsed: the analyzer records them as
+    a File node only and lists them, with the reason, in its summary. A
+    threshold of 0 disables that check. The wall-clock budget is enforced by
+    the parser itself (see BaseLanguageParser.parse_file) for files that pass
+    the checks but still take too long.
+    """
+    
+    def __init__(
+        self,
+        max_file_bytes: int = 2 * 1024 * 1024,
+        max_line_length: int = 10_000,
+        minified_line_length: int = 500,
+        skip_generated: bool = True,
+        time_budget: float = 10.0,
+    ):
+        """
+        Args:
+            max_file_bytes: Largest file that is parsed
+            max_line_length: Longest single line a parsed file may contain
+            minified_line_length: Files whose average line is longer than
+                this are treated as minified
+            skip_generated: Skip files named or marked as generated code
+            time_budget: Seconds a single file may spend in the parser
+        """
+        self.max_file_bytes = max_file_bytes
+        self.max_line_length = max_line_length
+        self.minified_line_length = minified_line_length
+        self.skip_generated = skip_generated
+        self.time_budget = time_budget
+    
+    @classmethod
+    def from_settings(cls, settings) -> "ParseLimits":
+        """
+        Build the limits configured by the PARSE_MAX_* / PARSE_* settings
+        
+        Args:
+            settings: Application settings
+        
+        Returns:
+            ParseLimits
+        """
+        return cls(
+            max_file_bytes=settings.PARSE_MAX_FILE_BYTES,
+            max_line_length=settings.PARSE_MAX_LINE_LENGTH,
+            minified_line_length=settings.PARSE_MINIFIED_LINE_LENGTH,
+            skip_generated=settings.PARSE_SKIP_GENERATED,
+            time_budget=settings.PARSE_TIME_BUDGET_SECONDS,
+        )
+    
+    def check(self, file_path: Path, content: bytes) -> Optional[str]:
+        """
+        Check a file against the limits
+        
+        Args:
+            file_path: Path of the file (relative paths are fine)
+            content: Raw content of the file
+        
+        Returns:
+            Why the file should not be parsed, or None if it may be parsed
+        """
+        size = len(content)
+        if self.max_file_bytes and size > self.max_file_bytes:
+            return f"file is {size} bytes (limit {self.max_file_bytes})"
+        
+        if self.skip_generated:
+            name = Path(file_path).name.lower()
+            if name.endswith(MINIFIED_SUFFIXES):
+                return "minified file name"
+            if name.endswith(GENERATED_SUFFIXES):
+                return "generated file name"
+            header = content.split(b"\n", GENERATED_HEADER_LINES)[:GENERATED_HEADER_LINES]
+            if any(marker in line.lower() for line in header for marker in GENERATED_MARKERS):
+                return "generated file marker"
+        
+        lines = content.count(b"\n") + 1
+        if self.minified_line_length and size > self.minified_line_length and size / lines > self.minified_line_length:
+            return f"looks minified (average line length {size // lines})"
+        
+        if self.max_line_length and size > self.max_line_length:
+            longest = max(map(len, content.split(b"\n")))
+            if longest > self.max_line_length:
+                return f"line of {longest} characters (limit {self.max_line_length})"
+        
+        return None
@@ -0,0 +1,219 @@
+"""
+Append-only on-disk export of parsed graphs
+
+An export file is a stream of msgpack objects: a header map followed by one
+map per GraphData fragment, in the order the fragments were produced:
+    
+    {"format": "secrin-graph", "version": 2}
+    {"nodes": [[label, properties], ...],
+     "relationships": [[source_id, target_id, source_label, target_label, type, properties], ...],
+     "invalidated_ids": [...], "degraded_files": {...}}   # only when set
+
+Fragments are written as they arrive, so a repository can be exported from
+RepositoryAnalyzer.iter_file_graphs without holding its whole graph, and
+several runs can be appended to one file. Reading streams the fragments
+back as GraphData, which can be loaded into Neo4j, replayed or compared
+without parsing the repository again. Datetimes (commit dates) are stored
+as an ISO 8601 string in msgpack extension type 1.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional
+
+from packages.parser.models import GraphData, Relationship, RelationshipType
+from packages.parser.models.records import RECORDS_BY_LABEL
+
+EXPORT_FORMAT = "secrin-graph"
+
+# Bump when the fragment layout changes; readers reject other versions
+EXPORT_FORMAT_VERSION = 2
+
+# msgpack extension type of datetime values
+DATETIME_EXT_TYPE = 1
+
+
+def _msgpack():
+    """Import msgpack, which is only needed for exports"""
+    try:
+        import msgpack  # type: ignore[import-untyped]
+    except ImportError:
+        raise ImportError(
+            "msgpack not installed. "
+            "Run: pip install msgpack"
+        )
+    return msgpack
+
+
+def _pack_default(value: Any):
+    """Pack values msgpack has no type for"""
+    if isinstance(value, datetime):
+        return _msgpack().ExtType(DATETIME_EXT_TYPE, value.isoformat().encode())
+    raise TypeError(f"Cannot export value of type {type(value).__name__}")
+
+
+def _unpack_ext(code: int, data: bytes):
+    """Unpack the extension types written by _pack_default"""
+    if code == DATETIME_EXT_TYPE:
+        return datetime.fromisoformat(data.decode())
+    return _msgpack().ExtType(code, data)
+
+
+def _unpacker(f: BinaryIO):
+    return _msgpack().Unpacker(f, raw=False, ext_hook=_unpack_ext)
+
+
+def _read_header(unpacker) -> Dict[str, Any]:
+    """Read and validate the header of an export stream"""
+    try:
+        header = next(unpacker)
+    except StopIteration:
+        raise ValueError("Graph export is empty")
+    if not isinstance(header, dict) or header.get("format") != EXPORT_FORMAT:
+        raise ValueError("Not a graph export file")
+    if header.get("version", 0) > EXPORT_FORMAT_VERSION:
+        raise ValueError(
+            f"Graph export version {header['version']} is newer than supported ({EXPORT_FORMAT_VERSION})"
+        )
+    if header.get("version", 0) < EXPORT_FORMAT_VERSION:
+        raise ValueError(
+            f"Graph export version {header.get('version')} predates relationship labels; export the repository again"
+        )
+    return header
+
+
+class GraphExportWriter:
+    """
+    Writes GraphData fragments to an export file
+    
+    Usable as a context manager. Opening an existing export appends to it,
+    after checking its header.
+    
+    Example:
+        with GraphExportWriter("repo.graph") as writer:
+            for fragment in analyzer.iter_file_graphs("/path/to/repo"):
+                writer.write(fragment)
+    """
+    
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: Export file to create or append to
+        """
+        self.path = Path(path)
+        self.counts = {"fragments": 0, "nodes": 0, "relationships": 0}
+        self._packer = _msgpack().Packer(default=_pack_default)
+        
+        append = self.path.exists() and self.path.stat().st_size > 0
+        if append:
+            with open(self.path, "rb") as f:
+                _read_header(_unpacker(f))
+        
+        self._file: Optional[BinaryIO] = open(self.path, "ab")
+        if not append:
+            self._file.write(self._packer.pack({"format": EXPORT_FORMAT, "version": EXPORT_FORMAT_VERSION}))
+    
+    def write(self, graph_data: GraphData):
+        """
+        Append one fragment
+        
+        Args:
+            graph_data: Fragment to write; its relationships may point to
+                nodes of this or an earlier fragment
+        """
+        if self._file is None:
+            raise ValueError("Graph export is closed")
+        
+        fragment: Dict[str, Any] = {
+            "nodes": [[node.label, node.to_dict()] for node in graph_data.nodes],
+            "relationships": [
+                [rel.source_id, rel.target_id, rel.source_label, rel.target_label, rel.type.value, rel.properties]
+                for rel in graph_data.relationships
+            ],
+        }
+        if graph_data.invalidated_ids:
+            fragment["invalidated_ids"] = sorted(graph_data.invalidated_ids)
+        if graph_data.degraded_files:
+            fragment["degraded_files"] = graph_data.degraded_files
+        
+        self._file.write(self._packer.pack(fragment))
+        self.counts["fragments"] += 1
+        self.counts["nodes"] += len(graph_data.nodes)
+        self.counts["relationships"] += len(graph_data.relationships)
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self) -> "GraphExportWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def export_graph_stream(fragments: Iterable[GraphData], path: str | Path) -> Dict[str, int]:
+    """
+    Write graph fragments to an export file as they are produced
+    
+    Args:
+        fragments: Iterable of GraphData fragments (e.g. from iter_file_graphs)
+        path: Export file to create or append to
+    
+    Returns:
+        Dictionary with counts of fragments, nodes and relationships written
+    """
+    with GraphExportWriter(path) as writer:
+        for fragment in fragments:
+            writer.write(fragment)
+    return writer.counts
+
+
+def read_graph_export(path: str | Path, batch_nodes: int = 0) -> Iterator[GraphData]:
+    """
+    Stream the fragments of an export file back as GraphData
+    
+    Args:
+        path: Export file to read
+        batch_nodes: If set, consecutive fragments are merged until a batch
+            holds at least this many nodes. Nodes repeated across fragments
+            (packages, commits) are then de-duplicated before they are written
+    
+    Yields:
+        GraphData fragments (or batches) in file order
+    
+    Raises:
+        ValueError: If the file is not a graph export or uses a newer version
+    """
+    with open(path, "rb") as f:
+        unpacker = _unpacker(f)
+        _read_header(unpacker)
+        
+        batch: Optional[GraphData] = None
+        for fragment in unpacker:
+            if batch is None:
+                batch = GraphData()
+            for label, properties in fragment["nodes"]:
+                batch.add_node(RECORDS_BY_LABEL[label](**properties))
+            for source_id, target_id, source_label, target_label, rel_type, properties in fragment["relationships"]:
+                batch.add_relationship(Relationship(
+                    source_id=source_id,
+                    target_id=target_id,
+                    source_label=source_label,
+                    target_label=target_label,
+                    type=RelationshipType(rel_type),
+                    properties=properties,
+                ))
+            batch.invalidated_ids.update(fragment.get("invalidated_ids", ()))
+            batch.degraded_files.update(fragment.get("degraded_files", {}))
+            
+            if len(batch.nodes) >= batch_nodes:
+                yield batch
+                batch = None
+        
+        if batch is not None:
+            yield batch
+        
+        # A writer that died mid-fragment leaves a partial object the unpacker skips
+        if unpacker.tell() < Path(path).stat().st_size:
+            print(f"Warning: Graph export {path} ends with an incomplete fragment, which was ignored")
@@ -1,31 +1,206 @@
 """Service for ingesting parsed data into Neo4j"""
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, Optional
 from datetime import datetime
+import queue
+import threading
 
+from packages.config.settings import Settings
 from packages.database.graph.graph import neo4j_client
+from packages.database.graph.migrations.schema import REPO_SCOPED_LABELS, REPO_STATS_COUNTERS, ensure_schema
 from packages.parser.models import (
     GraphData,
-    RepoNode,
-    FileNode,
-    ClassNode,
-    FunctionNode,
-    VariableNode,
-    DocNode,
-    PackageNode,
-    CommitNode,
-    ModuleNode,
-    TestNode,
-    IssueNode,
-    PullRequestNode,
-    Relationship,
+    NodeRecord,
+    RelationshipType,
 )
 
+settings = Settings()
+
+# Queue sentinel telling the pipeline writer thread that the producer is done
+_STREAM_END = object()
+
+# Labels of nodes whose ids are scoped to a single file ("<repo>:<path>:...")
+FILE_SCOPED_LABELS = ["File", "Class", "Function", "Variable", "Doc", "Test"]
+
+# Labels of nodes shared between repositories ("package:<name>", "person:<email>");
+# clearing a repository deletes them only once nothing references them
+SHARED_LABELS = ["Package", "Person"]
+
+# Relationships through which a repository's nodes reference shared nodes,
+# as (source label, relationship type, shared label)
+SHARED_REFERENCES = [
+    ("File", "IMPORTS", "Package"),
+    ("Commit", "AUTHORED_BY", "Person"),
+    ("PullRequest", "CREATED_BY", "Person"),
+]
+
+# Labels and relationship types are interpolated into the queries below (Cypher
+# cannot parameterize them); they come from NodeRecord.label and RelationshipType
+_NODE_QUERY = """
+UNWIND $rows AS row
+MERGE (n:{label} {{id: row.id}})
+ON CREATE SET n.created_at = $now
+SET n += row.props, n.updated_at = $now
+"""
+
+# _NODE_QUERY of the labels with a RepoStats counter: the nodes the MERGE
+# creates are added to their repository's counter in the same statement.
+# Only the MERGE that creates a node marks it, so concurrent writers of the
+# same node cannot both count it; the marker is removed before commit.
+_COUNTED_NODE_QUERY = """
+UNWIND $rows AS row
+MERGE (n:{label} {{id: row.id}})
+ON CREATE SET n.created_at = $now, n._new = true
+SET n += row.props, n.updated_at = $now
+WITH n, row.props.repo_name AS repo_name, n._new IS NOT NULL AS created
+REMOVE n._new
+WITH repo_name, sum(CASE WHEN created THEN 1 ELSE 0 END) AS created
+WHERE repo_name IS NOT NULL AND created > 0
+MERGE (s:RepoStats {{repo_name: repo_name}})
+SET s.{counter} = coalesce(s.{counter}, 0) + created
+"""
+
+_RELATIONSHIP_QUERY = """
+UNWIND $rows AS row
+MATCH (source:{source_label} {{id: row.source_id}})
+MATCH (target:{target_label} {{id: row.target_id}})
+MERGE (source)-[r:{type}]->(target)
+SET r += row.props
+"""
+
+# Deletes the nodes of one label under the id prefixes ("<repo>:<path>:") of
+# many files; STARTS WITH is answered from the label's id index
+_DELETE_FILES_QUERY = """
+UNWIND $prefixes AS prefix
+MATCH (n:{label})
+WHERE n.id STARTS WITH prefix
+WITH n, n.repo_name AS repo_name
+DETACH DELETE n
+WITH repo_name, count(*) AS deleted
+{uncount}RETURN sum(deleted) AS deleted
+"""
+
+# Deletes the nodes of one label that are no longer in their file
+_DELETE_STALE_QUERY = """
+UNWIND $files AS file
+MATCH (n:{label})
+WHERE n.id STARTS WITH file.prefix AND NOT n.id IN file.keep
+WITH n, n.repo_name AS repo_name
+DETACH DELETE n
+WITH repo_name, count(*) AS deleted
+{uncount}RETURN sum(deleted) AS deleted
+"""
+
+# Sets the distinct packages imported by the files of repositories
+_PACKAGE_COUNT_QUERY = """
+UNWIND $repo_names AS repo_name
+MERGE (s:RepoStats {repo_name: repo_name})
+WITH s, repo_name
+OPTIONAL MATCH (:File {repo_name: repo_name})-[:IMPORTS]->(p:Package)
+WITH s, count(DISTINCT p) AS packages
+SET s.packages = packages
+"""
+
+# Drops the imports files no longer have
+_DELETE_STALE_IMPORTS_QUERY = """
+UNWIND $files AS file
+MATCH (:File {id: file.file_id})-[r:IMPORTS]->(p:Package)
+WHERE NOT p.id IN file.packages
+DELETE r
+"""
+
+# Deletes one batch of the nodes of one label of a repository; the
+# condition is _clear_condition(label)
+_CLEAR_LABEL_QUERY = """
+MATCH (n:{label})
+WHERE {condition}
+WITH n LIMIT $batch_size
+DETACH DELETE n
+RETURN count(*) AS deleted
+"""
+
+# Ids of the shared nodes a repository's nodes of one label reference
+_SHARED_REFERENCES_QUERY = """
+MATCH (n:{source_label})-[:{type}]->(shared:{label})
+WHERE {condition}
+RETURN collect(DISTINCT shared.id) AS ids
+"""
+
+# Deletes the given shared nodes that nothing references any more
+_CLEAR_ORPHANS_QUERY = """
+UNWIND $ids AS id
+MATCH (n:{label} {{id: id}})
+WHERE NOT (n)--()
+DELETE n
+RETURN count(n) AS deleted
+"""
+
+
+# Statistics of get_repository_stats: the RepoStats counters and packages
+STATS_KEYS = [*REPO_STATS_COUNTERS.values(), "packages"]
+
+
+def _uncount_clause(label: str) -> str:
+    """Clause of the delete queries subtracting deleted nodes from their repository's counter"""
+    counter = REPO_STATS_COUNTERS.get(label)
+    if counter is None:
+        return ""
+    return (
+        "OPTIONAL MATCH (s:RepoStats {repo_name: repo_name})\n"
+        f"SET s.{counter} = s.{counter} - deleted\n"
+    )
+
+
+def _clear_condition(label: str) -> str:
+    """
+    Condition selecting the nodes of a repository in the clear queries
+    
+    Nodes written before repo_name was stamped are found by their id prefix
+    instead (Repo and Repository ids are "repo:<name>", so they are matched
+    by name).
+    """
+    if label in ("Repo", "Repository"):
+        return "n.repo_name = $repo_name OR n.name = $repo_name"
+    return "n.repo_name = $repo_name OR n.id STARTS WITH $prefix"
+
+
+def _file_repo_names(graph_data: GraphData) -> set[str]:
+    """Repositories of the files of a GraphData, whose package counters its imports change"""
+    return {node_repo_name(node) for node in graph_data.nodes if node.label == "File"}
+
+
+def node_repo_name(node: NodeRecord) -> Optional[str]:
+    """
+    Repository a parsed node belongs to, None for shared nodes
+    
+    Repository-scoped ids start with "<repo>:", except the Repo node's
+    ("repo:<name>").
+    """
+    if node.label in SHARED_LABELS:
+        return None
+    if node.label == "Repo":
+        return node.name
+    return node.id.split(":", 1)[0]
+
 
 class GraphIngestionService:
-    """Service to ingest parsed graph data into Neo4j"""
+    """
+    Service to ingest parsed graph data into Neo4j
     
-    def __init__(self):
+    Nodes are written grouped by label and relationships grouped by (source
+    label, type, target label), each group as parameterized `UNWIND $rows`
+    statements of at most batch_size rows. Statements are committed in
+    explicit write transactions of about batch_size rows, so a graph costs
+    a few round trips per thousand rows instead of one or three per row.
+    """
+    
+    def __init__(self, batch_size: Optional[int] = None):
+        """
+        Args:
+            batch_size: Rows per statement and per transaction
+                (default: NEO4J_WRITE_BATCH_SIZE)
+        """
         self.client = neo4j_client
+        self.batch_size = batch_size or settings.NEO4J_WRITE_BATCH_SIZE
     
     def ingest_graph_data(self, graph_data: GraphData):
         """
@@ -36,99 +211,244 @@ class GraphIngestionService:
         """
         print("Starting Neo4j ingestion...")
         
-        # Create constraints and indexes first (idempotent)
-        self._create_constraints()
+        # Create constraints and indexes first, unless the schema is current
+        ensure_schema()
         
-        # Ingest nodes
-        print(f"Ingesting {len(graph_data.nodes)} nodes...")
-        for node in graph_data.nodes:
-            self._ingest_node(node)
-        
-        # Ingest relationships
-        print(f"Ingesting {len(graph_data.relationships)} relationships...")
-        for rel in graph_data.relationships:
-            self._ingest_relationship(rel)
+        print(f"Ingesting {len(graph_data.nodes)} nodes and {len(graph_data.relationships)} relationships...")
+        self._write_graph(graph_data)
+        self.client.run_transaction([self._package_count_statement(_file_repo_names(graph_data))])
         
         print("Ingestion complete!")
     
-    def _create_constraints(self):
-        """Create unique constraints and indexes for node types"""
-        constraints = [
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (r:Repo) REQUIRE r.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (f:File) REQUIRE f.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (c:Class) REQUIRE c.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (fn:Function) REQUIRE fn.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (v:Variable) REQUIRE v.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (d:Doc) REQUIRE d.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (p:Package) REQUIRE p.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (cm:Commit) REQUIRE cm.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (m:Module) REQUIRE m.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (t:Test) REQUIRE t.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (i:Issue) REQUIRE i.id IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (pr:PullRequest) REQUIRE pr.id IS UNIQUE",
-        ]
-        
-        for constraint in constraints:
-            try:
-                self.client.run_query(constraint)
-            except Exception as e:
-                print(f"Warning: Could not create constraint: {e}")
-    
-    def _ingest_node(self, node: Any):
+    def ingest_graph_stream(self, fragments: Iterable[GraphData], max_pending: int = 64) -> Dict[str, int]:
         """
-        Ingest a single node into Neo4j
+        Ingest graph fragments while they are still being produced
+        
+        A writer thread drains a bounded queue of fragments into Neo4j while
+        the caller's thread keeps pulling from `fragments` (typically
+        RepositoryAnalyzer.iter_file_graphs), so parsing and database writes
+        overlap. The producer blocks once max_pending fragments are waiting,
+        which bounds memory regardless of repository size. Fragments are
+        written in the order they are produced.
         
         Args:
-            node: Node object (RepoNode, FileNode, etc.)
+            fragments: Iterable of GraphData fragments; nodes a fragment's
+                relationships point to must be in that or an earlier fragment
+            max_pending: Maximum number of fragments buffered between parser and writer
+        
+        Returns:
+            Dictionary with counts of fragments, nodes and relationships written
         """
-        # Determine node label
-        node_type = type(node).__name__.replace("Node", "")
+        print("Starting pipelined Neo4j ingestion...")
+        ensure_schema()
         
-        # Convert node to properties dict
-        props = self._node_to_properties(node)
+        pending: queue.Queue = queue.Queue(maxsize=max_pending)
+        counts = {"fragments": 0, "nodes": 0, "relationships": 0}
+        repo_names: set[str] = set()
+        errors: list[BaseException] = []
         
-        # Create MERGE query to avoid duplicates
-        query = f"""
-        MERGE (n:{node_type} {{id: $id}})
-        SET n += $props
-        RETURN n
-        """
+        def writer():
+            while True:
+                fragment = pending.get()
+                if fragment is _STREAM_END:
+                    return
+                if errors:
+                    # Keep draining so the producer never blocks on a dead writer
+                    continue
+                try:
+                    self._write_graph(fragment)
+                    counts["fragments"] += 1
+                    counts["nodes"] += len(fragment.nodes)
+                    counts["relationships"] += len(fragment.relationships)
+                    repo_names.update(_file_repo_names(fragment))
+                except BaseException as e:
+                    errors.append(e)
+        
+        writer_thread = threading.Thread(target=writer, name="graph-ingest-writer", daemon=True)
+        writer_thread.start()
         
         try:
-            self.client.run_query(query, {"id": node.id, "props": props})
-        except Exception as e:
-            print(f"Error ingesting node {node.id}: {e}")
+            for fragment in fragments:
+                if errors:
+                    break
+                pending.put(fragment)
+        finally:
+            pending.put(_STREAM_END)
+            writer_thread.join()
+        
+        if errors:
+            raise errors[0]
+        
+        self.client.run_transaction([self._package_count_statement(repo_names)])
+        print(
+            f"Ingestion complete! {counts['fragments']} fragments, "
+            f"{counts['nodes']} nodes, {counts['relationships']} relationships"
+        )
+        return counts
     
-    def _ingest_relationship(self, rel: Relationship):
+    def ingest_file_updates(self, repo_name: str, file_paths: Iterable[str], graph_data: GraphData) -> Dict[str, int]:
         """
-        Ingest a relationship into Neo4j
+        Apply reparsed files to the graph in place
+        
+        Unlike deleting and re-creating the files, this keeps the embeddings
+        of symbols that were not edited. All nodes of graph_data are upserted
+        (moved symbols get their new lines), embeddings of the nodes listed
+        in graph_data.invalidated_ids are removed so the embedding pass
+        recomputes only those, and symbols of file_paths that no longer exist
+        (including all symbols of deleted files) are deleted. Everything is
+        written in one retried transaction of a few UNWIND statements,
+        however many files changed.
         
         Args:
-            rel: Relationship object
+            repo_name: Name of the repository
+            file_paths: Relative paths of all changed files, including deleted ones
+            graph_data: Result of RepositoryAnalyzer.analyze_changed_files
+        
+        Returns:
+            Dictionary with counts of upserted, invalidated and deleted nodes
+        """
+        ensure_schema()
+        
+        invalidated_by_label: Dict[str, list[str]] = {}
+        for node_id in graph_data.invalidated_ids:
+            node = graph_data.get_node(node_id)
+            if node is not None:
+                label = node.label
+                invalidated_by_label.setdefault(label, []).append(node_id)
+        
+        files = []
+        for file_path in file_paths:
+            prefix = f"{repo_name}:{file_path}:"
+            files.append({
+                "prefix": prefix,
+                "file_id": f"{prefix}file",
+                "keep": [node.id for node in graph_data.nodes if node.id.startswith(prefix)],
+                "packages": [
+                    rel.target_id for rel in graph_data.relationships
+                    if rel.type == RelationshipType.IMPORTS and rel.source_id == f"{prefix}file"
+                ],
+            })
+        
+        # Upserts, invalidation and deletions of all files commit together,
+        # so readers never see a half-updated file
+        now = datetime.utcnow().isoformat()
+        transaction = [
+            (query, {"rows": rows, "now": now})
+            for query, rows in self._write_statements(graph_data)
+        ]
+        
+        # Drop embeddings of edited symbols
+        transaction += [
+            (f"MATCH (n:{label}) WHERE n.id IN $ids REMOVE n.embedding", {"ids": ids})
+            for label, ids in invalidated_by_label.items()
+        ]
+        
+        # Delete symbols that disappeared from the changed files; the stale
+        # deletes return their counts, the import delete returns no record
+        deletes: list[tuple[str, dict]] = []
+        if files:
+            deletes = [
+                (_DELETE_STALE_QUERY.format(label=label, uncount=_uncount_clause(label)), {"files": files})
+                for label in FILE_SCOPED_LABELS
+            ]
+            deletes.append((_DELETE_STALE_IMPORTS_QUERY, {"files": files}))
+        first_delete = len(transaction)
+        transaction += deletes
+        
+        transaction.append(self._package_count_statement([repo_name]))
+        results = self.client.run_transaction(transaction)
+        deleted = sum(
+            records[0]["deleted"]
+            for records in results[first_delete:first_delete + len(deletes)]
+            if records
+        )
+        
+        return {
+            "upserted": len(graph_data.nodes),
+            "invalidated": sum(len(ids) for ids in invalidated_by_label.values()),
+            "deleted": deleted,
+        }
+    
+    def _delete_files_statements(self, repo_name: str, file_paths: list[str]) -> list[tuple[str, dict]]:
+        """Statements deleting every file-scoped node of file_paths, one per label"""
+        if not file_paths:
+            return []
+        prefixes = [f"{repo_name}:{file_path}:" for file_path in file_paths]
+        return [
+            (_DELETE_FILES_QUERY.format(label=label, uncount=_uncount_clause(label)), {"prefixes": prefixes})
+            for label in FILE_SCOPED_LABELS
+        ]
+    
+    def _package_count_statement(self, repo_names: Iterable[str]) -> tuple[str, dict]:
+        """Statement updating the package counters of repositories whose imports changed"""
+        return _PACKAGE_COUNT_QUERY, {"repo_names": sorted(repo_names)}
+    
+    def _write_graph(self, graph_data: GraphData):
         """
-        # Determine node labels from IDs (simple heuristic)
-        source_label = self._infer_label_from_id(rel.source_id)
-        target_label = self._infer_label_from_id(rel.target_id)
-        
-        # Convert relationship properties for Neo4j compatibility
-        props = self._sanitize_properties(rel.properties)
-        
-        query = f"""
-        MATCH (source:{source_label} {{id: $source_id}})
-        MATCH (target:{target_label} {{id: $target_id}})
-        MERGE (source)-[r:{rel.type.value}]->(target)
-        SET r += $props
-        RETURN r
+        Write the nodes and then the relationships of a GraphData
+        
+        Statements are packed into transactions of about batch_size rows in
+        order, so the nodes a relationship needs are always committed in an
+        earlier transaction or written earlier in the same one.
+        
+        Raises:
+            neo4j.exceptions.Neo4jError: If a transaction fails; it is rolled
+                back, earlier transactions stay committed
         """
+        now = datetime.utcnow().isoformat()
+        transaction: list[tuple[str, dict]] = []
+        rows_in_transaction = 0
         
-        try:
-            self.client.run_query(query, {
+        for query, rows in self._write_statements(graph_data):
+            transaction.append((query, {"rows": rows, "now": now}))
+            rows_in_transaction += len(rows)
+            if rows_in_transaction >= self.batch_size:
+                self.client.run_transaction(transaction)
+                transaction, rows_in_transaction = [], 0
+        
+        if transaction:
+            self.client.run_transaction(transaction)
+    
+    def _write_statements(self, graph_data: GraphData) -> Iterator[tuple[str, list[dict]]]:
+        """
+        Group a GraphData into UNWIND statements
+        
+        Yields:
+            (query, rows) pairs of at most batch_size rows, all node
+            statements before any relationship statement
+        """
+        nodes_by_label: Dict[str, list[dict]] = {}
+        for node in graph_data.nodes:
+            nodes_by_label.setdefault(node.label, []).append(
+                {"id": node.id, "props": self._node_to_properties(node)}
+            )
+        
+        for label, rows in nodes_by_label.items():
+            counter = REPO_STATS_COUNTERS.get(label)
+            if counter is not None:
+                query = _COUNTED_NODE_QUERY.format(label=label, counter=counter)
+            else:
+                query = _NODE_QUERY.format(label=label)
+            for chunk in self._chunks(rows):
+                yield query, chunk
+        
+        relationships_by_key: Dict[tuple[str, str, str], list[dict]] = {}
+        for rel in graph_data.relationships:
+            key = (rel.source_label, rel.type.value, rel.target_label)
+            relationships_by_key.setdefault(key, []).append({
                 "source_id": rel.source_id,
                 "target_id": rel.target_id,
-                "props": props
+                "props": self._sanitize_properties(rel.properties),
             })
-        except Exception as e:
-            print(f"Error ingesting relationship {rel.source_id} -> {rel.target_id}: {e}")
+        
+        for (source_label, rel_type, target_label), rows in relationships_by_key.items():
+            query = _RELATIONSHIP_QUERY.format(source_label=source_label, type=rel_type, target_label=target_label)
+            for chunk in self._chunks(rows):
+                yield query, chunk
+    
+    def _chunks(self, rows: list[dict]) -> Iterator[list[dict]]:
+        for start in range(0, len(rows), self.batch_size):
+            yield rows[start:start + self.batch_size]
     
     def _sanitize_properties(self, properties: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -164,152 +484,139 @@ class GraphIngestionService:
         
         return sanitized
     
-    def _node_to_properties(self, node: Any) -> Dict[str, Any]:
+    def _node_to_properties(self, node: NodeRecord) -> Dict[str, Any]:
         """
-        Convert a node object to a properties dictionary for Neo4j
+        Convert a node record to a properties dictionary for Neo4j
+        
+        created_at/updated_at are not included; the write query sets them.
+        repo_name is added to the nodes of a single repository.
         
         Args:
-            node: Node object
+            node: Node record
         
         Returns:
             Dictionary of properties
         """
-        props = node.model_dump()
-        return self._sanitize_properties(props)
+        properties = self._sanitize_properties(node.to_dict())
+        repo_name = node_repo_name(node)
+        if repo_name is not None:
+            properties["repo_name"] = repo_name
+        return properties
     
-    def _infer_label_from_id(self, node_id: str) -> str:
+    def clear_repository_data(self, repo_name: str) -> Dict[str, int]:
         """
-        Infer node label from ID structure
+        Clear all data for a specific repository
+        
+        Nodes are selected by their indexed repo_name, label by label, and
+        deleted in batches of batch_size nodes, each committed in its own
+        retried transaction, so large repositories neither time out nor
+        exhaust transaction memory. The running total of each label is
+        printed after every batch. The Package and Person nodes the
+        repository referenced are deleted once nothing else references them.
         
         Args:
-            node_id: Node ID string
+            repo_name: Name of the repository to clear
         
         Returns:
-            Inferred node label
+            Dictionary with the number of deleted nodes per label
         """
-        # IDs are structured like: repo:name:type:...
-        # or package:name
-        if node_id.startswith("repo:"):
-            return "Repo"
-        elif node_id.startswith("package:"):
-            return "Package"
-        elif ":file:" in node_id or node_id.endswith(":file"):
-            return "File"
-        elif ":class:" in node_id:
-            return "Class"
-        elif ":function:" in node_id or ":method:" in node_id:
-            return "Function"
-        elif ":variable:" in node_id:
-            return "Variable"
-        elif ":doc:" in node_id:
-            return "Doc"
-        elif ":commit:" in node_id:
-            return "Commit"
-        elif ":module:" in node_id:
-            return "Module"
-        elif ":test:" in node_id:
-            return "Test"
-        elif ":issue:" in node_id:
-            return "Issue"
-        elif ":pr:" in node_id:
-            return "PullRequest"
-        else:
-            # Default fallback
-            return "Node"
-    
-    def clear_repository_data(self, repo_name: str):
-        """
-        Clear all data for a specific repository
+        counts: Dict[str, int] = {}
+        params = {"repo_name": repo_name, "prefix": f"{repo_name}:", "batch_size": int(self.batch_size)}
         
-        Args:
-            repo_name: Name of the repository to clear
-        """
-        query = """
-        MATCH (r:Repo {name: $repo_name})
-        OPTIONAL MATCH (r)-[*]-(n)
-        DETACH DELETE r, n
-        """
+        # Shared nodes are found through the repository's nodes, so collect them first
+        shared_ids: Dict[str, set[str]] = {label: set() for label in SHARED_LABELS}
+        for source_label, rel_type, label in SHARED_REFERENCES:
+            query = _SHARED_REFERENCES_QUERY.format(
+                source_label=source_label, type=rel_type, label=label, condition=_clear_condition(source_label)
+            )
+            result = self.client.execute_read(query, params)
+            shared_ids[label].update(result[0]["ids"] if result else [])
+        
+        for label in REPO_SCOPED_LABELS:
+            query = _CLEAR_LABEL_QUERY.format(label=label, condition=_clear_condition(label))
+            counts[label] = 0
+            while True:
+                result = self.client.execute_write(query, params)
+                deleted = result[0]["deleted"] if result else 0
+                counts[label] += deleted
+                if deleted:
+                    print(f"  Deleted {counts[label]} {label} nodes")
+                if deleted < self.batch_size:
+                    break
         
-        self.client.run_query(query, {"repo_name": repo_name})
+        for label, ids in shared_ids.items():
+            counts[label] = 0
+            for chunk in self._chunks(sorted(ids)):
+                result = self.client.execute_write(_CLEAR_ORPHANS_QUERY.format(label=label), {"ids": chunk})
+                counts[label] += result[0]["deleted"] if result else 0
+            if counts[label]:
+                print(f"  Deleted {counts[label]} unreferenced {label} nodes")
+        
+        self.client.execute_write("MATCH (s:RepoStats {repo_name: $repo_name}) DELETE s", {"repo_name": repo_name})
+        return counts
     
     def delete_file_data(self, repo_name: str, file_path: str):
         """
-        Delete all data associated with a specific file
+        Delete a file with every node defined in it
         
         Args:
             repo_name: Name of the repository
             file_path: Relative path of the file
         """
-        query = """
-        MATCH (f:File {repo_name: $repo_name, path: $file_path})
-        OPTIONAL MATCH (f)-[:CONTAINS_CLASS]->(c:Class)
-        OPTIONAL MATCH (f)-[:CONTAINS_FUNCTION]->(fn:Function)
-        OPTIONAL MATCH (f)-[:HAS_TEST]->(t:Test)
-        OPTIONAL MATCH (f)-[:HAS_DOC]->(d:Doc)
-        DETACH DELETE f, c, fn, t, d
-        """
-        
-        self.client.run_query(query, {
-            "repo_name": repo_name,
-            "file_path": file_path
-        })
-
+        self.client.run_transaction([
+            *self._delete_files_statements(repo_name, [file_path]),
+            self._package_count_statement([repo_name]),
+        ])
+    
     def get_repository_stats(self, repo_name: str) -> Dict[str, int]:
         """
         Get comprehensive statistics for a repository in the graph
         
+        Reads the counters ingestion maintains on the repository's RepoStats
+        node, a single indexed lookup however large the repository is.
+        
         Args:
             repo_name: Name of the repository
         
         Returns:
             Dictionary with counts of different node types
         """
-        query = """
-        MATCH (r:Repo {name: $repo_name})
-        OPTIONAL MATCH (r)-[:HAS_FILE]->(f:File)
-        OPTIONAL MATCH (f)-[:CONTAINS_CLASS]->(c:Class)
-        OPTIONAL MATCH (f)-[:CONTAINS_FUNCTION]->(fn:Function)
-        OPTIONAL MATCH (f)-[:HAS_TEST]->(t:Test)
-        OPTIONAL MATCH (f)-[:HAS_DOC]->(d:Doc)
-        OPTIONAL MATCH (commit:Commit)-[:TOUCHED]->(f)
-        OPTIONAL MATCH (f)-[:IMPORTS]->(p:Package)
-        OPTIONAL MATCH (pr:PullRequest)-[:BELONGS_TO]->(r)
-        RETURN 
-            count(DISTINCT f) as files,
-            count(DISTINCT c) as classes,
-            count(DISTINCT fn) as functions,
-            count(DISTINCT t) as tests,
-            count(DISTINCT d) as docs,
-            count(DISTINCT commit) as commits,
-            count(DISTINCT p) as packages,
-            count(DISTINCT pr) as pull_requests
+        result = self.client.execute_read(
+            "MATCH (s:RepoStats {repo_name: $repo_name}) RETURN s",
+            {"repo_name": repo_name}
+        )
+        stats = dict(result[0]["s"]) if result else {}
+        return {key: stats.get(key) or 0 for key in STATS_KEYS}
+    
+    def recompute_repository_stats(self, repo_name: str) -> Dict[str, int]:
         """
+        Rebuild the statistics counters of a repository from the graph
         
-        result = self.client.run_query(query, {"repo_name": repo_name})
-        
-        if result:
-            record = result[0]
-            return {
-                "files": record["files"],
-                "classes": record["classes"],
-                "functions": record["functions"],
-                "tests": record["tests"],
-                "docs": record["docs"],
-                "commits": record["commits"],
-                "packages": record["packages"],
-                "pull_requests": record["pull_requests"],
-            }
+        Each counter is one count over the label's repo_name index, so this
+        stays cheap on large repositories. Use it for graphs ingested before
+        the counters existed or changed outside the ingestion service.
         
-        return {
-            "files": 0,
-            "classes": 0,
-            "functions": 0,
-            "tests": 0,
-            "docs": 0,
-            "commits": 0,
-            "packages": 0,
-            "pull_requests": 0,
-        }
+        Args:
+            repo_name: Name of the repository
+        
+        Returns:
+            Dictionary with counts of different node types
+        """
+        stats: Dict[str, int] = {}
+        for label, counter in REPO_STATS_COUNTERS.items():
+            result = self.client.execute_read(
+                f"MATCH (n:{label} {{repo_name: $repo_name}}) RETURN count(n) AS count",
+                {"repo_name": repo_name}
+            )
+            stats[counter] = result[0]["count"] if result else 0
+        
+        query, params = self._package_count_statement([repo_name])
+        self.client.execute_write(query, params)
+        self.client.execute_write(
+            "MERGE (s:RepoStats {repo_name: $repo_name}) SET s += $stats",
+            {"repo_name": repo_name, "stats": stats}
+        )
+        return self.get_repository_stats(repo_name)
 
 
 # Singleton instance
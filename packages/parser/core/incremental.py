@@ -0,0 +1,154 @@
+"""Helpers for incremental reparsing of changed files"""
+from bisect import bisect_right
+from typing import Iterable, Optional
+
+from packages.parser.models import (
+    GraphData,
+    FileRecord,
+    ClassRecord,
+    FunctionRecord,
+    VariableRecord,
+    DocRecord,
+    TestRecord,
+)
+from packages.parser.utils.git_commit_utils import DiffHunk
+
+
+def _line_starts(source: bytes) -> list[int]:
+    """Byte offset of the start of every line"""
+    starts = [0]
+    index = source.find(b"\n")
+    while index != -1:
+        starts.append(index + 1)
+        index = source.find(b"\n", index + 1)
+    return starts
+
+
+def _line_offset(source: bytes, starts: list[int], row: int) -> int:
+    """Byte offset of a 0-indexed line, clamped to the end of the source"""
+    return starts[row] if row < len(starts) else len(source)
+
+
+def _point(starts: list[int], offset: int) -> tuple[int, int]:
+    """(row, column) of a byte offset"""
+    row = bisect_right(starts, offset) - 1
+    return row, offset - starts[row]
+
+
+def compute_tree_edits(old_source: bytes, new_source: bytes, hunks: Iterable[DiffHunk]) -> Optional[list[dict]]:
+    """
+    Translate zero-context diff hunks into tree-sitter Tree.edit arguments
+    
+    The edits are returned bottom-up, so each one is expressed in the
+    coordinates of the document as left by the previous edits and can be
+    applied to the old tree as is. The unchanged text between hunks is
+    compared byte for byte; if the hunks do not describe old -> new exactly
+    (e.g. the file was re-encoded) None is returned and the caller must
+    parse from scratch, since wrong edits would corrupt the reused tree.
+    
+    Args:
+        old_source: Content the old tree was parsed from
+        new_source: New content
+        hunks: Hunks of `git diff -U0` between the two, in file order
+    
+    Returns:
+        List of keyword dicts for Tree.edit, or None if the hunks do not match
+    """
+    old_starts = _line_starts(old_source)
+    new_starts = _line_starts(new_source)
+    
+    spans = []
+    old_pos = new_pos = 0
+    for hunk in hunks:
+        # A zero count means the change sits after line `start`
+        old_row = hunk.old_start if hunk.old_count == 0 else hunk.old_start - 1
+        new_row = hunk.new_start if hunk.new_count == 0 else hunk.new_start - 1
+        old_start = _line_offset(old_source, old_starts, old_row)
+        old_end = _line_offset(old_source, old_starts, old_row + hunk.old_count)
+        new_start = _line_offset(new_source, new_starts, new_row)
+        new_end = _line_offset(new_source, new_starts, new_row + hunk.new_count)
+        
+        if old_start < old_pos or old_source[old_pos:old_start] != new_source[new_pos:new_start]:
+            return None
+        
+        spans.append((old_start, old_end, new_start, new_end))
+        old_pos, new_pos = old_end, new_end
+    
+    if old_source[old_pos:] != new_source[new_pos:]:
+        return None
+    
+    edits = []
+    for old_start, old_end, new_start, new_end in reversed(spans):
+        start_point = _point(old_starts, old_start)
+        inserted = new_source[new_start:new_end]
+        newlines = inserted.count(b"\n")
+        if newlines:
+            new_end_point = (start_point[0] + newlines, len(inserted) - inserted.rfind(b"\n") - 1)
+        else:
+            new_end_point = (start_point[0], start_point[1] + len(inserted))
+        
+        edits.append({
+            "start_byte": old_start,
+            "old_end_byte": old_end,
+            "new_end_byte": old_start + len(inserted),
+            "start_point": start_point,
+            "old_end_point": _point(old_starts, old_end),
+            "new_end_point": new_end_point,
+        })
+    
+    return edits
+
+
+def _line_span(node) -> Optional[tuple[int, int]]:
+    """Lines (1-indexed, inclusive) a symbol occupies, or None if unknown"""
+    if isinstance(node, (ClassRecord, FunctionRecord)):
+        return node.start_line, node.end_line
+    if isinstance(node, VariableRecord):
+        return node.start_line, node.start_line
+    if isinstance(node, DocRecord) and node.start_line is not None:
+        return node.start_line, node.start_line + node.text.count("\n")
+    return None
+
+
+def find_invalidated_ids(graph_data: GraphData, file_node: FileRecord, hunks: Iterable[DiffHunk]) -> set[str]:
+    """
+    Select the symbols of a reparsed file whose source lines were edited
+    
+    Symbols outside every hunk only moved (or not even that): their text and
+    therefore their embedding are unchanged. The File node and symbols
+    without line information (tests) are always treated as edited.
+    
+    Args:
+        graph_data: GraphData of the reparsed file
+        file_node: The file's File node record
+        hunks: Hunks of the change, with line numbers of the new content
+    
+    Returns:
+        Ids of the file's symbols that intersect an edit
+    """
+    prefix = file_node.id[:-len("file")]
+    hunks = list(hunks)
+    invalidated = {file_node.id}
+    
+    for node in graph_data.nodes:
+        if not node.id.startswith(prefix) or node.id in invalidated:
+            continue
+        
+        span = _line_span(node)
+        if span is None:
+            if isinstance(node, TestRecord):
+                invalidated.add(node.id)
+            continue
+        
+        start, end = span
+        for hunk in hunks:
+            if hunk.new_count:
+                touched = start <= hunk.new_start + hunk.new_count - 1 and hunk.new_start <= end
+            else:
+                # Pure deletion between new lines new_start and new_start + 1
+                touched = start <= hunk.new_start < end
+            if touched:
+                invalidated.add(node.id)
+                break
+    
+    return invalidated
@@ -0,0 +1,228 @@
+"""Persistent, content-addressed cache of per-file parse results"""
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+import hashlib
+import json
+import os
+import tempfile
+
+from packages.parser.models import GraphData, Relationship, RelationshipType
+from packages.parser.models.records import RECORDS_BY_LABEL
+from packages.parser.utils.file_utils import is_test_file
+
+if TYPE_CHECKING:
+    from packages.parser.core.base_parser import BaseLanguageParser
+    from packages.parser.core.source_buffer import SourceBuffer
+
+
+# Bump when the on-disk entry layout changes
+CACHE_FORMAT_VERSION = 3
+
+
+class ParseCache:
+    """
+    On-disk cache of the symbols a parser extracts from a file
+    
+    Entries are keyed by (parser version, language, content SHA-256), so an
+    identical file is parsed once no matter which repository, branch or path
+    it shows up under. An entry stores the file's GraphData as produced for
+    its original repository and path; on a hit the repo-specific ids and
+    provenance fields are rewritten for the requesting file and tree-sitter
+    is skipped entirely. Commit information is per-repository history, not
+    file content, so it is never cached.
+    
+    Entries are one JSON file each, written atomically, so several worker
+    processes can share a cache directory. Reads refresh an entry's mtime and
+    prune() evicts the least recently used entries once the directory grows
+    beyond max_bytes.
+    """
+    
+    def __init__(self, cache_dir: str | Path, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @classmethod
+    def from_settings(cls, settings, cache_dir: Optional[str] = None) -> Optional["ParseCache"]:
+        """
+        Build the cache configured by PARSE_CACHE_DIR / PARSE_CACHE_MAX_BYTES
+        
+        Args:
+            settings: Application settings
+            cache_dir: Optional override of PARSE_CACHE_DIR
+        
+        Returns:
+            ParseCache, or None if caching is disabled or the directory is unusable
+        """
+        cache_dir = cache_dir if cache_dir is not None else settings.PARSE_CACHE_DIR
+        if not cache_dir:
+            return None
+        try:
+            return cls(cache_dir, settings.PARSE_CACHE_MAX_BYTES)
+        except OSError as e:
+            print(f"Warning: Parse cache disabled, cannot use {cache_dir}: {e}")
+            return None
+    
+    def key(self, parser: "BaseLanguageParser", file_path: Path, source: "SourceBuffer", repo_context: dict) -> str:
+        """
+        Compute the cache key of a file
+        
+        The parser's query source is folded into its version so edits to the
+        extraction query invalidate old entries without a manual bump. Test
+        detection depends on the path and provenance fields on whether the
+        repository has git metadata, so both are part of the key as well.
+        """
+        digest = hashlib.sha256()
+        for part in (
+            str(CACHE_FORMAT_VERSION),
+            parser.language_name,
+            str(parser.parser_version),
+            parser.query_source,
+            "test" if is_test_file(Path(file_path)) else "src",
+            "git" if repo_context.get("sha") else "nogit",
+            source.sha256(),
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def get(self, key: str, file_path: Path, repo_context: dict) -> Optional[GraphData]:
+        """
+        Load a cached entry relocated to file_path in the given repository
+        
+        Args:
+            key: Cache key from key()
+            file_path: Path of the requesting file, relative to its repository
+            repo_context: Repository metadata of the requesting file
+        
+        Returns:
+            GraphData for the file, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return self._relocate(entry, str(file_path), repo_context)
+    
+    def put(self, key: str, file_path: Path, repo_context: dict, graph_data: GraphData):
+        """
+        Store the symbols of a freshly parsed file
+        
+        Args:
+            key: Cache key from key()
+            file_path: Path of the parsed file, relative to its repository
+            repo_context: Repository metadata the file was parsed with
+            graph_data: The file's GraphData, without commit information
+        """
+        entry = {
+            "repo": repo_context["name"],
+            "path": str(file_path),
+            "sha": repo_context.get("sha"),
+            "commit_hash": repo_context.get("commit_hash"),
+            "nodes": [
+                [node.label, node.to_dict()]
+                for node in graph_data.nodes
+            ],
+            "relationships": [
+                [rel.source_id, rel.target_id, rel.source_label, rel.target_label, rel.type.value, rel.properties]
+                for rel in graph_data.relationships
+            ],
+        }
+        
+        entry_path = self._entry_path(key)
+        try:
+            entry_path.parent.mkdir(exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"Warning: Could not write parse cache entry for {file_path}: {e}")
+    
+    def prune(self) -> int:
+        """
+        Evict least recently used entries until the cache fits in max_bytes
+        
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        total = 0
+        for entry_path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total += stat.st_size
+        
+        removed = 0
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry_path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        
+        return removed
+    
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters of this cache instance"""
+        return {"hits": self.hits, "misses": self.misses}
+    
+    def record(self, stats: dict[str, int]):
+        """Add counters reported by another cache instance (e.g. a pool worker)"""
+        self.hits += stats.get("hits", 0)
+        self.misses += stats.get("misses", 0)
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+    
+    def _relocate(self, entry: dict, path: str, repo_context: dict) -> GraphData:
+        """Rebuild a cached entry with ids and provenance of the requesting file"""
+        old_prefix = f"{entry['repo']}:{entry['path']}:"
+        new_prefix = f"{repo_context['name']}:{path}:"
+        old_path = entry["path"]
+        
+        def relocate_id(node_id: str) -> str:
+            if node_id.startswith(old_prefix):
+                return new_prefix + node_id[len(old_prefix):]
+            return node_id
+        
+        graph_data = GraphData()
+        
+        for label, data in entry["nodes"]:
+            data["id"] = relocate_id(data["id"])
+            if data.get("source_path") == old_path:
+                data["source_path"] = path
+            if label == "File":
+                data["path"] = path
+            if entry["sha"] and data.get("repo_sha") == entry["sha"]:
+                data["repo_sha"] = repo_context.get("sha")
+            if entry["commit_hash"] and data.get("commit_hash") == entry["commit_hash"]:
+                data["commit_hash"] = repo_context.get("commit_hash")
+            graph_data.add_node(RECORDS_BY_LABEL[label](**data))
+        
+        for source_id, target_id, source_label, target_label, rel_type, properties in entry["relationships"]:
+            graph_data.add_relationship(Relationship(
+                source_id=relocate_id(source_id),
+                target_id=relocate_id(target_id),
+                source_label=source_label,
+                target_label=target_label,
+                type=RelationshipType(rel_type),
+                properties=properties,
+            ))
+        
+        return graph_data
@@ -1,16 +1,29 @@
 """Main repository analyzer that orchestrates the parsing process"""
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Iterable, Iterator, Optional, Dict
+import hashlib
 import subprocess
 
-from packages.parser.models import GraphData, RepoNode
+from tree_sitter import Tree
+
+from packages.parser.models import GraphData, RepoRecord, FileRecord, Relationship, RelationshipType
 from packages.parser.core import BaseLanguageParser
-from packages.parser.languages import PythonParser, JavaScriptParser, TypeScriptParser
+from packages.parser.core.parse_cache import ParseCache
+from packages.parser.core.file_guard import ParseBudgetExceeded, ParseLimits
+from packages.parser.core.incremental import find_invalidated_ids
+from packages.parser.utils.git_commit_utils import (
+    DiffHunk,
+    get_last_commits,
+    get_diff_hunks,
+    get_file_at_revision,
+)
 from packages.parser.utils import (
     detect_language,
-    is_code_file,
-    should_ignore_path,
     get_relative_path,
+    walk_repository_files,
+    list_git_files,
     language_registry,
     is_git_url,
     clone_repository,
@@ -19,6 +32,35 @@ from packages.parser.utils import (
     is_git_installed,
 )
 
+# Per-process state for pool workers, set up once by _init_worker so every
+# worker owns a single analyzer (and therefore one tree-sitter Parser per language)
+_worker_analyzer: Optional["RepositoryAnalyzer"] = None
+_worker_repo_context: dict = {}
+
+
+def _init_worker(
+    repo_context: dict,
+    parse_cache: Optional[ParseCache] = None,
+    limits: Optional[ParseLimits] = None,
+):
+    """Process pool initializer: build the worker's analyzer and keep the repo context"""
+    global _worker_analyzer, _worker_repo_context
+    if parse_cache is not None:
+        # Each worker counts from zero and reports per-file deltas to the parent
+        parse_cache = ParseCache(parse_cache.cache_dir, parse_cache.max_bytes)
+    _worker_analyzer = RepositoryAnalyzer(parse_cache=parse_cache, limits=limits)
+    _worker_repo_context = repo_context
+
+
+def _parse_in_worker(repo_path: str, rel_path: str) -> tuple[Optional[GraphData], dict]:
+    """Process pool task: parse a single file, returning its graph and the cache counters it moved"""
+    assert _worker_analyzer is not None, "worker not initialized"
+    cache = _worker_analyzer.parse_cache
+    before = cache.stats() if cache is not None else {}
+    graph_data = _worker_analyzer._parse_file(Path(repo_path), Path(rel_path), _worker_repo_context)
+    after = cache.stats() if cache is not None else {}
+    return graph_data, {name: after[name] - before[name] for name in after}
+
 
 class RepositoryAnalyzer:
     """
@@ -26,31 +68,55 @@ class RepositoryAnalyzer:
     Scans a repository, detects file languages, and routes to appropriate parsers
     """
     
-    def __init__(self):
-        self.parsers: Dict[str, BaseLanguageParser] = {}
-        self._initialize_parsers()
+    # Number of in-flight files per worker process in parallel mode; bounds
+    # how many parsed-but-unmerged results the parent holds at once
+    PENDING_PER_WORKER = 8
     
-    def _initialize_parsers(self):
-        """Initialize all available language parsers"""
-        # Python
-        python_lang = language_registry.get_language("python")
-        if python_lang:
-            self.parsers["python"] = PythonParser(python_lang)
-        
-        # JavaScript
-        js_lang = language_registry.get_language("javascript")
-        if js_lang:
-            self.parsers["javascript"] = JavaScriptParser(js_lang)
-        
-        # TypeScript
-        ts_lang = language_registry.get_language("typescript")
-        if ts_lang:
-            self.parsers["typescript"] = TypeScriptParser(ts_lang)
-        
-        # Add more parsers as they become available
-        # Java, Go, etc.
+    # Number of syntax trees kept by analyze_changed_files for the next push
+    RETAINED_TREES = 256
     
-    def analyze_files(self, repo_path: Path, file_paths: list[str], repo_context: Optional[dict] = None) -> GraphData:
+    def __init__(self, parse_cache: Optional[ParseCache] = None, limits: Optional[ParseLimits] = None):
+        """
+        Args:
+            parse_cache: Optional persistent cache of per-file parse results
+            limits: Size, line-length, generated-code and time limits per
+                file; files breaking them are recorded as File nodes only.
+                Defaults to ParseLimits()
+        """
+        # Parsers by language, created on first use; None if unavailable
+        self.parsers: Dict[str, Optional[BaseLanguageParser]] = {}
+        self.parse_cache = parse_cache
+        self.limits = limits if limits is not None else ParseLimits()
+        # (repo name, path) -> (sha256 of source, tree) of recently reparsed files
+        self.retained_trees: OrderedDict[tuple[str, str], tuple[str, Tree]] = OrderedDict()
+        # Counters of the most recent iter_file_graphs / analyze_repository run
+        self.last_summary: Dict[str, int] = {}
+        # Path -> reason of the files that run recorded without their symbols
+        self.last_degraded: Dict[str, str] = {}
+    
+    def get_parser(self, language: Optional[str]) -> Optional[BaseLanguageParser]:
+        """
+        Get the parser of a language, creating it (and loading its grammar) on first use
+        
+        Args:
+            language: Language name as returned by detect_language
+        
+        Returns:
+            The language's parser, or None if the language is unknown or unavailable
+        """
+        if language is None:
+            return None
+        if language not in self.parsers:
+            self.parsers[language] = language_registry.create_parser(language)
+        return self.parsers[language]
+    
+    def analyze_files(
+        self,
+        repo_path: Path,
+        file_paths: list[str],
+        repo_context: Optional[dict] = None,
+        jobs: int = 1,
+    ) -> GraphData:
         """
         Analyze specific files in the repository.
         
@@ -58,7 +124,8 @@ class RepositoryAnalyzer:
             repo_path: Path to the repository root
             file_paths: List of relative file paths to analyze
             repo_context: Optional repository context (if already computed)
-            
+            jobs: Number of parser processes (1 parses in the current process)
+        
         Returns:
             GraphData containing nodes and relationships for the specified files
         """
@@ -66,75 +133,178 @@ class RepositoryAnalyzer:
         
         if repo_context is None:
             repo_context = self._get_repo_context(repo_path)
-            
+        
         graph_data = GraphData()
         
         # Create Repo node (needed for linking)
         repo_node = self._create_repo_node(repo_path, repo_context)
         graph_data.add_node(repo_node)
         
-        files_parsed = 0
+        rel_paths = [
+            Path(rel_path) for rel_path in file_paths
+            if (repo_path / rel_path).exists() and self._has_parser(repo_path / rel_path)
+        ]
         
-        for rel_path in file_paths:
-            file_path = repo_path / rel_path
-            
-            if not file_path.exists() or not is_code_file(file_path):
+        if "last_commits" not in repo_context:
+            repo_context = {**repo_context, "last_commits": get_last_commits(repo_path, rel_paths)}
+        
+        for rel_path, file_graph_data, error in self._parse_files(repo_path, rel_paths, repo_context, jobs):
+            if error is not None:
+                print(f"Error parsing {repo_path / rel_path}: {error}")
                 continue
-                
+            
+            if file_graph_data is not None:
+                self._link_file_graph(repo_node, file_graph_data)
+                graph_data.merge(file_graph_data)
+        
+        return graph_data
+    
+    def analyze_changed_files(
+        self,
+        repo_path: Path,
+        base_rev: str,
+        file_paths: list[str],
+        repo_name: Optional[str] = None,
+    ) -> GraphData:
+        """
+        Reparse files changed since base_rev, reusing their previous syntax trees
+        
+        Each file's tree from the previous call (or, failing that, rebuilt from
+        its content at base_rev) is edited with the `git diff -U0` hunks, so
+        tree-sitter only re-parses the damaged regions. The ids of symbols
+        whose lines intersect a hunk, plus File nodes and new files' symbols,
+        are collected in the result's invalidated_ids; all other symbols
+        of the files are unchanged apart from their position.
+        
+        Args:
+            repo_path: Path to the repository root, checked out at the new revision
+            base_rev: Revision the graph was last built from
+            file_paths: Relative paths of the changed files; deleted files are skipped
+            repo_name: Repository name to build ids with (defaults to the directory name)
+        
+        Returns:
+            GraphData for the changed files that still exist
+        """
+        repo_path = Path(repo_path).resolve()
+        repo_context = self._get_repo_context(repo_path)
+        if repo_name:
+            repo_context["name"] = repo_name
+        
+        graph_data = GraphData()
+        repo_node = self._create_repo_node(repo_path, repo_context)
+        graph_data.add_node(repo_node)
+        
+        rel_paths = [
+            Path(rel_path) for rel_path in file_paths
+            if (repo_path / rel_path).is_file() and self._has_parser(repo_path / rel_path)
+        ]
+        
+        repo_context["last_commits"] = get_last_commits(repo_path, rel_paths)
+        hunks_by_path = get_diff_hunks(repo_path, base_rev, "HEAD", rel_paths) if rel_paths else {}
+        
+        for rel_path in rel_paths:
             try:
-                # Detect language
-                language = detect_language(file_path)
-                
-                if language is None:
-                    continue
-                
-                # Check if we have a parser for this language
-                parser = self.parsers.get(language)
-                
-                if parser is None:
-                    continue
-                
-                # Read file content
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                # Parse the file
-                file_graph_data = parser.parse_file(Path(rel_path), content, repo_context)
-                
-                # Merge into main graph data
-                for node in file_graph_data.nodes:
-                    graph_data.add_node(node)
-                
-                for rel in file_graph_data.relationships:
-                    graph_data.add_relationship(rel)
-                
-                # Add Repo -> File relationship
-                file_nodes = [n for n in file_graph_data.nodes if hasattr(n, 'path')]
-                for file_node in file_nodes:
-                    from packages.parser.models import Relationship, RelationshipType
-                    graph_data.add_relationship(Relationship(
-                        source_id=repo_node.id,
-                        target_id=file_node.id,
-                        type=RelationshipType.HAS_FILE
-                    ))
-                
-                files_parsed += 1
-                
+                file_graph_data = self._reparse_file(
+                    repo_path, rel_path, base_rev, hunks_by_path.get(rel_path.as_posix()), repo_context
+                )
             except Exception as e:
-                print(f"Error parsing {file_path}: {e}")
+                print(f"Error parsing {repo_path / rel_path}: {e}")
                 continue
-                
+            
+            self._link_file_graph(repo_node, file_graph_data)
+            graph_data.merge(file_graph_data)
+        
         return graph_data
-
-    def analyze_repository(self, repo_path: str | Path, cleanup_after: bool = True) -> GraphData:
+    
+    def _reparse_file(
+        self,
+        repo_path: Path,
+        rel_path: Path,
+        base_rev: str,
+        hunks: Optional[list[DiffHunk]],
+        repo_context: dict,
+    ) -> GraphData:
+        """Incrementally reparse one changed file and mark its edited symbols"""
+        parser = self.get_parser(detect_language(rel_path))
+        
+        with open(repo_path / rel_path, 'rb') as f:
+            content = f.read()
+        
+        reason = self.limits.check(rel_path, content)
+        if reason is not None:
+            return self._reparse_file_only(parser, rel_path, content, repo_context, reason)
+        
+        old_source = get_file_at_revision(repo_path, base_rev, rel_path) if hunks else None
+        tree_key = (repo_context["name"], rel_path.as_posix())
+        
+        if old_source is None:
+            # New file (or no usable diff): everything in it is new
+            tree = parser.parse_tree(content)
+        else:
+            retained = self.retained_trees.pop(tree_key, None)
+            old_tree = None
+            if retained is not None and retained[0] == hashlib.sha256(old_source).hexdigest():
+                old_tree = retained[1]
+            tree = parser.parse_tree(content, old_source, hunks, old_tree)
+        
+        try:
+            file_graph_data = parser.parse_file(
+                rel_path, content, repo_context, tree=tree, budget=self.limits.time_budget
+            )
+        except ParseBudgetExceeded as e:
+            reason = f"{e} ({self.limits.time_budget:g}s)"
+            return self._reparse_file_only(parser, rel_path, content, repo_context, reason)
+        file_node = file_graph_data.nodes[0]
+        
+        if old_source is None:
+            prefix = file_node.id[:-len("file")]
+            file_graph_data.invalidated_ids.update(
+                node.id for node in file_graph_data.nodes if node.id.startswith(prefix)
+            )
+        else:
+            file_graph_data.invalidated_ids.update(find_invalidated_ids(file_graph_data, file_node, hunks))
+        
+        self.retained_trees[tree_key] = (hashlib.sha256(content).hexdigest(), tree)
+        while len(self.retained_trees) > self.RETAINED_TREES:
+            self.retained_trees.popitem(last=False)
+        
+        return file_graph_data
+    
+    def _reparse_file_only(
+        self,
+        parser: BaseLanguageParser,
+        rel_path: Path,
+        content: bytes,
+        repo_context: dict,
+        reason: str,
+    ) -> GraphData:
+        """Record a changed file that breaks the parse limits as a File node only"""
+        self.retained_trees.pop((repo_context["name"], rel_path.as_posix()), None)
+        file_graph_data = parser.parse_file_only(rel_path, content, repo_context, reason)
+        file_graph_data.invalidated_ids.add(file_graph_data.nodes[0].id)
+        return file_graph_data
+    
+    def analyze_repository(
+        self,
+        repo_path: str | Path,
+        cleanup_after: bool = True,
+        jobs: int = 1,
+        file_source: str = "walk",
+    ) -> GraphData:
         """
         Analyze an entire repository and extract graph data
         
         Supports both local paths and Git URLs (GitHub, GitLab, Bitbucket, etc.)
+        This collects every fragment of iter_file_graphs into one GraphData; use
+        iter_file_graphs directly to keep memory bounded on large repositories.
         
         Args:
             repo_path: Path to the repository root OR a Git URL (e.g., https://github.com/user/repo)
             cleanup_after: If True, cleanup temporary cloned repos after analysis
+            jobs: Number of parser processes; values above 1 parse files in a
+                process pool and merge the results in walk order
+            file_source: How files are discovered, "walk" (file system with
+                .gitignore/.secrinignore) or "git" (git ls-files)
         
         Returns:
             GraphData containing all nodes and relationships
@@ -148,10 +318,159 @@ class RepositoryAnalyzer:
             
             # Keep cloned repo after analysis
             graph_data = analyzer.analyze_repository("https://github.com/user/repo", cleanup_after=False)
+            
+            # Parse with a pool of 8 worker processes
+            graph_data = analyzer.analyze_repository("/path/to/repo", jobs=8)
+        """
+        graph_data = GraphData()
+        
+        for fragment in self.iter_file_graphs(
+            repo_path, cleanup_after=cleanup_after, jobs=jobs, file_source=file_source
+        ):
+            graph_data.merge(fragment)
+        
+        print(f"\nAnalysis complete:")
+        print(f"  Files parsed: {self.last_summary['files_parsed']}")
+        print(f"  Files skipped: {self.last_summary['files_skipped']}")
+        if self.last_degraded:
+            print(f"  Files not parsed (File node only): {self.last_summary['files_degraded']}")
+            for path, reason in self.last_degraded.items():
+                print(f"    {path}: {reason}")
+        if self.parse_cache is not None:
+            print(f"  Parse cache: {self.last_summary['cache_hits']} hits, {self.last_summary['cache_misses']} misses")
+        print(f"  Total nodes: {len(graph_data.nodes)}")
+        print(f"  Total relationships: {len(graph_data.relationships)}")
+        
+        return graph_data
+    
+    def iter_file_graphs(
+        self,
+        repo_path: str | Path,
+        cleanup_after: bool = True,
+        jobs: int = 1,
+        file_source: str = "walk",
+    ) -> Iterator[GraphData]:
+        """
+        Analyze a repository and yield its graph one fragment at a time
+        
+        The first fragment holds the Repo node and the README doc. Every later
+        fragment holds one file's nodes and relationships, including the
+        Repo HAS_FILE edge, so fragments can be written in order as they
+        arrive. Nodes shared between files (packages, commits) are repeated
+        in each fragment that references them. Counts for the run are
+        available in last_summary once the generator is exhausted, and files
+        that broke the parse limits (with the reason) in last_degraded.
+        
+        Args:
+            repo_path: Path to the repository root OR a Git URL
+            cleanup_after: If True, cleanup temporary cloned repos when done
+            jobs: Number of parser processes (1 parses in the current process)
+            file_source: How files are discovered, "walk" or "git"
+        
+        Yields:
+            GraphData fragments
+        
+        Example:
+            for fragment in analyzer.iter_file_graphs("/path/to/repo", jobs=8):
+                graph_ingestion_service.ingest_graph_data(fragment)
+        """
+        original_input = str(repo_path)
+        repo_path, is_temp_clone = self._resolve_repository(repo_path)
+        self.last_summary = {"files_parsed": 0, "files_skipped": 0, "files_degraded": 0}
+        self.last_degraded = {}
+        if self.parse_cache is not None:
+            cache_stats_before = self.parse_cache.stats()
+        
+        try:
+            # Get repository metadata
+            repo_context = self._get_repo_context(repo_path)
+            
+            # Override name if we have original input URL
+            if is_git_url(original_input):
+                repo_info = extract_repo_info(original_input)
+                if repo_info.get('name') and repo_info.get('name') != 'unknown':
+                    repo_context['name'] = repo_info['name']
+                    repo_context['full_name'] = repo_info.get('full_name')
+                    repo_context['owner'] = repo_info.get('owner')
+            
+            # Create Repo node
+            repo_graph = GraphData()
+            repo_node = self._create_repo_node(repo_path, repo_context)
+            repo_graph.add_node(repo_node)
+            
+            # Extract README if exists
+            self._extract_readme(repo_path, repo_node, repo_graph, repo_context)
+            yield repo_graph
+            
+            # Scan and parse all files
+            rel_paths = []
+            
+            for file_path in self._walk_repository(repo_path, file_source):
+                # Get relative path for cleaner IDs
+                rel_path = get_relative_path(file_path, repo_path)
+                
+                # Check if we have a parser for this language
+                if not self._has_parser(file_path):
+                    print(f"Skipping {rel_path}: No parser for language '{detect_language(file_path)}'")
+                    self.last_summary["files_skipped"] += 1
+                    continue
+                
+                rel_paths.append(rel_path)
+            
+            # One git log pass for all files instead of one git process per file
+            repo_context["last_commits"] = get_last_commits(repo_path, rel_paths)
+            
+            if jobs > 1:
+                print(f"Parsing {len(rel_paths)} files with {jobs} worker processes...")
+            
+            for rel_path, file_graph_data, error in self._parse_files(repo_path, rel_paths, repo_context, jobs):
+                if error is not None:
+                    print(f"Error parsing {repo_path / rel_path}: {error}")
+                    self.last_summary["files_skipped"] += 1
+                    continue
+                
+                if file_graph_data is None:
+                    self.last_summary["files_skipped"] += 1
+                    continue
+                
+                if file_graph_data.degraded_files:
+                    reason = file_graph_data.degraded_files[rel_path.as_posix()]
+                    print(f"Recorded {rel_path} without parsing: {reason}")
+                    self.last_degraded.update(file_graph_data.degraded_files)
+                    self.last_summary["files_degraded"] += 1
+                else:
+                    print(f"Parsed {rel_path} ({detect_language(rel_path)})")
+                    self.last_summary["files_parsed"] += 1
+                self._link_file_graph(repo_node, file_graph_data)
+                yield file_graph_data
+            
+            if self.parse_cache is not None:
+                cache_stats = self.parse_cache.stats()
+                self.last_summary["cache_hits"] = cache_stats["hits"] - cache_stats_before["hits"]
+                self.last_summary["cache_misses"] = cache_stats["misses"] - cache_stats_before["misses"]
+                evicted = self.parse_cache.prune()
+                if evicted:
+                    print(f"Evicted {evicted} parse cache entries")
+        
+        finally:
+            # Cleanup temporary clone if needed
+            if is_temp_clone and cleanup_after:
+                print(f"\nCleaning up temporary clone...")
+                cleanup_temp_repo(repo_path)
+            elif is_temp_clone:
+                print(f"\nTemporary clone preserved at: {repo_path}")
+    
+    def _resolve_repository(self, repo_path: str | Path) -> tuple[Path, bool]:
+        """
+        Resolve a local path or Git URL to a local repository directory
+        
+        Args:
+            repo_path: Path to the repository root OR a Git URL
+        
+        Returns:
+            Tuple of (local repository path, whether it is a temporary clone)
         """
         repo_path_str = str(repo_path)
-        is_temp_clone = False
-        original_input = repo_path_str
         
         # Check if it's a Git URL
         if is_git_url(repo_path_str):
@@ -162,134 +481,148 @@ class RepositoryAnalyzer:
             
             # Clone the repository
             try:
-                repo_path, is_temp_clone = clone_repository(repo_path_str)
+                return clone_repository(repo_path_str)
             except Exception as e:
                 raise RuntimeError(f"Failed to clone repository: {e}")
-        else:
-            repo_path = Path(repo_path).resolve()
-            
-            if not repo_path.exists():
-                raise ValueError(f"Repository path does not exist: {repo_path}")
-            
-            if not repo_path.is_dir():
-                raise ValueError(f"Repository path is not a directory: {repo_path}")
         
-        # Initialize graph data
-        graph_data = GraphData()
+        repo_path = Path(repo_path).resolve()
         
-        # Get repository metadata
-        repo_context = self._get_repo_context(repo_path)
+        if not repo_path.exists():
+            raise ValueError(f"Repository path does not exist: {repo_path}")
         
-        # Override name if we have original input URL
-        if is_git_url(original_input):
-            repo_info = extract_repo_info(original_input)
-            if repo_info.get('name') and repo_info.get('name') != 'unknown':
-                repo_context['name'] = repo_info['name']
-                repo_context['full_name'] = repo_info.get('full_name')
-                repo_context['owner'] = repo_info.get('owner')
+        if not repo_path.is_dir():
+            raise ValueError(f"Repository path is not a directory: {repo_path}")
         
-        # Create Repo node
-        repo_node = self._create_repo_node(repo_path, repo_context)
-        graph_data.add_node(repo_node)
+        return repo_path, False
+    
+    def _has_parser(self, file_path: Path) -> bool:
+        """Check whether a file is a code file with an available parser"""
+        return self.get_parser(detect_language(file_path)) is not None
+    
+    def _parse_file(self, repo_path: Path, rel_path: Path, repo_context: dict) -> Optional[GraphData]:
+        """
+        Read and parse a single file
+        
+        Args:
+            repo_path: Path to the repository root
+            rel_path: Path of the file relative to the repository root
+            repo_context: Repository metadata
+        
+        Returns:
+            GraphData for the file, or None if no parser handles its language.
+            Files breaking the parse limits get a File node only and are
+            listed in the result's degraded_files
+        """
+        parser = self.get_parser(detect_language(rel_path))
         
-        # Extract README if exists
-        self._extract_readme(repo_path, repo_node, graph_data, repo_context)
+        if parser is None:
+            return None
         
-        # Scan and parse all files
-        files_parsed = 0
-        files_skipped = 0
+        with open(repo_path / rel_path, 'rb') as f:
+            content = f.read()
         
-        for file_path in self._walk_repository(repo_path):
+        reason = self.limits.check(rel_path, content)
+        if reason is None:
             try:
-                # Get relative path for cleaner IDs
-                rel_path = get_relative_path(file_path, repo_path)
-                
-                # Detect language
-                language = detect_language(file_path)
-                
-                if language is None:
-                    files_skipped += 1
-                    continue
-                
-                # Check if we have a parser for this language
-                parser = self.parsers.get(language)
-                
-                if parser is None:
-                    print(f"Skipping {rel_path}: No parser for language '{language}'")
-                    files_skipped += 1
-                    continue
-                
-                # Read file content
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                # Parse the file
-                print(f"Parsing {rel_path} ({language})...")
-                file_graph_data = parser.parse_file(rel_path, content, repo_context)
-                
-                # Merge into main graph data
-                for node in file_graph_data.nodes:
-                    graph_data.add_node(node)
-                
-                for rel in file_graph_data.relationships:
-                    graph_data.add_relationship(rel)
-                
-                # Add Repo -> File relationship
-                file_nodes = [n for n in file_graph_data.nodes if hasattr(n, 'path')]
-                for file_node in file_nodes:
-                    from packages.parser.models import Relationship, RelationshipType
-                    graph_data.add_relationship(Relationship(
-                        source_id=repo_node.id,
-                        target_id=file_node.id,
-                        type=RelationshipType.HAS_FILE
-                    ))
-                
-                files_parsed += 1
-                
-            except Exception as e:
-                print(f"Error parsing {file_path}: {e}")
-                files_skipped += 1
-                continue
+                return parser.parse_file(
+                    rel_path, content, repo_context, cache=self.parse_cache, budget=self.limits.time_budget
+                )
+            except ParseBudgetExceeded as e:
+                reason = f"{e} ({self.limits.time_budget:g}s)"
         
-        print(f"\nAnalysis complete:")
-        print(f"  Files parsed: {files_parsed}")
-        print(f"  Files skipped: {files_skipped}")
-        print(f"  Total nodes: {len(graph_data.nodes)}")
-        print(f"  Total relationships: {len(graph_data.relationships)}")
+        return parser.parse_file_only(rel_path, content, repo_context, reason)
+    
+    def _parse_files(
+        self,
+        repo_path: Path,
+        rel_paths: Iterable[Path],
+        repo_context: dict,
+        jobs: int = 1,
+    ) -> Iterator[tuple[Path, Optional[GraphData], Optional[Exception]]]:
+        """
+        Parse files sequentially or in a process pool
         
-        # Cleanup temporary clone if needed
-        if is_temp_clone and cleanup_after:
-            print(f"\nCleaning up temporary clone...")
-            cleanup_temp_repo(repo_path)
-        elif is_temp_clone:
-            print(f"\nTemporary clone preserved at: {repo_path}")
+        Results are yielded in the same order as rel_paths regardless of which
+        worker finished first, so merging them is deterministic. In parallel
+        mode at most jobs * PENDING_PER_WORKER files are in flight at a time.
         
-        return graph_data
+        Args:
+            repo_path: Path to the repository root
+            rel_paths: Paths of the files to parse, relative to repo_path
+            repo_context: Repository metadata
+            jobs: Number of worker processes (1 parses in the current process)
+        
+        Yields:
+            (rel_path, graph_data, error) tuples; error is set if parsing failed
+        """
+        if jobs <= 1:
+            for rel_path in rel_paths:
+                try:
+                    yield rel_path, self._parse_file(repo_path, rel_path, repo_context), None
+                except Exception as e:
+                    yield rel_path, None, e
+            return
+        
+        def collect(rel_path: Path, future: Future):
+            try:
+                graph_data, cache_stats = future.result()
+            except Exception as e:
+                return rel_path, None, e
+            if self.parse_cache is not None:
+                self.parse_cache.record(cache_stats)
+            return rel_path, graph_data, None
+        
+        max_pending = jobs * self.PENDING_PER_WORKER
+        pending: deque[tuple[Path, Future]] = deque()
+        
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(repo_context, self.parse_cache, self.limits),
+        ) as executor:
+            for rel_path in rel_paths:
+                pending.append((rel_path, executor.submit(_parse_in_worker, str(repo_path), str(rel_path))))
+                if len(pending) >= max_pending:
+                    yield collect(*pending.popleft())
+            
+            while pending:
+                yield collect(*pending.popleft())
+    
+    def _link_file_graph(self, repo_node: RepoRecord, file_graph_data: GraphData):
+        """Add the Repo -> File relationship to a single file's graph"""
+        for file_node in file_graph_data.get_nodes_by_type(FileRecord):
+            file_graph_data.add_relationship(Relationship(
+                source_id=repo_node.id,
+                target_id=file_node.id,
+                source_label=repo_node.label,
+                target_label=file_node.label,
+                type=RelationshipType.HAS_FILE
+            ))
     
-    def _walk_repository(self, repo_path: Path):
+    def _walk_repository(self, repo_path: Path, file_source: str = "walk"):
         """
         Walk through repository and yield code files
         
         Args:
             repo_path: Path to the repository root
+            file_source: "walk" scans the file system, pruning ignored
+                directories and honouring .gitignore/.secrinignore; "git" asks
+                git ls-files and falls back to walking outside a git work tree
         
         Yields:
             Path objects for code files
         """
-        for path in repo_path.rglob("*"):
-            # Skip if it's a directory
-            if path.is_dir():
-                continue
-            
-            # Skip ignored paths
-            if should_ignore_path(path):
-                continue
-            
-            # Only process code files
-            if not is_code_file(path):
-                continue
-            
-            yield path
+        if file_source not in ("walk", "git"):
+            raise ValueError(f"Unknown file source: {file_source}")
+        
+        if file_source == "git":
+            files = list_git_files(repo_path)
+            if files is not None:
+                yield from files
+                return
+            print("Warning: git ls-files unavailable, walking the file system instead")
+        
+        yield from walk_repository_files(repo_path)
     
     def _get_repo_context(self, repo_path: Path) -> dict:
         """
@@ -345,25 +678,25 @@ class RepositoryAnalyzer:
                 context["default_branch"] = branch
             else:
                 context["default_branch"] = "main"
-                
+        
         except Exception as e:
             print(f"Warning: Could not get git info: {e}")
             context["default_branch"] = "main"
         
         return context
     
-    def _create_repo_node(self, repo_path: Path, repo_context: dict) -> RepoNode:
+    def _create_repo_node(self, repo_path: Path, repo_context: dict) -> RepoRecord:
         """
-        Create a RepoNode for the repository
+        Create the Repo node record for the repository
         
         Args:
             repo_path: Path to the repository
             repo_context: Repository metadata
         
         Returns:
-            RepoNode object
+            RepoRecord
         """
-        return RepoNode(
+        return RepoRecord(
             id=f"repo:{repo_context['name']}",
             name=repo_context["name"],
             url=repo_context.get("url", str(repo_path)),
@@ -373,8 +706,8 @@ class RepositoryAnalyzer:
         )
     
     def _extract_readme(self, repo_path: Path, repo_node, graph_data: GraphData, repo_context: dict):
-        """Extract README file and create DocNode"""
-        from packages.parser.models import DocNode, Relationship, RelationshipType
+        """Extract README file and create its Doc node"""
+        from packages.parser.models import DocRecord, Relationship, RelationshipType
         from packages.parser.models.nodes import DocType
         
         # Look for README files
@@ -393,7 +726,7 @@ class RepositoryAnalyzer:
                     
                     doc_id = self._generate_id(repo_context["name"], "doc", "README")
                     
-                    doc_node = DocNode(
+                    doc_node = DocRecord(
                         id=doc_id,
                         type=DocType.README,
                         text=content,
@@ -407,12 +740,14 @@ class RepositoryAnalyzer:
                     graph_data.add_relationship(Relationship(
                         source_id=repo_node.id,
                         target_id=doc_id,
+                        source_label=repo_node.label,
+                        target_label=doc_node.label,
                         type=RelationshipType.HAS_DOC
                     ))
                     
                     print(f"✓ Extracted README: {pattern}")
                     break
-                    
+                
                 except Exception as e:
                     print(f"Warning: Could not read README {pattern}: {e}")
     
@@ -427,4 +762,4 @@ class RepositoryAnalyzer:
         Returns:
             List of language names
         """
-        return list(self.parsers.keys())
+        return language_registry.supported_languages()
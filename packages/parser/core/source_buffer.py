@@ -0,0 +1,87 @@
+"""Byte-native view of a source file for tree-sitter based extraction"""
+from array import array
+from typing import Optional
+import hashlib
+import re
+
+from tree_sitter import Node
+
+
+_NEWLINE = re.compile(b"\n")
+
+
+class SourceBuffer:
+    """
+    The content of one file as UTF-8 bytes plus a line-start index
+    
+    Tree-sitter reports byte offsets, so node text is sliced from the bytes
+    (through a memoryview, without copying) and only the slice is decoded.
+    Slicing a decoded str with those offsets is wrong as soon as a file
+    contains non-ASCII characters. Line starts are indexed once, so a
+    line-range snippet is a single slice instead of splitting the whole file
+    for every symbol.
+    """
+    
+    __slots__ = ("data", "view", "line_starts", "_text")
+    
+    def __init__(self, content: str | bytes):
+        """
+        Args:
+            content: File content; text is encoded as UTF-8, bytes are used as is
+        """
+        if isinstance(content, str):
+            self._text: Optional[str] = content
+            self.data = content.encode("utf-8", errors="surrogatepass")
+        else:
+            self._text = None
+            self.data = bytes(content)
+        self.view = memoryview(self.data)
+        
+        # Byte offset at which every line starts; "a\nb" has two lines like str.split('\n')
+        self.line_starts = array("Q", [0])
+        self.line_starts.extend(match.end() for match in _NEWLINE.finditer(self.data))
+    
+    @property
+    def text(self) -> str:
+        """The whole content decoded (invalid UTF-8 is dropped), computed once"""
+        if self._text is None:
+            self._text = self.decode(0, len(self.data))
+        return self._text
+    
+    @property
+    def line_count(self) -> int:
+        """Number of lines, counted like len(text.split('\\n'))"""
+        return len(self.line_starts)
+    
+    def sha256(self) -> str:
+        """SHA-256 hex digest of the bytes"""
+        return hashlib.sha256(self.data).hexdigest()
+    
+    def decode(self, start_byte: int, end_byte: int) -> str:
+        """Decode a byte range; invalid UTF-8 sequences are dropped"""
+        return str(self.view[start_byte:end_byte], "utf-8", "ignore")
+    
+    def node_text(self, node: Node) -> str:
+        """Text of a tree-sitter node"""
+        return self.decode(node.start_byte, node.end_byte)
+    
+    def lines(self, start_line: int, end_line: int) -> str:
+        """
+        Text of a range of lines, without the final line break
+        
+        Args:
+            start_line: First line (1-indexed)
+            end_line: Last line (1-indexed, inclusive)
+        
+        Returns:
+            The lines joined by '\\n', or '' for an empty range
+        """
+        start_idx = max(start_line - 1, 0)
+        end_idx = min(end_line, len(self.line_starts))
+        if end_idx <= start_idx:
+            return ""
+        
+        start_byte = self.line_starts[start_idx]
+        # Stop before the newline that ends the last line, if there is one
+        end_byte = self.line_starts[end_idx] - 1 if end_idx < len(self.line_starts) else len(self.data)
+        return self.decode(start_byte, end_byte)
@@ -1,17 +1,18 @@
-from tree_sitter import Language, Node, Query, QueryCursor
+from tree_sitter import Node
 from pathlib import Path
-import hashlib
+from bisect import bisect_left, bisect_right
 
 from packages.parser.core import BaseLanguageParser
+from packages.parser.core.base_parser import Captures
+from packages.parser.core.source_buffer import SourceBuffer
 from packages.parser.models import (
-    FileNode,
-    ClassNode,
-    FunctionNode,
-    VariableNode,
-    DocNode,
-    PackageNode,
-    TestNode,
-    CommitNode,
+    FileRecord,
+    ClassRecord,
+    FunctionRecord,
+    VariableRecord,
+    DocRecord,
+    PackageRecord,
+    TestRecord,
     GraphData,
     Relationship,
     RelationshipType,
@@ -30,11 +31,28 @@ class PythonParser(BaseLanguageParser):
     def file_extensions(self) -> list[str]:
         return [".py", ".pyi"]
     
-    def _create_file_node(self, file_path: Path, content: str, repo_context: dict) -> FileNode:
-        lines = len(content.split('\n'))
-        sha = hashlib.sha256(content.encode()).hexdigest()
+    @property
+    def query_source(self) -> str:
+        return """
+            (class_definition
+                name: (identifier)
+                body: (block)) @class.def
+            (function_definition
+                name: (identifier)
+                parameters: (parameters)) @function.def
+            (import_statement
+                name: (dotted_name) @import.module)
+            (import_from_statement
+                module_name: (dotted_name) @import.from)
+            (expression_statement (string) @docstring)
+            (comment) @comment
+        """
+    
+    def _create_file_node(self, file_path: Path, source: SourceBuffer, repo_context: dict) -> FileRecord:
+        lines = source.line_count
+        sha = source.sha256()
         
-        return FileNode(
+        return FileRecord(
             id=self._generate_id(repo_context["name"], str(file_path), "file"),
             path=str(file_path),
             language=self.language_name,
@@ -45,122 +63,109 @@ class PythonParser(BaseLanguageParser):
             commit_hash=repo_context.get("commit_hash"),
         )
     
-    def _extract_classes(self, root_node: Node, content: str, file_node: FileNode, graph_data: GraphData, repo_context: dict):
+    def _extract_classes(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord,
+                        graph_data: GraphData, repo_context: dict):
         """Extract Python class definitions"""
-        query = Query(self.language, """
-            (class_definition
-                name: (identifier) @class.name
-                body: (block) @class.body) @class.def
-        """)
+        function_defs = captures.get("function.def", [])
+        function_starts = [node.start_byte for node in function_defs]
         
-        cursor = QueryCursor(query)
-        captures_dict = cursor.captures(root_node)
-        # Convert dict format to list of tuples for compatibility
-        captures = [(node, name) for name, nodes in captures_dict.items() for node in nodes]
-        classes = {}
-        
-        for node, capture_name in captures:
-            if capture_name == "class.def":
-                class_name_node = node.child_by_field_name("name")
-                if class_name_node:
-                    class_name = self._get_node_text(class_name_node, content)
-                    start_line = self._get_line_number(node)
-                    end_line = node.end_point[0] + 1
-                    
-                    class_id = self._generate_id(
-                        repo_context["name"],
-                        str(file_node.path),
-                        "class",
-                        class_name
-                    )
-                    
-                    class_node = ClassNode(
-                        id=class_id,
-                        name=class_name,
-                        start_line=start_line,
-                        end_line=end_line,
-                        source_path=file_node.path,
-                        repo_sha=repo_context.get("sha"),
-                        commit_hash=repo_context.get("commit_hash"),
-                        snippet=self._get_snippet(content, start_line, end_line),
-                    )
-                    
-                    graph_data.add_node(class_node)
-                    classes[class_name] = class_node
-                    
-                    # Create relationship: File CONTAINS_CLASS Class
-                    graph_data.add_relationship(Relationship(
-                        source_id=file_node.id,
-                        target_id=class_id,
-                        type=RelationshipType.CONTAINS_CLASS
-                    ))
-                    
-                    # Extract methods within the class
-                    self._extract_methods(node, content, file_node, class_node, graph_data, repo_context)
+        for node in captures.get("class.def", []):
+            class_name_node = node.child_by_field_name("name")
+            if class_name_node:
+                class_name = self._get_node_text(class_name_node, source)
+                start_line = self._get_line_number(node)
+                end_line = node.end_point[0] + 1
+                
+                class_id = self._generate_id(
+                    repo_context["name"],
+                    str(file_node.path),
+                    "class",
+                    class_name
+                )
+                
+                class_node = ClassRecord(
+                    id=class_id,
+                    name=class_name,
+                    start_line=start_line,
+                    end_line=end_line,
+                    source_path=file_node.path,
+                    repo_sha=repo_context.get("sha"),
+                    commit_hash=repo_context.get("commit_hash"),
+                    snippet=self._get_snippet(source, start_line, end_line),
+                )
+                
+                graph_data.add_node(class_node)
+                
+                # Create relationship: File CONTAINS_CLASS Class
+                graph_data.add_relationship(Relationship(
+                    source_id=file_node.id,
+                    target_id=class_id,
+                    source_label=FileRecord.label,
+                    target_label=ClassRecord.label,
+                    type=RelationshipType.CONTAINS_CLASS
+                ))
+                
+                # Methods are the function definitions inside the class's byte range
+                first = bisect_right(function_starts, node.start_byte)
+                last = bisect_left(function_starts, node.end_byte)
+                self._extract_methods(function_defs[first:last], source, file_node, class_node, graph_data, repo_context)
     
-    def _extract_methods(self, class_node: Node, content: str, file_node: FileNode, 
-                        class_obj: ClassNode, graph_data: GraphData, repo_context: dict):
+    def _extract_methods(self, method_defs: list[Node], source: SourceBuffer, file_node: FileRecord,
+                        class_obj: ClassRecord, graph_data: GraphData, repo_context: dict):
         """Extract methods from a class"""
-        query = Query(self.language, """
-            (function_definition
-                name: (identifier) @method.name
-                parameters: (parameters) @method.params) @method.def
-        """)
-        
-        cursor = QueryCursor(query)
-        captures_dict = cursor.captures(class_node)
-        captures = [(node, name) for name, nodes in captures_dict.items() for node in nodes]
-        
-        for node, capture_name in captures:
-            if capture_name == "method.def":
-                method_name_node = node.child_by_field_name("name")
-                params_node = node.child_by_field_name("parameters")
+        for node in method_defs:
+            method_name_node = node.child_by_field_name("name")
+            params_node = node.child_by_field_name("parameters")
+            
+            if method_name_node and params_node:
+                method_name = self._get_node_text(method_name_node, source)
+                params = self._get_node_text(params_node, source)
+                signature = f"{method_name}{params}"
                 
-                if method_name_node and params_node:
-                    method_name = self._get_node_text(method_name_node, content)
-                    params = self._get_node_text(params_node, content)
-                    signature = f"{method_name}{params}"
-                    
-                    start_line = self._get_line_number(node)
-                    end_line = node.end_point[0] + 1
-                    
-                    method_id = self._generate_id(
-                        repo_context["name"],
-                        str(file_node.path),
-                        "method",
-                        class_obj.name,
-                        method_name
-                    )
-                    
-                    method_node = FunctionNode(
-                        id=method_id,
-                        name=method_name,
-                        signature=signature,
-                        start_line=start_line,
-                        end_line=end_line,
-                        is_method=True,
-                        source_path=file_node.path,
-                        repo_sha=repo_context.get("sha"),
-                        commit_hash=repo_context.get("commit_hash"),
-                        snippet=self._get_snippet(content, start_line, end_line),
-                    )
-                    
-                    graph_data.add_node(method_node)
-                    
-                    # Relationships
-                    graph_data.add_relationship(Relationship(
-                        source_id=class_obj.id,
-                        target_id=method_id,
-                        type=RelationshipType.HAS_METHOD
-                    ))
-                    
-                    graph_data.add_relationship(Relationship(
-                        source_id=method_id,
-                        target_id=file_node.id,
-                        type=RelationshipType.DEFINED_IN
-                    ))
+                start_line = self._get_line_number(node)
+                end_line = node.end_point[0] + 1
+                
+                method_id = self._generate_id(
+                    repo_context["name"],
+                    str(file_node.path),
+                    "method",
+                    class_obj.name,
+                    method_name
+                )
+                
+                method_node = FunctionRecord(
+                    id=method_id,
+                    name=method_name,
+                    signature=signature,
+                    start_line=start_line,
+                    end_line=end_line,
+                    is_method=True,
+                    source_path=file_node.path,
+                    repo_sha=repo_context.get("sha"),
+                    commit_hash=repo_context.get("commit_hash"),
+                    snippet=self._get_snippet(source, start_line, end_line),
+                )
+                
+                graph_data.add_node(method_node)
+                
+                # Relationships
+                graph_data.add_relationship(Relationship(
+                    source_id=class_obj.id,
+                    target_id=method_id,
+                    source_label=ClassRecord.label,
+                    target_label=FunctionRecord.label,
+                    type=RelationshipType.HAS_METHOD
+                ))
+                
+                graph_data.add_relationship(Relationship(
+                    source_id=method_id,
+                    target_id=file_node.id,
+                    source_label=FunctionRecord.label,
+                    target_label=FileRecord.label,
+                    type=RelationshipType.DEFINED_IN
+                ))
     
-    def _extract_functions(self, root_node: Node, content: str, file_node: FileNode, 
+    def _extract_functions(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord, 
                           graph_data: GraphData, repo_context: dict):
         """Extract top-level Python functions"""
         # Get only top-level functions (not methods inside classes)
@@ -170,8 +175,8 @@ class PythonParser(BaseLanguageParser):
                 params_node = child.child_by_field_name("parameters")
                 
                 if name_node and params_node:
-                    func_name = self._get_node_text(name_node, content)
-                    params = self._get_node_text(params_node, content)
+                    func_name = self._get_node_text(name_node, source)
+                    params = self._get_node_text(params_node, source)
                     signature = f"{func_name}{params}"
                     
                     start_line = self._get_line_number(child)
@@ -184,7 +189,7 @@ class PythonParser(BaseLanguageParser):
                         func_name
                     )
                     
-                    func_node = FunctionNode(
+                    func_node = FunctionRecord(
                         id=func_id,
                         name=func_name,
                         signature=signature,
@@ -194,7 +199,7 @@ class PythonParser(BaseLanguageParser):
                         source_path=file_node.path,
                         repo_sha=repo_context.get("sha"),
                         commit_hash=repo_context.get("commit_hash"),
-                        snippet=self._get_snippet(content, start_line, end_line),
+                        snippet=self._get_snippet(source, start_line, end_line),
                     )
                     
                     graph_data.add_node(func_node)
@@ -203,42 +208,32 @@ class PythonParser(BaseLanguageParser):
                     graph_data.add_relationship(Relationship(
                         source_id=file_node.id,
                         target_id=func_id,
+                        source_label=FileRecord.label,
+                        target_label=FunctionRecord.label,
                         type=RelationshipType.CONTAINS_FUNCTION
                     ))
                     
                     graph_data.add_relationship(Relationship(
                         source_id=func_id,
                         target_id=file_node.id,
+                        source_label=FunctionRecord.label,
+                        target_label=FileRecord.label,
                         type=RelationshipType.DEFINED_IN
                     ))
     
-    def _extract_imports(self, root_node: Node, content: str, file_node: FileNode, 
+    def _extract_imports(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord, 
                         graph_data: GraphData, repo_context: dict):
         """Extract Python import statements"""
-        query = Query(self.language, """
-            [
-                (import_statement
-                    name: (dotted_name) @import.module)
-                (import_from_statement
-                    module_name: (dotted_name) @import.from)
-            ]
-        """)
+        import_nodes = captures.get("import.module", []) + captures.get("import.from", [])
         
-        cursor = QueryCursor(query)
-        captures_dict = cursor.captures(root_node)
-        captures = [(node, name) for name, nodes in captures_dict.items() for node in nodes]
-        
-        for node, capture_name in captures:
-            module_name = self._get_node_text(node, content)
+        for node in import_nodes:
+            module_name = self._get_node_text(node, source)
             
             # Create PackageNode for external imports
             package_id = self._generate_id("package", module_name.split('.')[0])
             
-            # Check if package already exists
-            existing = [n for n in graph_data.nodes if getattr(n, 'id', None) == package_id]
-            
-            if not existing:
-                package_node = PackageNode(
+            if not graph_data.has_node(package_id):
+                package_node = PackageRecord(
                     id=package_id,
                     name=module_name.split('.')[0],
                     version="unknown",
@@ -249,10 +244,12 @@ class PythonParser(BaseLanguageParser):
             graph_data.add_relationship(Relationship(
                 source_id=file_node.id,
                 target_id=package_id,
+                source_label=FileRecord.label,
+                target_label=PackageRecord.label,
                 type=RelationshipType.IMPORTS
             ))
     
-    def _extract_variables(self, root_node: Node, content: str, file_node: FileNode, 
+    def _extract_variables(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord, 
                           graph_data: GraphData, repo_context: dict):
         """Extract top-level variable assignments"""
         for child in root_node.children:
@@ -262,7 +259,7 @@ class PythonParser(BaseLanguageParser):
                 if assignment and assignment.type == "assignment":
                     left = assignment.child_by_field_name("left")
                     if left and left.type == "identifier":
-                        var_name = self._get_node_text(left, content)
+                        var_name = self._get_node_text(left, source)
                         start_line = self._get_line_number(child)
                         
                         var_id = self._generate_id(
@@ -273,7 +270,7 @@ class PythonParser(BaseLanguageParser):
                             str(start_line)
                         )
                         
-                        var_node = VariableNode(
+                        var_node = VariableRecord(
                             id=var_id,
                             name=var_name,
                             kind="global",
@@ -285,22 +282,17 @@ class PythonParser(BaseLanguageParser):
                         
                         graph_data.add_node(var_node)
     
-    def _extract_docs(self, root_node: Node, content: str, file_node: FileNode, 
+    def _extract_docs(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord, 
                      graph_data: GraphData, repo_context: dict):
         """Extract Python docstrings and comments"""
-        query = Query(self.language, """
-            [
-                (expression_statement (string) @docstring)
-                (comment) @comment
-            ]
-        """)
-        
-        cursor = QueryCursor(query)
-        captures_dict = cursor.captures(root_node)
-        captures = [(node, name) for name, nodes in captures_dict.items() for node in nodes]
+        doc_captures = [
+            (node, capture_name)
+            for capture_name in ("docstring", "comment")
+            for node in captures.get(capture_name, [])
+        ]
         
-        for node, capture_name in captures:
-            doc_text = self._get_node_text(node, content)
+        for node, capture_name in doc_captures:
+            doc_text = self._get_node_text(node, source)
             start_line = self._get_line_number(node)
             
             doc_type = DocType.DOCSTRING if capture_name == "docstring" else DocType.COMMENT
@@ -312,7 +304,7 @@ class PythonParser(BaseLanguageParser):
                 str(start_line)
             )
             
-            doc_node = DocNode(
+            doc_node = DocRecord(
                 id=doc_id,
                 type=doc_type,
                 text=doc_text.strip(),
@@ -327,39 +319,33 @@ class PythonParser(BaseLanguageParser):
             graph_data.add_relationship(Relationship(
                 source_id=file_node.id,
                 target_id=doc_id,
+                source_label=FileRecord.label,
+                target_label=DocRecord.label,
                 type=RelationshipType.HAS_DOC
             ))
     
-    def _extract_tests(self, root_node: Node, content: str, file_node: FileNode, 
+    def _extract_tests(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord, 
                       graph_data: GraphData, repo_context: dict):
         """Extract Python test functions (pytest, unittest)"""
         from packages.parser.utils.file_utils import is_test_file
-        from pathlib import Path
         
         # Only extract tests if this is a test file
         if not is_test_file(Path(file_node.path)):
             return
         
         # Look for test functions (test_*, Test* classes)
-        query = Query(self.language, """
-            [
-                (function_definition
-                    name: (identifier) @test.name) @test.func
-                (class_definition
-                    name: (identifier) @test.class) @test.cls
-            ]
-        """)
+        test_captures = [
+            (node, capture_name)
+            for capture_name in ("function.def", "class.def")
+            for node in captures.get(capture_name, [])
+        ]
         
-        cursor = QueryCursor(query)
-        captures_dict = cursor.captures(root_node)
-        captures = [(node, name) for name, nodes in captures_dict.items() for node in nodes]
-        
-        for node, capture_name in captures:
+        for node, capture_name in test_captures:
             name_node = node.child_by_field_name("name")
             if not name_node:
                 continue
             
-            name = self._get_node_text(name_node, content)
+            name = self._get_node_text(name_node, source)
             
             # Check if it's a test (starts with 'test' or 'Test')
             if not (name.startswith('test_') or name.startswith('Test')):
@@ -368,7 +354,7 @@ class PythonParser(BaseLanguageParser):
             start_line = self._get_line_number(node)
             
             # Determine test kind
-            if capture_name in ["test.func", "test.name"]:
+            if capture_name == "function.def":
                 kind = "unit"  # Function-based test
             else:
                 kind = "class"  # Class-based test
@@ -380,7 +366,7 @@ class PythonParser(BaseLanguageParser):
                 name
             )
             
-            test_node = TestNode(
+            test_node = TestRecord(
                 id=test_id,
                 name=name,
                 kind=kind,
@@ -395,60 +381,7 @@ class PythonParser(BaseLanguageParser):
             graph_data.add_relationship(Relationship(
                 source_id=file_node.id,
                 target_id=test_id,
+                source_label=FileRecord.label,
+                target_label=TestRecord.label,
                 type=RelationshipType.HAS_TEST
             ))
-    
-    def _extract_commits(self, file_path: Path, file_node: FileNode, 
-                        graph_data: GraphData, repo_context: dict):
-        """Extract commit information for the file"""
-        from packages.parser.utils.git_commit_utils import get_last_commit_for_file
-        from datetime import datetime
-        
-        # Get repo path from context
-        repo_path_str = repo_context.get("path")
-        if not repo_path_str:
-            return
-        
-        repo_path = Path(repo_path_str)
-        
-        # Get last commit
-        commit_info = get_last_commit_for_file(repo_path, file_path)
-        
-        if not commit_info:
-            return
-        
-        # Create CommitNode
-        commit_id = self._generate_id(
-            repo_context["name"],
-            "commit",
-            commit_info['hash']
-        )
-        
-        # Parse date
-        try:
-            commit_date = datetime.fromisoformat(commit_info['date'].replace('Z', '+00:00'))
-        except:
-            commit_date = datetime.utcnow()
-        
-        commit_node = CommitNode(
-            id=commit_id,
-            hash=commit_info['hash'],
-            author=commit_info['author'],
-            email=commit_info['email'],
-            date=commit_date,
-            message=commit_info['message'],
-            repo_sha=repo_context.get("sha"),
-        )
-        
-        # Check if commit already exists
-        existing = [n for n in graph_data.nodes if getattr(n, 'id', None) == commit_id]
-        
-        if not existing:
-            graph_data.add_node(commit_node)
-        
-        # Create relationship: Commit TOUCHED File
-        graph_data.add_relationship(Relationship(
-            source_id=commit_id,
-            target_id=file_node.id,
-            type=RelationshipType.TOUCHED
-        ))
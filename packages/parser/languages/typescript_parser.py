@@ -1,14 +1,15 @@
-from tree_sitter import Language, Node, Query, QueryCursor
+from tree_sitter import Node
 from pathlib import Path
-import hashlib
 
 from packages.parser.core import BaseLanguageParser
+from packages.parser.core.base_parser import Captures
+from packages.parser.core.source_buffer import SourceBuffer
 from packages.parser.models import (
-    FileNode,
-    ClassNode,
-    FunctionNode,
-    VariableNode,
-    PackageNode,
+    FileRecord,
+    ClassRecord,
+    FunctionRecord,
+    VariableRecord,
+    PackageRecord,
     GraphData,
     Relationship,
     RelationshipType,
@@ -26,11 +27,27 @@ class TypeScriptParser(BaseLanguageParser):
     def file_extensions(self) -> list[str]:
         return [".ts", ".tsx"]
     
-    def _create_file_node(self, file_path: Path, content: str, repo_context: dict) -> FileNode:
-        lines = len(content.split('\n'))
-        sha = hashlib.sha256(content.encode()).hexdigest()
+    @property
+    def query_source(self) -> str:
+        return """
+            (class_declaration
+                name: (type_identifier)
+                body: (class_body)) @class.def
+            (function_declaration
+                name: (identifier)
+                parameters: (formal_parameters)) @function.def
+            (import_statement
+                source: (string) @import.source)
+            (variable_declaration
+                (variable_declarator
+                    name: (identifier) @variable.name))
+        """
+    
+    def _create_file_node(self, file_path: Path, source: SourceBuffer, repo_context: dict) -> FileRecord:
+        lines = source.line_count
+        sha = source.sha256()
         
-        return FileNode(
+        return FileRecord(
             id=self._generate_id(repo_context["name"], str(file_path), "file"),
             path=str(file_path),
             language=self.language_name,
@@ -41,59 +58,50 @@ class TypeScriptParser(BaseLanguageParser):
             commit_hash=repo_context.get("commit_hash"),
         )
     
-    def _extract_classes(self, root_node: Node, content: str, file_node: FileNode, 
+    def _extract_classes(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord, 
                         graph_data: GraphData, repo_context: dict):
         """Extract TypeScript class definitions"""
         # TypeScript classes are similar to JS but can have decorators, implements, etc.
-        query = Query(self.language, """
-            (class_declaration
-                name: (type_identifier) @class.name
-                body: (class_body) @class.body) @class.def
-        """)
-        
-        cursor = QueryCursor(query)
-        captures_dict = cursor.captures(root_node)
-        captures = [(node, name) for name, nodes in captures_dict.items() for node in nodes]
-        
-        for node, capture_name in captures:
-            if capture_name == "class.def":
-                class_name_node = node.child_by_field_name("name")
-                if class_name_node:
-                    class_name = self._get_node_text(class_name_node, content)
-                    start_line = self._get_line_number(node)
-                    end_line = node.end_point[0] + 1
-                    
-                    class_id = self._generate_id(
-                        repo_context["name"],
-                        str(file_node.path),
-                        "class",
-                        class_name
-                    )
-                    
-                    class_node = ClassNode(
-                        id=class_id,
-                        name=class_name,
-                        start_line=start_line,
-                        end_line=end_line,
-                        source_path=file_node.path,
-                        repo_sha=repo_context.get("sha"),
-                        commit_hash=repo_context.get("commit_hash"),
-                        snippet=self._get_snippet(content, start_line, end_line),
-                    )
-                    
-                    graph_data.add_node(class_node)
-                    
-                    graph_data.add_relationship(Relationship(
-                        source_id=file_node.id,
-                        target_id=class_id,
-                        type=RelationshipType.CONTAINS_CLASS
-                    ))
-                    
-                    # Extract methods
-                    self._extract_methods(node, content, file_node, class_node, graph_data, repo_context)
+        for node in captures.get("class.def", []):
+            class_name_node = node.child_by_field_name("name")
+            if class_name_node:
+                class_name = self._get_node_text(class_name_node, source)
+                start_line = self._get_line_number(node)
+                end_line = node.end_point[0] + 1
+                
+                class_id = self._generate_id(
+                    repo_context["name"],
+                    str(file_node.path),
+                    "class",
+                    class_name
+                )
+                
+                class_node = ClassRecord(
+                    id=class_id,
+                    name=class_name,
+                    start_line=start_line,
+                    end_line=end_line,
+                    source_path=file_node.path,
+                    repo_sha=repo_context.get("sha"),
+                    commit_hash=repo_context.get("commit_hash"),
+                    snippet=self._get_snippet(source, start_line, end_line),
+                )
+                
+                graph_data.add_node(class_node)
+                
+                graph_data.add_relationship(Relationship(
+                    source_id=file_node.id,
+                    target_id=class_id,
+                    source_label=FileRecord.label,
+                    target_label=ClassRecord.label,
+                    type=RelationshipType.CONTAINS_CLASS
+                ))
+                
+                # Extract methods
+                self._extract_methods(node, source, file_node, class_node, graph_data, repo_context)
     
-    def _extract_methods(self, class_node: Node, content: str, file_node: FileNode,
-                        class_obj: ClassNode, graph_data: GraphData, repo_context: dict):
+    def _extract_methods(self, class_node: Node, source: SourceBuffer, file_node: FileRecord,
+                        class_obj: ClassRecord, graph_data: GraphData, repo_context: dict):
         """Extract methods from a TypeScript class"""
         body = class_node.child_by_field_name("body")
         if not body:
@@ -105,8 +113,8 @@ class TypeScriptParser(BaseLanguageParser):
                 params_node = child.child_by_field_name("parameters")
                 
                 if name_node and params_node:
-                    method_name = self._get_node_text(name_node, content)
-                    params = self._get_node_text(params_node, content)
+                    method_name = self._get_node_text(name_node, source)
+                    params = self._get_node_text(params_node, source)
                     signature = f"{method_name}{params}"
                     
                     start_line = self._get_line_number(child)
@@ -120,7 +128,7 @@ class TypeScriptParser(BaseLanguageParser):
                         method_name
                     )
                     
-                    method_node = FunctionNode(
+                    method_node = FunctionRecord(
                         id=method_id,
                         name=method_name,
                         signature=signature,
@@ -130,7 +138,7 @@ class TypeScriptParser(BaseLanguageParser):
                         source_path=file_node.path,
                         repo_sha=repo_context.get("sha"),
                         commit_hash=repo_context.get("commit_hash"),
-                        snippet=self._get_snippet(content, start_line, end_line),
+                        snippet=self._get_snippet(source, start_line, end_line),
                     )
                     
                     graph_data.add_node(method_node)
@@ -138,167 +146,136 @@ class TypeScriptParser(BaseLanguageParser):
                     graph_data.add_relationship(Relationship(
                         source_id=class_obj.id,
                         target_id=method_id,
+                        source_label=ClassRecord.label,
+                        target_label=FunctionRecord.label,
                         type=RelationshipType.HAS_METHOD
                     ))
                     
                     graph_data.add_relationship(Relationship(
                         source_id=method_id,
                         target_id=file_node.id,
+                        source_label=FunctionRecord.label,
+                        target_label=FileRecord.label,
                         type=RelationshipType.DEFINED_IN
                     ))
     
-    def _extract_functions(self, root_node: Node, content: str, file_node: FileNode,
+    def _extract_functions(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord,
                           graph_data: GraphData, repo_context: dict):
         """Extract top-level TypeScript functions"""
-        query = Query(self.language, """
-            [
-                (function_declaration
-                    name: (identifier) @func.name
-                    parameters: (formal_parameters) @func.params) @func.def
-                (variable_declarator
-                    name: (identifier) @arrow.name
-                    value: (arrow_function) @arrow.func)
-            ]
-        """)
-        
-        cursor = QueryCursor(query)
-        captures_dict = cursor.captures(root_node)
-        captures = [(node, name) for name, nodes in captures_dict.items() for node in nodes]
         processed_funcs = set()
         
-        for node, capture_name in captures:
-            if capture_name == "func.def":
-                name_node = node.child_by_field_name("name")
-                params_node = node.child_by_field_name("parameters")
+        for node in captures.get("function.def", []):
+            name_node = node.child_by_field_name("name")
+            params_node = node.child_by_field_name("parameters")
+            
+            if name_node and params_node:
+                func_name = self._get_node_text(name_node, source)
                 
-                if name_node and params_node:
-                    func_name = self._get_node_text(name_node, content)
-                    
-                    if func_name in processed_funcs:
-                        continue
-                    processed_funcs.add(func_name)
-                    
-                    params = self._get_node_text(params_node, content)
-                    signature = f"{func_name}{params}"
-                    
-                    start_line = self._get_line_number(node)
-                    end_line = node.end_point[0] + 1
-                    
-                    func_id = self._generate_id(
-                        repo_context["name"],
-                        str(file_node.path),
-                        "function",
-                        func_name
-                    )
-                    
-                    func_node = FunctionNode(
-                        id=func_id,
-                        name=func_name,
-                        signature=signature,
-                        start_line=start_line,
-                        end_line=end_line,
-                        is_method=False,
-                        source_path=file_node.path,
-                        repo_sha=repo_context.get("sha"),
-                        commit_hash=repo_context.get("commit_hash"),
-                        snippet=self._get_snippet(content, start_line, end_line),
-                    )
-                    
-                    graph_data.add_node(func_node)
-                    
-                    graph_data.add_relationship(Relationship(
-                        source_id=file_node.id,
-                        target_id=func_id,
-                        type=RelationshipType.CONTAINS_FUNCTION
-                    ))
-                    
-                    graph_data.add_relationship(Relationship(
-                        source_id=func_id,
-                        target_id=file_node.id,
-                        type=RelationshipType.DEFINED_IN
-                    ))
-    
-    def _extract_imports(self, root_node: Node, content: str, file_node: FileNode,
-                        graph_data: GraphData, repo_context: dict):
-        """Extract TypeScript import statements"""
-        query = Query(self.language, """
-            [
-                (import_statement
-                    source: (string) @import.source)
-            ]
-        """)
-        
-        cursor = QueryCursor(query)
-        captures_dict = cursor.captures(root_node)
-        captures = [(node, name) for name, nodes in captures_dict.items() for node in nodes]
-        
-        for node, capture_name in captures:
-            if capture_name == "import.source":
-                import_path = self._get_node_text(node, content).strip('"').strip("'")
-                
-                # Extract package name (handle @scoped packages)
-                if import_path.startswith('@'):
-                    parts = import_path.split('/')
-                    package_name = '/'.join(parts[:2]) if len(parts) >= 2 else import_path
-                elif import_path.startswith('.'):
-                    # Relative import - skip for now or handle differently
+                if func_name in processed_funcs:
                     continue
-                else:
-                    package_name = import_path.split('/')[0]
-                
-                package_id = self._generate_id("package", package_name)
-                
-                # Check if package already exists
-                existing = [n for n in graph_data.nodes if getattr(n, 'id', None) == package_id]
+                processed_funcs.add(func_name)
                 
-                if not existing:
-                    package_node = PackageNode(
-                        id=package_id,
-                        name=package_name,
-                        version="unknown",
-                    )
-                    graph_data.add_node(package_node)
+                params = self._get_node_text(params_node, source)
+                signature = f"{func_name}{params}"
                 
-                graph_data.add_relationship(Relationship(
-                    source_id=file_node.id,
-                    target_id=package_id,
-                    type=RelationshipType.IMPORTS
-                ))
-    
-    def _extract_variables(self, root_node: Node, content: str, file_node: FileNode,
-                          graph_data: GraphData, repo_context: dict):
-        """Extract top-level variable declarations"""
-        query = Query(self.language, """
-            (variable_declaration
-                (variable_declarator
-                    name: (identifier) @var.name)) @var.decl
-        """)
-        
-        cursor = QueryCursor(query)
-        captures_dict = cursor.captures(root_node)
-        captures = [(node, name) for name, nodes in captures_dict.items() for node in nodes]
-        
-        for node, capture_name in captures:
-            if capture_name == "var.name":
-                var_name = self._get_node_text(node, content)
                 start_line = self._get_line_number(node)
+                end_line = node.end_point[0] + 1
                 
-                var_id = self._generate_id(
+                func_id = self._generate_id(
                     repo_context["name"],
                     str(file_node.path),
-                    "variable",
-                    var_name,
-                    str(start_line)
+                    "function",
+                    func_name
                 )
                 
-                var_node = VariableNode(
-                    id=var_id,
-                    name=var_name,
-                    kind="global",
+                func_node = FunctionRecord(
+                    id=func_id,
+                    name=func_name,
+                    signature=signature,
                     start_line=start_line,
+                    end_line=end_line,
+                    is_method=False,
                     source_path=file_node.path,
                     repo_sha=repo_context.get("sha"),
                     commit_hash=repo_context.get("commit_hash"),
+                    snippet=self._get_snippet(source, start_line, end_line),
                 )
                 
-                graph_data.add_node(var_node)
+                graph_data.add_node(func_node)
+                
+                graph_data.add_relationship(Relationship(
+                    source_id=file_node.id,
+                    target_id=func_id,
+                    source_label=FileRecord.label,
+                    target_label=FunctionRecord.label,
+                    type=RelationshipType.CONTAINS_FUNCTION
+                ))
+                
+                graph_data.add_relationship(Relationship(
+                    source_id=func_id,
+                    target_id=file_node.id,
+                    source_label=FunctionRecord.label,
+                    target_label=FileRecord.label,
+                    type=RelationshipType.DEFINED_IN
+                ))
+    
+    def _extract_imports(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord,
+                        graph_data: GraphData, repo_context: dict):
+        """Extract TypeScript import statements"""
+        for node in captures.get("import.source", []):
+            import_path = self._get_node_text(node, source).strip('"').strip("'")
+            
+            # Extract package name (handle @scoped packages)
+            if import_path.startswith('@'):
+                parts = import_path.split('/')
+                package_name = '/'.join(parts[:2]) if len(parts) >= 2 else import_path
+            elif import_path.startswith('.'):
+                # Relative import - skip for now or handle differently
+                continue
+            else:
+                package_name = import_path.split('/')[0]
+            
+            package_id = self._generate_id("package", package_name)
+            
+            if not graph_data.has_node(package_id):
+                package_node = PackageRecord(
+                    id=package_id,
+                    name=package_name,
+                    version="unknown",
+                )
+                graph_data.add_node(package_node)
+            
+            graph_data.add_relationship(Relationship(
+                source_id=file_node.id,
+                target_id=package_id,
+                source_label=FileRecord.label,
+                target_label=PackageRecord.label,
+                type=RelationshipType.IMPORTS
+            ))
+    
+    def _extract_variables(self, root_node: Node, captures: Captures, source: SourceBuffer, file_node: FileRecord,
+                          graph_data: GraphData, repo_context: dict):
+        """Extract top-level variable declarations"""
+        for node in captures.get("variable.name", []):
+            var_name = self._get_node_text(node, source)
+            start_line = self._get_line_number(node)
+            
+            var_id = self._generate_id(
+                repo_context["name"],
+                str(file_node.path),
+                "variable",
+                var_name,
+                str(start_line)
+            )
+            
+            var_node = VariableRecord(
+                id=var_id,
+                name=var_name,
+                kind="global",
+                start_line=start_line,
+                source_path=file_node.path,
+                repo_sha=repo_context.get("sha"),
+                commit_hash=repo_context.get("commit_hash"),
+            )
+            
+            graph_data.add_node(var_node)
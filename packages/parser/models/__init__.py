@@ -12,6 +12,21 @@ from .nodes import (
     PullRequestNode,
     PackageNode,
 )
+from .records import (
+    NodeRecord,
+    RepoRecord,
+    FileRecord,
+    CommitRecord,
+    ModuleRecord,
+    ClassRecord,
+    FunctionRecord,
+    VariableRecord,
+    TestRecord,
+    DocRecord,
+    IssueRecord,
+    PullRequestRecord,
+    PackageRecord,
+)
 from .relationships import (
     Relationship,
     RelationshipType,
@@ -31,6 +46,19 @@ __all__ = [
     "IssueNode",
     "PullRequestNode",
     "PackageNode",
+    "NodeRecord",
+    "RepoRecord",
+    "FileRecord",
+    "CommitRecord",
+    "ModuleRecord",
+    "ClassRecord",
+    "FunctionRecord",
+    "VariableRecord",
+    "TestRecord",
+    "DocRecord",
+    "IssueRecord",
+    "PullRequestRecord",
+    "PackageRecord",
     "Relationship",
     "RelationshipType",
     "GraphData",
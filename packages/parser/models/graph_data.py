@@ -1,47 +1,104 @@
 from pydantic import BaseModel, Field
-from typing import Union
-from .nodes import (
-    RepoNode,
-    FileNode,
-    CommitNode,
-    ModuleNode,
-    ClassNode,
-    FunctionNode,
-    VariableNode,
-    TestNode,
-    DocNode,
-    IssueNode,
-    PackageNode,
-)
-from .relationships import Relationship
+from typing import Any, Optional, Union
+from .nodes import BaseNode
+from .records import NodeRecord, RECORD_TYPES, to_record
+from .relationships import Relationship, RelationshipType
 
-NodeUnion = Union[
-    RepoNode,
-    FileNode,
-    CommitNode,
-    ModuleNode,
-    ClassNode,
-    FunctionNode,
-    VariableNode,
-    TestNode,
-    DocNode,
-    IssueNode,
-    PackageNode,
-]
+RelationshipKey = tuple[str, str, RelationshipType]
 
 
 class GraphData(BaseModel):
-    """Container for parsed graph data"""
-    nodes: list[NodeUnion] = Field(default_factory=list)
+    """
+    Container for parsed graph data
+    
+    Nodes are de-duplicated by id (the first node added with an id wins) and
+    relationships by (source_id, target_id, type), both in O(1). `nodes` and
+    `relationships` remain plain lists in insertion order for iteration.
+    
+    Nodes are stored as compact records (see records.py). add_node also
+    accepts pydantic node models and converts them; to_models() converts
+    the other way for callers that need the models.
+    
+    `invalidated_ids` is filled by incremental reparses with the ids of
+    symbols whose source was edited, so their embeddings can be recomputed
+    while unchanged symbols keep theirs.
+    
+    `degraded_files` maps the path of each file that was only recorded as a
+    File node (too large, minified, generated or over its parse budget) to
+    the reason, for the analysis summary.
+    """
+    # Records are not validated, so the field is typed loosely
+    nodes: list[Any] = Field(default_factory=list)
     relationships: list[Relationship] = Field(default_factory=list)
     
-    def add_node(self, node: NodeUnion):
+    # Indexes are plain excluded fields rather than PrivateAttr: private
+    # attribute access goes through __getattr__ and dominates add_node cost
+    nodes_by_id: dict[str, Any] = Field(default_factory=dict, exclude=True, repr=False)
+    nodes_by_type: dict[type, list[Any]] = Field(default_factory=dict, exclude=True, repr=False)
+    relationship_keys: set[RelationshipKey] = Field(default_factory=set, exclude=True, repr=False)
+    invalidated_ids: set[str] = Field(default_factory=set, exclude=True, repr=False)
+    degraded_files: dict[str, str] = Field(default_factory=dict, exclude=True, repr=False)
+    
+    def model_post_init(self, __context: Any):
+        # Route constructor-supplied lists through the indexes
+        nodes, relationships = self.nodes, self.relationships
+        self.nodes, self.relationships = [], []
+        self.nodes_by_id, self.nodes_by_type, self.relationship_keys = {}, {}, set()
+        for node in nodes:
+            self.add_node(node)
+        for rel in relationships:
+            self.add_relationship(rel)
+    
+    def add_node(self, node: Union[NodeRecord, BaseNode]) -> bool:
+        """Add a node unless one with the same id exists. Returns True if added."""
+        if node.id in self.nodes_by_id:
+            return False
+        if isinstance(node, BaseNode):
+            node = to_record(node)
+        self.nodes_by_id[node.id] = node
+        self.nodes_by_type.setdefault(type(node), []).append(node)
         self.nodes.append(node)
+        return True
+    
+    def add_relationship(self, rel: Relationship) -> bool:
+        """Add a relationship unless an equal one exists. Returns True if added."""
+        key = (rel.source_id, rel.target_id, rel.type)
+        if key in self.relationship_keys:
+            return False
+        self.relationship_keys.add(key)
+        self.relationships.append(rel)
+        return True
+    
+    def merge(self, other: "GraphData"):
+        """Add all nodes and relationships of another GraphData"""
+        for node in other.nodes:
+            self.add_node(node)
+        for rel in other.relationships:
+            self.add_relationship(rel)
+        self.invalidated_ids |= other.invalidated_ids
+        self.degraded_files.update(other.degraded_files)
+    
+    def get_node(self, node_id: str) -> Optional[NodeRecord]:
+        return self.nodes_by_id.get(node_id)
+    
+    def has_node(self, node_id: str) -> bool:
+        return node_id in self.nodes_by_id
+    
+    def has_relationship(self, rel: Relationship) -> bool:
+        return (rel.source_id, rel.target_id, rel.type) in self.relationship_keys
     
-    def add_relationship(self, rel: Relationship):
-        # Avoid duplicates
-        if rel not in self.relationships:
-            self.relationships.append(rel)
+    def get_nodes_by_type(self, node_type: type) -> list[NodeRecord]:
+        """Return the nodes of a record type, or of the record type of a node model"""
+        node_type = RECORD_TYPES.get(node_type, node_type)
+        if node_type is NodeRecord:
+            return list(self.nodes)
+        return [
+            node
+            for indexed_type, nodes in self.nodes_by_type.items()
+            if issubclass(indexed_type, node_type)
+            for node in nodes
+        ]
     
-    def get_nodes_by_type(self, node_type: type):
-        return [n for n in self.nodes if isinstance(n, node_type)]
+    def to_models(self) -> list[BaseNode]:
+        """Return all nodes as pydantic node models, in insertion order"""
+        return [node.to_model() for node in self.nodes]
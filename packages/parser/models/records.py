@@ -0,0 +1,259 @@
+"""
+Compact in-memory representation of parsed nodes
+
+Parsers and GraphData hold nodes as slotted dataclass records instead of
+pydantic models: no per-instance __dict__, no validation on construction,
+no fields-set bookkeeping and no created_at/updated_at datetimes. Strings
+that repeat across many nodes (provenance, names, kinds) are interned so a
+large parse result stores each of them once.
+
+Records convert to the pydantic node models of nodes.py with to_model()
+at API boundaries, and back with to_record().
+"""
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from sys import intern
+from typing import Any, ClassVar, Optional
+
+from .nodes import (
+    BaseNode,
+    RepoNode,
+    FileNode,
+    CommitNode,
+    ModuleNode,
+    ClassNode,
+    FunctionNode,
+    VariableNode,
+    TestNode,
+    DocNode,
+    DocType,
+    IssueNode,
+    PullRequestNode,
+    PackageNode,
+)
+
+
+@dataclass(slots=True, kw_only=True)
+class NodeRecord:
+    """Base record with the provenance properties shared by all nodes"""
+    
+    # Graph label and the pydantic model the record converts to
+    label: ClassVar[str] = ""
+    model: ClassVar[type[BaseNode]] = BaseNode
+    # Fields whose values repeat across nodes and are interned
+    interned: ClassVar[tuple[str, ...]] = ()
+    
+    id: str
+    source_path: Optional[str] = None
+    repo_sha: Optional[str] = None
+    commit_hash: Optional[str] = None
+    snippet: Optional[str] = None
+    hash_id: Optional[str] = None
+    embedding_id: Optional[str] = None
+    
+    def __post_init__(self):
+        for name in self.interned:
+            value = getattr(self, name)
+            if value is not None:
+                setattr(self, name, intern(value))
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Field values by name, in declaration order"""
+        return {name: getattr(self, name) for name in _field_names(type(self))}
+    
+    def to_model(self) -> BaseNode:
+        """Convert to the pydantic node model (with fresh timestamps)"""
+        return self.model(**self.to_dict())
+
+
+_PROVENANCE = ("source_path", "repo_sha", "commit_hash")
+
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+def _field_names(record_type: type) -> tuple[str, ...]:
+    names = _FIELD_NAMES.get(record_type)
+    if names is None:
+        names = _FIELD_NAMES[record_type] = tuple(f.name for f in fields(record_type))
+    return names
+
+
+@dataclass(slots=True, kw_only=True)
+class RepoRecord(NodeRecord):
+    label: ClassVar[str] = "Repo"
+    model: ClassVar[type[BaseNode]] = RepoNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE
+    
+    name: str
+    url: str
+    default_branch: str
+
+
+@dataclass(slots=True, kw_only=True)
+class FileRecord(NodeRecord):
+    label: ClassVar[str] = "File"
+    model: ClassVar[type[BaseNode]] = FileNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("path", "language")
+    
+    path: str
+    language: str
+    sha: str
+    lines: int
+
+
+@dataclass(slots=True, kw_only=True)
+class CommitRecord(NodeRecord):
+    label: ClassVar[str] = "Commit"
+    model: ClassVar[type[BaseNode]] = CommitNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("author", "email")
+    
+    hash: str
+    author: str
+    email: str
+    date: datetime
+    message: str
+
+
+@dataclass(slots=True, kw_only=True)
+class ModuleRecord(NodeRecord):
+    label: ClassVar[str] = "Module"
+    model: ClassVar[type[BaseNode]] = ModuleNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("name", "package")
+    
+    name: str
+    package: Optional[str] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class ClassRecord(NodeRecord):
+    label: ClassVar[str] = "Class"
+    model: ClassVar[type[BaseNode]] = ClassNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("name", "visibility")
+    
+    name: str
+    visibility: Optional[str] = None
+    start_line: int
+    end_line: int
+
+
+@dataclass(slots=True, kw_only=True)
+class FunctionRecord(NodeRecord):
+    label: ClassVar[str] = "Function"
+    model: ClassVar[type[BaseNode]] = FunctionNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("name",)
+    
+    name: str
+    signature: str
+    start_line: int
+    end_line: int
+    is_method: bool = False
+
+
+@dataclass(slots=True, kw_only=True)
+class VariableRecord(NodeRecord):
+    label: ClassVar[str] = "Variable"
+    model: ClassVar[type[BaseNode]] = VariableNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("name", "kind")
+    
+    name: str
+    kind: str
+    start_line: int
+
+
+@dataclass(slots=True, kw_only=True)
+class TestRecord(NodeRecord):
+    label: ClassVar[str] = "Test"
+    model: ClassVar[type[BaseNode]] = TestNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("name", "kind")
+    
+    name: str
+    kind: str
+
+
+@dataclass(slots=True, kw_only=True)
+class DocRecord(NodeRecord):
+    label: ClassVar[str] = "Doc"
+    model: ClassVar[type[BaseNode]] = DocNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE
+    
+    type: DocType
+    text: str
+    start_line: Optional[int] = None
+    
+    def __post_init__(self):
+        NodeRecord.__post_init__(self)
+        # Records loaded from JSON carry the plain value
+        self.type = DocType(self.type)
+
+
+@dataclass(slots=True, kw_only=True)
+class IssueRecord(NodeRecord):
+    label: ClassVar[str] = "Issue"
+    model: ClassVar[type[BaseNode]] = IssueNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("state",)
+    
+    title: str
+    body: str
+    labels: list[str] = field(default_factory=list)
+    state: str
+
+
+@dataclass(slots=True, kw_only=True)
+class PullRequestRecord(NodeRecord):
+    label: ClassVar[str] = "PullRequest"
+    model: ClassVar[type[BaseNode]] = PullRequestNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("author", "repo_url", "state", "base_branch", "head_branch")
+    
+    pr_number: int
+    title: str
+    body: str
+    author: str
+    repo_url: str
+    state: str
+    merged: bool = False
+    merged_at: Optional[datetime] = None
+    base_branch: Optional[str] = None
+    head_branch: Optional[str] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class PackageRecord(NodeRecord):
+    label: ClassVar[str] = "Package"
+    model: ClassVar[type[BaseNode]] = PackageNode
+    interned: ClassVar[tuple[str, ...]] = _PROVENANCE + ("name", "version")
+    
+    name: str
+    version: str
+
+
+# Record class of every node model, and of every graph label
+RECORD_TYPES: dict[type[BaseNode], type[NodeRecord]] = {
+    record_type.model: record_type
+    for record_type in (
+        RepoRecord,
+        FileRecord,
+        CommitRecord,
+        ModuleRecord,
+        ClassRecord,
+        FunctionRecord,
+        VariableRecord,
+        TestRecord,
+        DocRecord,
+        IssueRecord,
+        PullRequestRecord,
+        PackageRecord,
+    )
+}
+RECORD_TYPES[BaseNode] = NodeRecord
+
+RECORDS_BY_LABEL: dict[str, type[NodeRecord]] = {
+    record_type.label: record_type for record_type in RECORD_TYPES.values() if record_type.label
+}
+
+
+def to_record(node: BaseNode) -> NodeRecord:
+    """Convert a pydantic node model to its record"""
+    record_type = RECORD_TYPES[type(node)]
+    return record_type(**{
+        name: getattr(node, name) for name in _field_names(record_type)
+    })
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Any, Optional
 from enum import Enum
 
@@ -24,8 +24,13 @@ class Relationship(BaseModel):
     """Represents a relationship between two nodes"""
     source_id: str
     target_id: str
+    # Graph labels of the endpoints, so writers can match them through
+    # their label's id constraint instead of scanning all nodes
+    source_label: str
+    target_label: str
     type: RelationshipType
-    properties: dict[str, Any] = {}
+    # default_factory avoids pydantic deep-copying a mutable default per instance
+    properties: dict[str, Any] = Field(default_factory=dict)
     
     def __hash__(self):
         return hash((self.source_id, self.target_id, self.type))
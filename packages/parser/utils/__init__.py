@@ -3,10 +3,13 @@ from .file_utils import (
     detect_language,
     is_code_file,
     should_ignore_path,
+    walk_repository_files,
+    list_git_files,
     get_file_hash,
     get_relative_path,
 )
-from .language_config import language_registry
+from .ignore_utils import IgnoreMatcher
+from .language_config import LanguagePlugin, language_registry
 from .git_utils import (
     is_github_url,
     is_git_url,
@@ -20,8 +23,12 @@ __all__ = [
     "detect_language",
     "is_code_file",
     "should_ignore_path",
+    "walk_repository_files",
+    "list_git_files",
     "get_file_hash",
     "get_relative_path",
+    "IgnoreMatcher",
+    "LanguagePlugin",
     "language_registry",
     "is_github_url",
     "is_git_url",
@@ -1,7 +1,11 @@
 """Utility functions for the parser"""
 import mimetypes
+import os
+import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+from .ignore_utils import IgnoreMatcher
 
 
 # Language to file extension mapping
@@ -100,6 +104,56 @@ def is_readme_file(file_path: Path) -> bool:
     return name.startswith('readme')
 
 
+# Directory and file names that are never analyzed
+IGNORE_PATTERNS = frozenset({
+    # Version control
+    ".git",
+    ".svn",
+    ".hg",
+    
+    # Dependencies
+    "node_modules",
+    "vendor",
+    "venv",
+    ".venv",
+    "env",
+    ".env",
+    "__pycache__",
+    ".pytest_cache",
+    
+    # Build outputs
+    "dist",
+    "build",
+    "target",
+    "out",
+    ".next",
+    ".nuxt",
+    
+    # IDE
+    ".vscode",
+    ".idea",
+    ".eclipse",
+    
+    # Other
+    ".DS_Store",
+    "coverage",
+    ".coverage",
+})
+
+
+def is_ignored_name(name: str) -> bool:
+    """
+    Check if a single path component should be ignored (built-in patterns and dotfiles)
+    
+    Args:
+        name: File or directory name
+    
+    Returns:
+        True if the name should be ignored
+    """
+    return name in IGNORE_PATTERNS or name.startswith('.') and len(name) > 1
+
+
 def should_ignore_path(path: Path) -> bool:
     """
     Check if a path should be ignored during parsing
@@ -110,48 +164,118 @@ def should_ignore_path(path: Path) -> bool:
     Returns:
         True if the path should be ignored
     """
-    ignore_patterns = {
-        # Version control
-        ".git",
-        ".svn",
-        ".hg",
-        
-        # Dependencies
-        "node_modules",
-        "vendor",
-        "venv",
-        ".venv",
-        "env",
-        ".env",
-        "__pycache__",
-        ".pytest_cache",
-        
-        # Build outputs
-        "dist",
-        "build",
-        "target",
-        "out",
-        ".next",
-        ".nuxt",
+    # Check if any part of the path matches ignore patterns
+    return any(is_ignored_name(part) for part in path.parts)
+
+
+def walk_repository_files(repo_root: Path, use_ignore_files: bool = True) -> Iterator[Path]:
+    """
+    Walk a repository and yield its code files
+    
+    Uses os.scandir and prunes ignored directories (built-in patterns,
+    dot-directories and .gitignore/.secrinignore matches) before descending,
+    so trees like node_modules or .git are never listed. Symlinked
+    directories are not followed. Entries are visited in sorted order.
+    
+    Args:
+        repo_root: Path to the repository root
+        use_ignore_files: Honour .gitignore and .secrinignore files
+    
+    Yields:
+        Absolute paths of code files
+    """
+    root = str(repo_root)
+    matcher = IgnoreMatcher(root) if use_ignore_files else None
+    
+    # Stack of directories relative to the root ('' is the root itself)
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        abs_dir = f"{root}/{rel_dir}" if rel_dir else root
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"Warning: Could not list {abs_dir}: {e}")
+            continue
         
-        # IDE
-        ".vscode",
-        ".idea",
-        ".eclipse",
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if is_ignored_name(name):
+                continue
+            
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            
+            if is_dir:
+                if matcher is None or not matcher.is_ignored(rel_path, is_dir=True):
+                    subdirs.append(rel_path)
+                continue
+            
+            if EXTENSION_TO_LANGUAGE.get(os.path.splitext(name)[1].lower()) is None:
+                continue
+            if matcher is not None and matcher.is_ignored(rel_path):
+                continue
+            
+            yield Path(entry.path)
         
-        # Other
-        ".DS_Store",
-        "coverage",
-        ".coverage",
-    }
+        # Reversed so the stack pops subdirectories in sorted order
+        stack.extend(reversed(subdirs))
+
+
+def list_git_files(repo_root: Path) -> Optional[list[Path]]:
+    """
+    List the repository's code files from the git index
     
-    # Check if any part of the path matches ignore patterns
-    parts = path.parts
-    for part in parts:
-        if part in ignore_patterns or part.startswith('.') and len(part) > 1:
-            return True
+    Runs `git ls-files -z --cached --others --exclude-standard`, so tracked
+    and untracked-but-not-ignored files are returned without walking the
+    file system. .secrinignore files and the built-in ignore patterns are
+    applied on top of git's own exclusions.
+    
+    Args:
+        repo_root: Path to the repository root (or a subdirectory of a work tree)
+    
+    Returns:
+        Sorted absolute paths of code files, or None if git could not list the files
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard'],
+            cwd=repo_root,
+            capture_output=True,
+            timeout=300
+        )
+    except Exception as e:
+        print(f"Warning: git ls-files failed: {e}")
+        return None
+    
+    if result.returncode != 0:
+        return None
+    
+    matcher = IgnoreMatcher(repo_root, ignore_files=(".secrinignore",))
+    files = []
+    
+    for rel_path in sorted(set(result.stdout.decode('utf-8', errors='surrogateescape').split('\0'))):
+        if not rel_path:
+            continue
+        if EXTENSION_TO_LANGUAGE.get(os.path.splitext(rel_path)[1].lower()) is None:
+            continue
+        if any(is_ignored_name(part) for part in rel_path.split('/')):
+            continue
+        if matcher.is_path_excluded(rel_path):
+            continue
+        
+        # Skip index entries deleted from the work tree and submodule gitlinks
+        path = repo_root / rel_path
+        if not path.is_file():
+            continue
+        files.append(path)
     
-    return False
+    return files
 
 
 def get_file_hash(content: str) -> str:
@@ -2,7 +2,45 @@
 import subprocess
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import IO, Iterable, Iterator, NamedTuple, Optional, List, Dict
+import re
+
+
+class DiffHunk(NamedTuple):
+    """Line ranges of one zero-context diff hunk (1-indexed, as in '@@ -a,b +c,d @@')"""
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+
+
+_HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+def iter_nul_tokens(stream: IO[bytes]) -> Iterator[str]:
+    """
+    Stream the NUL terminated tokens of `git ... -z` output, decoded
+    
+    Newlines git puts between a commit header and its file entries are
+    stripped from the start of each token.
+    
+    Args:
+        stream: Binary output stream of the git process
+    
+    Yields:
+        Tokens in output order
+    """
+    buffer = b''
+    while True:
+        chunk = stream.read(1 << 16)
+        if not chunk:
+            break
+        buffer += chunk
+        *complete, buffer = buffer.split(b'\0')
+        for token in complete:
+            yield token.decode('utf-8', errors='replace').lstrip('\n')
+    if buffer:
+        yield buffer.decode('utf-8', errors='replace').lstrip('\n')
 
 
 def get_file_commits(repo_path: Path, file_path: Path, limit: int = 10) -> List[Dict]:
@@ -85,6 +123,193 @@ def get_last_commit_for_file(repo_path: Path, file_path: Path) -> Optional[Dict]
     return commits[0] if commits else None
 
 
+def get_last_commits(repo_path: Path, paths: Optional[Iterable[str | Path]] = None) -> Dict[str, Dict]:
+    """
+    Map every file to the last commit that touched it, in one git invocation
+    
+    Streams a single `git log --name-status -M` over the history instead of
+    starting one `git log -1 --follow` per file. Renames are detected, so a
+    file whose last change was a rename maps to the renaming commit, like
+    --follow would report. Paths are relative to repo_path, also when it is
+    a subdirectory of the git work tree.
+    
+    Args:
+        repo_path: Path to the repository root
+        paths: Optional relative paths of interest; only these are kept and
+            the log is abandoned as soon as all of them are resolved
+    
+    Returns:
+        Dictionary mapping POSIX relative paths to commit dictionaries with
+        hash, author, email, date, message (files never committed are absent)
+    """
+    wanted = {Path(p).as_posix() for p in paths} if paths is not None else None
+    last_commits: Dict[str, Dict] = {}
+    
+    if wanted is not None and not wanted:
+        return last_commits
+    
+    # Records: \x1e starts a commit header whose fields are split by \x1f;
+    # with -z every header, status and path token is NUL terminated
+    cmd = [
+        'git', 'log',
+        '--name-status', '-z', '-M', '--relative',
+        '--format=%x1e%H%x1f%an%x1f%ae%x1f%aI%x1f%s',
+    ]
+    
+    try:
+        process = subprocess.Popen(
+            cmd,
+            cwd=repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except Exception as e:
+        print(f"Warning: Could not read git history of {repo_path}: {e}")
+        return last_commits
+    
+    try:
+        commit = None
+        stream = iter_nul_tokens(process.stdout)
+        for token in stream:
+            if token.startswith('\x1e'):
+                parts = token[1:].split('\x1f', 4)
+                commit = {
+                    'hash': parts[0],
+                    'author': parts[1],
+                    'email': parts[2],
+                    'date': parts[3],
+                    'message': parts[4],
+                } if len(parts) == 5 else None
+                continue
+            
+            if not token:
+                continue
+            
+            # Renames and copies carry the source and the destination path; a
+            # rename touches both, a copy leaves its source unchanged
+            path = next(stream, None)
+            if token[0] == 'R':
+                touched = [path, next(stream, None)]
+            elif token[0] == 'C':
+                touched = [next(stream, None)]
+            else:
+                touched = [path]
+            
+            if commit is None:
+                continue
+            
+            for path in touched:
+                if path is None or path in last_commits:
+                    continue
+                if wanted is not None and path not in wanted:
+                    continue
+                # Log order is newest first, so the first commit seen for a path is its last
+                last_commits[path] = commit
+            
+            if wanted is not None and len(last_commits) == len(wanted):
+                break
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+    
+    return last_commits
+
+
+def get_diff_hunks(
+    repo_path: Path,
+    base_rev: str,
+    head_rev: str = "HEAD",
+    paths: Optional[Iterable[str | Path]] = None,
+) -> Dict[str, List[DiffHunk]]:
+    """
+    Get the changed line ranges of every file between two revisions
+    
+    Args:
+        repo_path: Path to the repository root
+        base_rev: Old revision
+        head_rev: New revision
+        paths: Optional relative paths to restrict the diff to
+    
+    Returns:
+        Dictionary mapping POSIX relative paths (as of head_rev) to their
+        hunks in file order; deleted files and binary changes are absent
+    """
+    cmd = [
+        'git', '-c', 'core.quotePath=false', 'diff',
+        '-U0', '--no-color', '--no-renames', '--no-ext-diff', '--relative',
+        base_rev, head_rev, '--',
+    ]
+    if paths is not None:
+        cmd.extend(Path(p).as_posix() for p in paths)
+    
+    try:
+        result = subprocess.run(
+            cmd,
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            errors='replace',
+            timeout=60
+        )
+    except Exception as e:
+        print(f"Warning: Could not diff {base_rev}..{head_rev}: {e}")
+        return {}
+    
+    if result.returncode != 0:
+        return {}
+    
+    hunks: Dict[str, List[DiffHunk]] = {}
+    current: Optional[List[DiffHunk]] = None
+    
+    for line in result.stdout.split('\n'):
+        if line.startswith('diff --git '):
+            current = None
+        elif line.startswith('+++ '):
+            target = line[4:]
+            if target.startswith('b/'):
+                current = hunks.setdefault(target[2:], [])
+        elif line.startswith('@@') and current is not None:
+            match = _HUNK_HEADER.match(line)
+            if match:
+                old_start, old_count, new_start, new_count = match.groups()
+                current.append(DiffHunk(
+                    int(old_start),
+                    int(old_count) if old_count is not None else 1,
+                    int(new_start),
+                    int(new_count) if new_count is not None else 1,
+                ))
+    
+    return hunks
+
+
+def get_file_at_revision(repo_path: Path, rev: str, file_path: str | Path) -> Optional[bytes]:
+    """
+    Get the raw content of a file at a given revision
+    
+    Args:
+        repo_path: Path to the repository root
+        rev: Revision (commit sha, branch, ...)
+        file_path: Path of the file relative to repo_path
+    
+    Returns:
+        File content, or None if the file does not exist at that revision
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'show', f'{rev}:./{Path(file_path).as_posix()}'],
+            cwd=repo_path,
+            capture_output=True,
+            timeout=30
+        )
+    except Exception as e:
+        print(f"Warning: Could not read {file_path} at {rev}: {e}")
+        return None
+    
+    return result.stdout if result.returncode == 0 else None
+
+
 def get_file_blame(repo_path: Path, file_path: Path) -> Dict[int, Dict]:
     """
     Get git blame information for a file (which commit/author modified each line)
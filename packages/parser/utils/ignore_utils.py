@@ -0,0 +1,195 @@
+"""Gitignore-style ignore rules (.gitignore, .secrinignore)"""
+import re
+from pathlib import Path
+from typing import Optional
+
+
+# Per-directory ignore files honoured by the repository walker
+IGNORE_FILES = (".gitignore", ".secrinignore")
+
+
+class IgnoreRule:
+    """A single compiled line of an ignore file"""
+    
+    __slots__ = ("regex", "negated", "dir_only")
+    
+    def __init__(self, regex: re.Pattern, negated: bool, dir_only: bool):
+        self.regex = regex
+        self.negated = negated
+        self.dir_only = dir_only
+
+
+def _translate_glob(pattern: str) -> str:
+    """
+    Translate a gitignore glob into a regular expression body
+    
+    '*' and '?' never match '/', '**' matches across directories and
+    '[...]' is a character class ('[!...]' negated).
+    """
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def parse_ignore_line(line: str) -> Optional[IgnoreRule]:
+    """
+    Compile one line of an ignore file
+    
+    Args:
+        line: Raw line from a .gitignore / .secrinignore file
+    
+    Returns:
+        IgnoreRule, or None for blank lines and comments
+    """
+    line = line.rstrip("\n\r")
+    
+    # Trailing spaces are ignored unless escaped
+    if not line.endswith("\\ "):
+        line = line.rstrip(" ")
+    if not line or line.startswith("#"):
+        return None
+    
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    
+    # A slash anywhere but at the end anchors the pattern to the ignore file's directory
+    if "/" in line:
+        regex = "^" + _translate_glob(line.lstrip("/")) + "$"
+    else:
+        regex = "^(?:.*/)?" + _translate_glob(line) + "$"
+    
+    return IgnoreRule(re.compile(regex, re.DOTALL), negated, dir_only)
+
+
+def load_ignore_file(path: Path) -> list[IgnoreRule]:
+    """Read and compile an ignore file; unreadable files yield no rules"""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return [rule for rule in map(parse_ignore_line, f) if rule is not None]
+    except OSError:
+        return []
+
+
+class IgnoreMatcher:
+    """
+    Hierarchical .gitignore / .secrinignore matcher for one repository
+    
+    Rules are loaded lazily, once per directory, and apply to paths below the
+    directory that holds them. As in git, rules of deeper directories take
+    precedence over shallower ones and, within a file, later lines win.
+    """
+    
+    def __init__(self, repo_root: str | Path, ignore_files: tuple[str, ...] = IGNORE_FILES):
+        """
+        Args:
+            repo_root: Repository root; paths passed to is_ignored are relative to it
+            ignore_files: Names of the per-directory ignore files to honour
+        """
+        self.repo_root = str(repo_root)
+        self.ignore_files = ignore_files
+        self._rules: dict[str, list[IgnoreRule]] = {}
+        self._ignored_dirs: dict[str, bool] = {}
+    
+    def rules_for(self, rel_dir: str) -> list[IgnoreRule]:
+        """Return the rules declared directly in a directory ('' is the root)"""
+        rules = self._rules.get(rel_dir)
+        if rules is None:
+            rules = []
+            base = f"{self.repo_root}/{rel_dir}" if rel_dir else self.repo_root
+            for name in self.ignore_files:
+                rules.extend(load_ignore_file(Path(base, name)))
+            self._rules[rel_dir] = rules
+        return rules
+    
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """
+        Check a path against the rules of all its ancestor directories
+        
+        Only the path itself is matched; callers that do not prune ignored
+        directories while walking should use is_path_excluded instead.
+        
+        Args:
+            rel_path: POSIX path relative to the repository root
+            is_dir: Whether the path is a directory (for 'dir/' rules)
+        
+        Returns:
+            True if the last matching rule excludes the path
+        """
+        parts = rel_path.split("/")
+        
+        # Deepest directory first: its last matching rule is the one that counts
+        for depth in range(len(parts) - 1, -1, -1):
+            rules = self.rules_for("/".join(parts[:depth]))
+            if not rules:
+                continue
+            sub_path = "/".join(parts[depth:])
+            for rule in reversed(rules):
+                if rule.dir_only and not is_dir:
+                    continue
+                if rule.regex.match(sub_path):
+                    return not rule.negated
+        
+        return False
+    
+    def is_path_excluded(self, rel_path: str) -> bool:
+        """
+        Check a file path, treating it as excluded if any parent directory is
+        
+        Args:
+            rel_path: POSIX path of a file relative to the repository root
+        
+        Returns:
+            True if the file or one of its ancestor directories is ignored
+        """
+        parts = rel_path.split("/")
+        for depth in range(1, len(parts)):
+            rel_dir = "/".join(parts[:depth])
+            ignored = self._ignored_dirs.get(rel_dir)
+            if ignored is None:
+                ignored = self.is_ignored(rel_dir, is_dir=True)
+                self._ignored_dirs[rel_dir] = ignored
+            if ignored:
+                return True
+        return self.is_ignored(rel_path)
@@ -1,68 +1,142 @@
 """Tree-sitter language configuration and management"""
-from typing import Optional, Dict
+from importlib import import_module
+from importlib.metadata import EntryPoint, entry_points
+from typing import Callable, Dict, NamedTuple, Optional, Union, TYPE_CHECKING
 from tree_sitter import Language
 
-try:
+if TYPE_CHECKING:
+    from packages.parser.core.base_parser import BaseLanguageParser
+
+
+# Entry point group through which installed packages register more languages.
+# The entry point name is the language name (as returned by detect_language)
+# and its object a LanguagePlugin, e.g. in a plugin's pyproject.toml:
+#
+#   [project.entry-points."secrin.languages"]
+#   go = "secrin_go:PLUGIN"
+ENTRY_POINT_GROUP = "secrin.languages"
+
+
+class LanguagePlugin(NamedTuple):
+    """
+    How to build the grammar and the parser of one language
+    
+    Nothing is loaded when a plugin is registered: load_language is called
+    the first time the language is needed, and parser_class may be an import
+    path ("package.module:ClassName") resolved at the same time.
+    """
+    load_language: Callable[[], Language]
+    parser_class: Union[type, str]
+    # pip package providing the grammar, for the warning when it is missing
+    requirement: Optional[str] = None
+
+
+def _load_python() -> Language:
     import tree_sitter_python  # type: ignore[import-untyped]
-except ImportError:
-    tree_sitter_python = None  # type: ignore[assignment]
+    return Language(tree_sitter_python.language())
+
 
-try:
+def _load_javascript() -> Language:
     import tree_sitter_javascript  # type: ignore[import-untyped]
-except ImportError:
-    tree_sitter_javascript = None  # type: ignore[assignment]
+    return Language(tree_sitter_javascript.language())
+
 
-try:
+def _load_typescript() -> Language:
     import tree_sitter_typescript  # type: ignore[import-untyped]
-except ImportError:
-    tree_sitter_typescript = None  # type: ignore[assignment]
+    # TSX could be registered the same way with language_tsx()
+    return Language(tree_sitter_typescript.language_typescript())
 
-# Add more as needed: tree_sitter_java, etc.
+
+DEFAULT_LANGUAGES = {
+    "python": LanguagePlugin(
+        _load_python,
+        "packages.parser.languages.python_parser:PythonParser",
+        "tree-sitter-python",
+    ),
+    "javascript": LanguagePlugin(
+        _load_javascript,
+        "packages.parser.languages.javascript_parser:JavaScriptParser",
+        "tree-sitter-javascript",
+    ),
+    "typescript": LanguagePlugin(
+        _load_typescript,
+        "packages.parser.languages.typescript_parser:TypeScriptParser",
+        "tree-sitter-typescript",
+    ),
+}
 
 
 class LanguageRegistry:
-    """Registry for tree-sitter languages"""
+    """
+    Registry for tree-sitter languages
+    
+    Grammars are loaded on first use of each language, so importing the
+    parser package or analyzing a single-language repository does not pay
+    for the other grammars. Languages of installed plugins are discovered
+    through the ENTRY_POINT_GROUP entry points, which are only read when a
+    language that is not built in is requested.
+    """
     
     def __init__(self):
-        self._languages: Dict[str, Language] = {}
-        self._load_default_languages()
+        self._plugins: Dict[str, LanguagePlugin] = dict(DEFAULT_LANGUAGES)
+        # Loaded grammars; None marks a language that failed to load
+        self._languages: Dict[str, Optional[Language]] = {}
+        self._entry_points: Optional[Dict[str, EntryPoint]] = None
     
-    def _load_default_languages(self):
-        """Load default supported languages"""
-        if tree_sitter_python is not None:
-            try:
-                self._languages["python"] = Language(tree_sitter_python.language())  # type: ignore[attr-defined]
-            except Exception as e:
-                print(f"Warning: Could not load Python language: {e}")
-        else:
-            print("Warning: tree_sitter_python not installed. Install with: pip install tree-sitter-python")
+    def register(self, name: str, plugin: LanguagePlugin):
+        """
+        Register (or replace) a language without loading it
         
-        if tree_sitter_javascript is not None:
+        Args:
+            name: Language name (e.g., 'go')
+            plugin: How to build the language's grammar and parser
+        """
+        name = name.lower()
+        self._plugins[name] = plugin
+        self._languages.pop(name, None)
+    
+    def _discover_entry_points(self) -> Dict[str, EntryPoint]:
+        """Find plugin entry points; their modules are not imported yet"""
+        if self._entry_points is None:
             try:
-                self._languages["javascript"] = Language(tree_sitter_javascript.language())  # type: ignore[attr-defined]
+                found = entry_points(group=ENTRY_POINT_GROUP)
             except Exception as e:
-                print(f"Warning: Could not load JavaScript language: {e}")
-        else:
-            print("Warning: tree_sitter_javascript not installed. Install with: pip install tree-sitter-javascript")
+                print(f"Warning: Could not read language plugins: {e}")
+                found = []
+            self._entry_points = {ep.name.lower(): ep for ep in found}
+        return self._entry_points
+    
+    def get_plugin(self, name: str) -> Optional[LanguagePlugin]:
+        """
+        Get the plugin of a language, importing a plugin module if needed
         
-        if tree_sitter_typescript is not None:
-            try:
-                # Load TypeScript language
-                self._languages["typescript"] = Language(tree_sitter_typescript.language_typescript())  # type: ignore[attr-defined]
-                # We could also load TSX if needed, maybe as "tsx" language
-                # self._languages["tsx"] = Language(tree_sitter_typescript.language_tsx())
-            except Exception as e:
-                print(f"Warning: Could not load TypeScript language: {e}")
-        else:
-            print("Warning: tree_sitter_typescript not installed. Install with: pip install tree-sitter-typescript")
+        Args:
+            name: Language name
+        
+        Returns:
+            LanguagePlugin or None if no built-in or installed plugin provides it
+        """
+        name = name.lower()
+        plugin = self._plugins.get(name)
+        if plugin is not None:
+            return plugin
+        
+        entry_point = self._discover_entry_points().get(name)
+        if entry_point is None:
+            return None
         
-        # Add more languages here as needed
-        # self._languages["typescript"] = Language(tree_sitter_typescript.language_typescript())
-        # self._languages["java"] = Language(tree_sitter_java.language())
+        try:
+            plugin = entry_point.load()
+        except Exception as e:
+            print(f"Warning: Could not load language plugin '{entry_point.value}': {e}")
+            return None
+        
+        self._plugins[name] = plugin
+        return plugin
     
     def get_language(self, name: str) -> Optional[Language]:
         """
-        Get a tree-sitter Language object by name
+        Get a tree-sitter Language object by name, loading it on first use
         
         Args:
             name: Language name (e.g., 'python', 'javascript')
@@ -70,19 +144,59 @@ class LanguageRegistry:
         Returns:
             Language object or None if not found
         """
-        return self._languages.get(name.lower())
+        name = name.lower()
+        if name in self._languages:
+            return self._languages[name]
+        
+        plugin = self.get_plugin(name)
+        language = None
+        if plugin is not None:
+            try:
+                language = plugin.load_language()
+            except ImportError as e:
+                hint = f" Install with: pip install {plugin.requirement}" if plugin.requirement else ""
+                print(f"Warning: Grammar for {name} not installed ({e}).{hint}")
+            except Exception as e:
+                print(f"Warning: Could not load {name} language: {e}")
+        
+        self._languages[name] = language
+        return language
+    
+    def create_parser(self, name: str) -> Optional["BaseLanguageParser"]:
+        """
+        Create a parser for a language, loading its grammar if needed
+        
+        Args:
+            name: Language name
+        
+        Returns:
+            A new parser instance, or None if the language is not available
+        """
+        language = self.get_language(name)
+        if language is None:
+            return None
+        
+        parser_class = self._plugins[name.lower()].parser_class
+        if isinstance(parser_class, str):
+            module_name, _, class_name = parser_class.partition(":")
+            parser_class = getattr(import_module(module_name), class_name)
+        return parser_class(language)
     
     def is_supported(self, name: str) -> bool:
         """
         Check if a language is supported
         
+        The grammar is not loaded, so a registered language whose grammar
+        package is missing still counts as supported here.
+        
         Args:
             name: Language name
         
         Returns:
-            True if the language is supported
+            True if the language is built in or provided by a plugin
         """
-        return name.lower() in self._languages
+        name = name.lower()
+        return name in self._plugins or name in self._discover_entry_points()
     
     def supported_languages(self) -> list[str]:
         """
@@ -91,7 +205,7 @@ class LanguageRegistry:
         Returns:
             List of language names
         """
-        return list(self._languages.keys())
+        return list(dict.fromkeys([*self._plugins, *self._discover_entry_points()]))
 
 
 # Singleton instance